@@ -0,0 +1,136 @@
+import React, { memo, useEffect, useLayoutEffect, useRef, useState } from 'react';
+import { Performance, displayTime, formatDay, singleStation } from '../lib/performances';
+import { stationKey } from '../lib/stations';
+import type { Language, Messages } from '../lib/i18n';
+
+// Every row has the same height, so the visible window is plain arithmetic on the scroll position
+const ROW_HEIGHT = 84;
+const ROW_GAP = 12;
+const ROW_STRIDE = ROW_HEIGHT + ROW_GAP;
+// Rows rendered above and below the viewport, so fast flicks don't show blank space
+const OVERSCAN = 8;
+// Ask for the next page once the viewport is within this share of a screen of the end
+const END_THRESHOLD = 0.5;
+// Rows rendered before the first measurement (server render and first paint): about one screen
+const INITIAL_ROWS = 10;
+
+// useLayoutEffect warns during prerendering
+const useIsomorphicLayoutEffect = typeof window !== 'undefined' ? useLayoutEffect : useEffect;
+
+interface RowProps {
+  index: number;
+  label: string;
+  day: string;
+  time: number;
+  pendingLabel: string | null;
+  top: number;
+}
+
+// Props are primitives: a row re-renders only when what it shows changes
+const HistoryRow = memo(function HistoryRow({ index, label, day, time, pendingLabel, top }: RowProps) {
+  return (
+    <div
+      className="absolute left-0 right-0 bg-slate-800/50 border border-cyan-400/20 hover:border-cyan-400/50 rounded-lg p-4 flex justify-between items-center transition"
+      style={{ top, height: ROW_HEIGHT }}
+    >
+      <div>
+        <p className="text-white font-black text-lg" style={{ fontFamily: 'Arial Black, sans-serif' }}>#{index + 1} - {label}</p>
+        <p className="text-gray-400 text-sm">
+          {day}
+          {pendingLabel && ` · ⏳ ${pendingLabel}`}
+        </p>
+      </div>
+      <div className="text-right">
+        <p className="text-cyan-400 font-black text-2xl">{time}s</p>
+      </div>
+    </div>
+  );
+});
+
+interface HistoryListProps {
+  history: Performance[];
+  queuedIds: Set<string>;
+  t: Messages;
+  language: Language;
+  onEndReached?: () => void;
+  initialRows?: number;
+}
+
+// Window-scrolled virtual list: only the rows near the viewport are in the DOM
+export default function HistoryList({
+  history,
+  queuedIds,
+  t,
+  language,
+  onEndReached,
+  initialRows = INITIAL_ROWS,
+}: HistoryListProps) {
+  const containerRef = useRef<HTMLDivElement>(null);
+  // Layout effects don't run on the server: start from the top of the list until measured.
+  // `bottom` (first row below the viewport) and `screen` (rows per viewport) stay 0 until then.
+  const [range, setRange] = useState({ start: 0, end: initialRows, bottom: 0, screen: 0 });
+
+  useIsomorphicLayoutEffect(() => {
+    let frame = 0;
+    const measure = () => {
+      frame = 0;
+      const container = containerRef.current;
+      if (!container) return;
+      const top = container.getBoundingClientRect().top;
+      const screen = Math.ceil(window.innerHeight / ROW_STRIDE);
+      const bottom = Math.max(0, Math.ceil((window.innerHeight - top) / ROW_STRIDE));
+      const start = Math.max(0, Math.floor(-top / ROW_STRIDE) - OVERSCAN);
+      const end = Math.min(history.length, bottom + OVERSCAN);
+      // Same window: same object, so React bails out of the update
+      setRange((current) =>
+        current.start === start && current.end === end && current.bottom === bottom && current.screen === screen
+          ? current
+          : { start, end, bottom, screen }
+      );
+    };
+    // At most one measurement per frame however many scroll events fire
+    const schedule = () => {
+      if (!frame) frame = requestAnimationFrame(measure);
+    };
+    measure();
+    window.addEventListener('scroll', schedule, { passive: true });
+    window.addEventListener('resize', schedule);
+    return () => {
+      window.removeEventListener('scroll', schedule);
+      window.removeEventListener('resize', schedule);
+      if (frame) cancelAnimationFrame(frame);
+    };
+  }, [history.length]);
+
+  const end = Math.min(range.end, history.length);
+
+  // Only from a measured viewport: a list below the fold doesn't fetch its next page on mount
+  const nearEnd =
+    history.length > 0 && range.bottom > 0 && range.bottom + range.screen * END_THRESHOLD >= history.length;
+  useEffect(() => {
+    if (onEndReached && nearEnd) onEndReached();
+  }, [nearEnd, history.length, onEndReached]);
+
+  const rows = [];
+  for (let index = range.start; index < end; index++) {
+    const perf = history[index];
+    const station = singleStation(perf);
+    rows.push(
+      <HistoryRow
+        key={perf.id}
+        index={index}
+        label={station ? t[stationKey(station)] : 'HYROX'}
+        day={formatDay(perf.date, language)}
+        time={displayTime(perf)}
+        pendingLabel={queuedIds.has(perf.id) ? t.pendingSync : null}
+        top={index * ROW_STRIDE}
+      />
+    );
+  }
+
+  return (
+    <div ref={containerRef} className="relative" style={{ height: Math.max(history.length * ROW_STRIDE - ROW_GAP, 0) }}>
+      {rows}
+    </div>
+  );
+}
@@ -0,0 +1,139 @@
+import { Performance } from './performances';
+import { STATION_IDS, STATION_KEYS, StationKey } from './stations';
+
+// Dashboard analytics, computed by lib/analytics.worker.ts off the main thread.
+// Performances travel to the worker as rows of a Float64Array and results come back
+// as one Float64Array; both buffers are transferred, not copied.
+// The race prediction is lib/prediction.ts (fit kept in userStats), not these trend lines.
+
+const DAY = 24 * 60 * 60 * 1000;
+// Dates are measured in days from a fixed recent origin, so the least-squares sums keep their precision
+const ORIGIN = Date.UTC(2024, 0, 1);
+const MIN_TREND_POINTS = 3;
+
+// Row layout: date, totalTime, then one split per station (0 when absent)
+export const ROW_WIDTH = 2 + STATION_IDS.length;
+// Metrics: one per station, then the total time
+const METRICS = STATION_IDS.length + 1;
+const TOTAL = METRICS - 1;
+// Result layout: best, mean, count and trend (s per 30 days) per metric
+const FIELDS = 4;
+export const RESULT_LENGTH = METRICS * FIELDS;
+
+export interface MetricSummary {
+  best: number | null;
+  mean: number | null;
+  count: number;
+  // Seconds gained (negative) or lost per 30 days
+  trend: number | null;
+}
+
+export interface Analytics {
+  stations: Record<StationKey, MetricSummary>;
+  total: MetricSummary;
+}
+
+export function encodeRows(performances: Performance[]) {
+  const rows = new Float64Array(performances.length * ROW_WIDTH);
+  performances.forEach((performance, i) => {
+    const offset = i * ROW_WIDTH;
+    rows[offset] = performance.date;
+    rows[offset + 1] = performance.totalTime;
+    for (const id of STATION_IDS) rows[offset + 1 + id] = performance.splits[id] ?? 0;
+  });
+  return { ids: performances.map((performance) => performance.id), rows };
+}
+
+// Running least-squares sums per metric: adding or removing a performance is O(1),
+// only removing the current best needs a rescan of that one metric
+export class AnalyticsState {
+  private rows = new Map<string, Float64Array>();
+  // n, Σx, Σy, Σxy, Σxx per metric
+  private sums = new Float64Array(METRICS * 5);
+  private bests = new Float64Array(METRICS).fill(Infinity);
+  private staleBest = new Uint8Array(METRICS);
+
+  private apply(row: Float64Array, sign: 1 | -1) {
+    const x = (row[0] - ORIGIN) / DAY;
+    for (let metric = 0; metric < METRICS; metric++) {
+      const y = metric === TOTAL ? row[1] : row[2 + metric];
+      if (!(y > 0)) continue;
+      const s = metric * 5;
+      this.sums[s] += sign;
+      this.sums[s + 1] += sign * x;
+      this.sums[s + 2] += sign * y;
+      this.sums[s + 3] += sign * x * y;
+      this.sums[s + 4] += sign * x * x;
+      if (sign > 0 && y < this.bests[metric]) this.bests[metric] = y;
+      if (sign < 0 && y === this.bests[metric]) this.staleBest[metric] = 1;
+    }
+  }
+
+  upsert(ids: string[], rows: Float64Array) {
+    ids.forEach((id, i) => {
+      this.remove([id]);
+      const row = rows.slice(i * ROW_WIDTH, (i + 1) * ROW_WIDTH);
+      this.rows.set(id, row);
+      this.apply(row, 1);
+    });
+  }
+
+  remove(ids: string[]) {
+    for (const id of ids) {
+      const row = this.rows.get(id);
+      if (!row) continue;
+      this.rows.delete(id);
+      this.apply(row, -1);
+    }
+  }
+
+  private rescanBest(metric: number) {
+    let best = Infinity;
+    this.rows.forEach((row) => {
+      const y = metric === TOTAL ? row[1] : row[2 + metric];
+      if (y > 0 && y < best) best = y;
+    });
+    this.bests[metric] = best;
+    this.staleBest[metric] = 0;
+  }
+
+  result(): Float64Array {
+    const result = new Float64Array(RESULT_LENGTH).fill(NaN);
+    for (let metric = 0; metric < METRICS; metric++) {
+      if (this.staleBest[metric]) this.rescanBest(metric);
+      const s = metric * 5;
+      const n = this.sums[s];
+      const sx = this.sums[s + 1];
+      const sy = this.sums[s + 2];
+      const sxy = this.sums[s + 3];
+      const sxx = this.sums[s + 4];
+      const r = metric * FIELDS;
+      result[r + 2] = Math.round(n);
+      if (n < 0.5) continue;
+      result[r] = this.bests[metric];
+      result[r + 1] = sy / n;
+      const denominator = n * sxx - sx * sx;
+      if (n >= MIN_TREND_POINTS && denominator > 1e-9) {
+        result[r + 3] = ((n * sxy - sx * sy) / denominator) * 30;
+      }
+    }
+    return result;
+  }
+}
+
+const number = (value: number) => (Number.isNaN(value) ? null : Math.round(value));
+
+export function decodeAnalytics(result: Float64Array): Analytics {
+  const summary = (metric: number): MetricSummary => {
+    const r = metric * FIELDS;
+    return { best: number(result[r]), mean: number(result[r + 1]), count: result[r + 2], trend: number(result[r + 3]) };
+  };
+  const stations = {} as Record<StationKey, MetricSummary>;
+  STATION_KEYS.forEach((key, i) => (stations[key] = summary(i)));
+  return { stations, total: summary(TOTAL) };
+}
+
+// Messages understood by the worker
+export type AnalyticsMessage =
+  | { type: 'upsert'; ids: string[]; rows: Float64Array }
+  | { type: 'remove'; ids: string[] };
@@ -0,0 +1,13 @@
+import { AnalyticsMessage, AnalyticsState } from './analytics';
+
+// One state per dashboard; every message is answered with the full result buffer
+const state = new AnalyticsState();
+
+self.onmessage = (event: MessageEvent<AnalyticsMessage>) => {
+  const message = event.data;
+  if (message.type === 'upsert') state.upsert(message.ids, message.rows);
+  else state.remove(message.ids);
+
+  const result = state.result();
+  (self as unknown as Worker).postMessage(result, [result.buffer]);
+};
@@ -0,0 +1,32 @@
+import {
+  initializeFirestore,
+  connectFirestoreEmulator,
+  persistentLocalCache,
+  persistentMultipleTabManager,
+  memoryLocalCache,
+  Firestore,
+} from 'firebase/firestore';
+import { getFirebaseApp } from './firebase';
+
+// Local backend for load testing, e.g. "localhost:8080" (seed it with tools/localstore.py --emulator)
+const firestoreEmulatorHost = process.env.NEXT_PUBLIC_FIRESTORE_EMULATOR_HOST;
+
+let db: Firestore | null = null;
+
+// Only modules that query Firestore import this file, so only their pages ship the SDK
+export function getDb(): Firestore {
+  if (!db) {
+    // IndexedDB cache in the browser: reads work offline and pending writes survive reloads
+    db = initializeFirestore(getFirebaseApp(), {
+      localCache:
+        typeof window !== 'undefined'
+          ? persistentLocalCache({ tabManager: persistentMultipleTabManager() })
+          : memoryLocalCache(),
+    });
+    if (firestoreEmulatorHost) {
+      const [host, port] = firestoreEmulatorHost.split(':');
+      connectFirestoreEmulator(db, host, parseInt(port) || 8080);
+    }
+  }
+  return db;
+}
@@ -1,6 +1,8 @@
-import { initializeApp } from 'firebase/app';
-import { getAuth } from 'firebase/auth';
-import { getFirestore } from 'firebase/firestore';
+import { initializeApp, getApps, FirebaseApp } from 'firebase/app';
+import { getAuth, connectAuthEmulator, Auth } from 'firebase/auth';
+
+// Services are created on first use. Firestore lives in lib/db.ts so that pages
+// which only need auth (index, login) never download the Firestore SDK.
 
 const firebaseConfig = {
   apiKey: process.env.NEXT_PUBLIC_FIREBASE_API_KEY,
@@ -11,7 +13,20 @@ const firebaseConfig = {
   appId: process.env.NEXT_PUBLIC_FIREBASE_APP_ID,
 };
 
-export const app = initializeApp(firebaseConfig);
-export const auth = getAuth(app);
-export const db = getFirestore(app);
-export default app;
\ No newline at end of file
+const authEmulatorUrl = process.env.NEXT_PUBLIC_AUTH_EMULATOR_URL;
+
+let auth: Auth | null = null;
+
+export function getFirebaseApp(): FirebaseApp {
+  return getApps()[0] ?? initializeApp(firebaseConfig);
+}
+
+export function getFirebaseAuth(): Auth {
+  if (!auth) {
+    auth = getAuth(getFirebaseApp());
+    if (authEmulatorUrl) {
+      connectAuthEmulator(auth, authEmulatorUrl, { disableWarnings: true });
+    }
+  }
+  return auth;
+}
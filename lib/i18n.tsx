@@ -0,0 +1,57 @@
+import React, { createContext, useContext, useEffect } from 'react';
+import { useRouter } from 'next/router';
+import { DEFAULT_LANGUAGE, LANGUAGES, Language, Messages } from './locales';
+
+export type { Language, Messages };
+
+const TranslationsContext = createContext<Messages | null>(null);
+
+// Read by middleware.ts to send returning visitors to their language before render
+const LOCALE_COOKIE = 'NEXT_LOCALE';
+// Where the language was kept before locale routing
+const LEGACY_KEY = 'hyrox-language';
+
+function legacyLanguage(): Language | null {
+  if (document.cookie.match(new RegExp(`(?:^|; )${LOCALE_COOKIE}=`))) return null;
+  const saved = localStorage.getItem(LEGACY_KEY);
+  return LANGUAGES.includes(saved as Language) ? (saved as Language) : null;
+}
+
+function saveLanguage(language: Language) {
+  document.cookie = `${LOCALE_COOKIE}=${language}; path=/; max-age=31536000; SameSite=Lax`;
+  localStorage.removeItem(LEGACY_KEY);
+}
+
+export function TranslationsProvider({ messages, children }: { messages?: Messages; children: React.ReactNode }) {
+  const router = useRouter();
+
+  // The cookie is handled by middleware.ts. A preference still in localStorage is invisible to
+  // it: move it to the cookie, and switch this one time if it differs from the rendered locale
+  useEffect(() => {
+    const saved = legacyLanguage();
+    if (!saved) return;
+    saveLanguage(saved);
+    if (saved !== router.locale) {
+      router.replace(router.asPath, router.asPath, { locale: saved });
+    }
+    // Once per app load, not on every navigation
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, []);
+
+  return <TranslationsContext.Provider value={messages ?? null}>{children}</TranslationsContext.Provider>;
+}
+
+export function useTranslations() {
+  const router = useRouter();
+  const messages = useContext(TranslationsContext);
+  if (!messages) throw new Error('useTranslations: export getStaticProps = translationProps from this page');
+  const language = (router.locale ?? DEFAULT_LANGUAGE) as Language;
+
+  const toggleLanguage = () => {
+    const next = language === 'fr' ? 'en' : 'fr';
+    saveLanguage(next);
+    router.push(router.asPath, router.asPath, { locale: next });
+  };
+
+  return { t: messages, language, toggleLanguage };
+}
@@ -0,0 +1,86 @@
+import type { Messages } from './fr';
+
+const en: Messages = {
+  appTitle: 'HyroxTracker',
+  tagline: 'Track Your Hyrox Performance',
+  login: 'Login',
+  signup: 'Sign Up',
+  email: 'Email',
+  password: 'Password',
+  confirmPassword: 'Confirm Password',
+  logout: 'Logout',
+  dashboard: 'Dashboard',
+  profile: 'Profile',
+  hyroxCategory: 'Hyrox Category',
+  targetTime: 'Target Time (min)',
+  age: 'Age',
+  gender: 'Gender',
+  male: 'Male',
+  female: 'Female',
+  trackPerformance: 'Track Performance',
+  logNewPerformance: 'Log New Performance',
+  date: 'Date',
+  totalTime: 'Total Time (sec)',
+  skierg: 'SkiErg',
+  sledPush: 'Sled Push',
+  sledPull: 'Sled Pull',
+  burpeeBroadJumps: 'Burpee Broad Jumps',
+  rowErg: 'Row Erg',
+  farmerCarry: 'Farmer Carry',
+  sandbagLunges: 'Sandbag Lunges',
+  wallBalls: 'Wall Balls',
+  time: 'Time (sec)',
+  benchmarks: 'Benchmarks',
+  personalBest: 'Personal Best',
+  categoryAverage: 'Category Average',
+  yourPerformance: 'Your Performance',
+  improvement: 'Improvement',
+  save: 'Save',
+  cancel: 'Cancel',
+  delete: 'Delete',
+  edit: 'Edit',
+  submit: 'Submit',
+  loading: 'Loading...',
+  error: 'Error',
+  success: 'Success!',
+  loginRequired: 'Please log in',
+  fillAllFields: 'Please fill all fields',
+  passwordMismatch: 'Passwords do not match',
+  accountCreated: 'Account created successfully!',
+  loginSuccess: 'Login successful!',
+  language: 'Language',
+  loadMore: 'Load more',
+  pendingSync: 'Waiting to sync',
+  liveRace: 'Live Race',
+  startRace: 'Start',
+  nextSplit: 'Next split',
+  finishRace: 'Finish',
+  run: 'Run',
+  leaderboard: 'Leaderboard',
+  predictedTime: 'Predicted time',
+  days: 'd',
+  racePrediction: 'Race prediction',
+  pacingPlan: 'Pacing plan',
+  target: 'Target',
+  roxzone: 'Roxzone',
+  perKm: '/km',
+  estimated: 'estimated',
+  coachView: 'Coach View',
+  squad: 'Squad',
+  athletes: 'Athletes',
+  inviteAthlete: 'Invite an athlete',
+  inviteLinkHelp: 'Send this link to your athlete. It can be used once, within 7 days.',
+  copy: 'Copy',
+  noAthletes: 'Invite your athletes to follow the whole squad.',
+  coachInvite: 'Coach invitation',
+  inviteRequest: 'wants to follow your profile, stats and performances.',
+  accept: 'Accept',
+  decline: 'Decline',
+  inviteInvalid: 'This invitation has expired or has already been used.',
+  sessions: 'Sessions',
+  recentSessions: 'Recent sessions',
+  bestTotal: 'Best time',
+  remove: 'Remove',
+};
+
+export default en;
@@ -0,0 +1,86 @@
+const fr = {
+  appTitle: 'HyroxTracker',
+  tagline: 'Suivez Vos Performances Hyrox',
+  login: 'Connexion',
+  signup: 'Inscription',
+  email: 'Email',
+  password: 'Mot de passe',
+  confirmPassword: 'Confirmer le mot de passe',
+  logout: 'Déconnexion',
+  dashboard: 'Tableau de Bord',
+  profile: 'Profil',
+  hyroxCategory: 'Catégorie Hyrox',
+  targetTime: 'Objectif (min)',
+  age: 'Âge',
+  gender: 'Genre',
+  male: 'Homme',
+  female: 'Femme',
+  trackPerformance: 'Suivi des Performances',
+  logNewPerformance: 'Ajouter une Performance',
+  date: 'Date',
+  totalTime: 'Temps Total (sec)',
+  skierg: 'SkiErg',
+  sledPush: 'Sled Push',
+  sledPull: 'Sled Pull',
+  burpeeBroadJumps: 'Burpee Broad Jumps',
+  rowErg: 'Row Erg',
+  farmerCarry: 'Farmer Carry',
+  sandbagLunges: 'Sandbag Lunges',
+  wallBalls: 'Wall Balls',
+  time: 'Temps (sec)',
+  benchmarks: 'Benchmarks',
+  personalBest: 'Meilleur Personnel',
+  categoryAverage: 'Moyenne de Catégorie',
+  yourPerformance: 'Votre Performance',
+  improvement: 'Amélioration',
+  save: 'Enregistrer',
+  cancel: 'Annuler',
+  delete: 'Supprimer',
+  edit: 'Modifier',
+  submit: 'Soumettre',
+  loading: 'Chargement...',
+  error: 'Erreur',
+  success: 'Succès!',
+  loginRequired: 'Veuillez vous connecter',
+  fillAllFields: 'Veuillez remplir tous les champs',
+  passwordMismatch: 'Les mots de passe ne correspondent pas',
+  accountCreated: 'Compte créé avec succès!',
+  loginSuccess: 'Connexion réussie!',
+  language: 'Langue',
+  loadMore: 'Voir plus',
+  pendingSync: 'En attente de synchronisation',
+  liveRace: 'Course en Direct',
+  startRace: 'Démarrer',
+  nextSplit: 'Split suivant',
+  finishRace: 'Terminer',
+  run: 'Course',
+  leaderboard: 'Classement',
+  predictedTime: 'Temps prédit',
+  days: 'j',
+  racePrediction: 'Prédiction de course',
+  pacingPlan: 'Plan d’allure',
+  target: 'Objectif',
+  roxzone: 'Roxzone',
+  perKm: '/km',
+  estimated: 'estimé',
+  coachView: 'Vue Coach',
+  squad: 'Équipe',
+  athletes: 'Athlètes',
+  inviteAthlete: 'Inviter un athlète',
+  inviteLinkHelp: 'Envoyez ce lien à votre athlète. Il sert une fois, pendant 7 jours.',
+  copy: 'Copier',
+  noAthletes: 'Invitez vos athlètes pour suivre toute l’équipe.',
+  coachInvite: 'Invitation de coach',
+  inviteRequest: 'souhaite suivre votre profil, vos stats et vos performances.',
+  accept: 'Accepter',
+  decline: 'Refuser',
+  inviteInvalid: 'Cette invitation a expiré ou a déjà été utilisée.',
+  sessions: 'Séances',
+  recentSessions: 'Séances récentes',
+  bestTotal: 'Meilleur temps',
+  remove: 'Retirer',
+};
+
+export type Messages = Record<keyof typeof fr, string>;
+
+export default fr;
@@ -0,0 +1,21 @@
+import type { GetStaticProps } from 'next';
+import type { Messages } from './fr';
+
+export type { Messages };
+export type Language = 'fr' | 'en';
+
+// Same list as i18n.locales in next.config.js
+export const LANGUAGES: Language[] = ['fr', 'en'];
+export const DEFAULT_LANGUAGE: Language = 'fr';
+
+const loaders: Record<Language, () => Promise<{ default: Messages }>> = {
+  fr: () => import('./fr'),
+  en: () => import('./en'),
+};
+
+// Pages export this as getStaticProps: each locale is prerendered with its own dictionary in the
+// page data, and since it only runs at build time no dictionary ends up in the page's JS.
+export const translationProps: GetStaticProps<{ messages: Messages }> = async ({ locale }) => {
+  const language = LANGUAGES.includes(locale as Language) ? (locale as Language) : DEFAULT_LANGUAGE;
+  return { props: { messages: (await loaders[language]()).default } };
+};
@@ -0,0 +1,172 @@
+import {
+  collection,
+  query,
+  where,
+  orderBy,
+  startAfter,
+  limit,
+  getDocs,
+  onSnapshot,
+  DocumentChange,
+  QueryConstraint,
+  QueryDocumentSnapshot,
+} from 'firebase/firestore';
+import { getDb } from './db';
+import { Performance } from './performances';
+import { reportError, startSpan, traced } from './telemetry';
+
+export interface PerformancePage {
+  performances: Performance[];
+  cursor: QueryDocumentSnapshot | null;
+  hasMore: boolean;
+}
+
+export const PAGE_SIZE = 20;
+
+// Newest first, ties broken by id so every document has one position
+const compare = (a: Performance, b: Performance) => b.date - a.date || (a.id < b.id ? -1 : a.id > b.id ? 1 : 0);
+
+// Performances keyed by id and kept in display order.
+// Changes are applied by binary-search insert/remove instead of re-sorting the whole history.
+export class PerformanceStore {
+  private byId = new Map<string, Performance>();
+  private ordered: Performance[] = [];
+  private listeners = new Set<(performances: Performance[]) => void>();
+  private changeListeners = new Set<(upserted: Performance[], removed: string[]) => void>();
+  private upserted: Performance[] = [];
+  private removed: string[] = [];
+
+  get performances() {
+    return this.ordered;
+  }
+
+  subscribe(listener: (performances: Performance[]) => void) {
+    this.listeners.add(listener);
+    return () => {
+      this.listeners.delete(listener);
+    };
+  }
+
+  // Only what changed in each batch, for consumers that keep their own derived state
+  subscribeChanges(listener: (upserted: Performance[], removed: string[]) => void) {
+    this.changeListeners.add(listener);
+    return () => {
+      this.changeListeners.delete(listener);
+    };
+  }
+
+  has(id: string) {
+    return this.byId.has(id);
+  }
+
+  // Index of `performance` in `list`, or where it would be inserted
+  private position(list: Performance[], performance: Performance) {
+    let lo = 0;
+    let hi = list.length;
+    while (lo < hi) {
+      const mid = (lo + hi) >>> 1;
+      if (compare(list[mid], performance) < 0) lo = mid + 1;
+      else hi = mid;
+    }
+    return lo;
+  }
+
+  private removeFrom(list: Performance[], id: string) {
+    const existing = this.byId.get(id);
+    if (!existing) return;
+    list.splice(this.position(list, existing), 1);
+    this.byId.delete(id);
+  }
+
+  private insertInto(list: Performance[], performance: Performance) {
+    this.removeFrom(list, performance.id);
+    list.splice(this.position(list, performance), 0, performance);
+    this.byId.set(performance.id, performance);
+    this.upserted.push(performance);
+  }
+
+  // One copy of the list per batch, so React sees a new array only when something changed
+  private update(mutate: (list: Performance[]) => void) {
+    const list = this.ordered.slice();
+    mutate(list);
+    this.ordered = list;
+    this.listeners.forEach((listener) => listener(list));
+    const upserted = this.upserted;
+    const removed = this.removed;
+    this.upserted = [];
+    this.removed = [];
+    this.changeListeners.forEach((listener) => listener(upserted, removed));
+  }
+
+  upsertAll(performances: Performance[]) {
+    if (performances.length === 0) return;
+    this.update((list) => performances.forEach((performance) => this.insertInto(list, performance)));
+  }
+
+  applyChanges(changes: DocumentChange[]) {
+    if (changes.length === 0) return;
+    this.update((list) => {
+      for (const change of changes) {
+        if (change.type === 'removed') {
+          if (this.byId.has(change.doc.id)) this.removed.push(change.doc.id);
+          this.removeFrom(list, change.doc.id);
+        } else {
+          this.insertInto(list, { id: change.doc.id, ...change.doc.data() } as Performance);
+        }
+      }
+    });
+  }
+
+  clear() {
+    this.removed = Array.from(this.byId.keys());
+    this.byId.clear();
+    this.update((list) => list.splice(0));
+  }
+}
+
+// Listens to every performance dated `since` or later; older pages are loaded with fetchPerformancePage.
+// Bounding by date rather than limit() means a 'removed' change is a real deletion, not a window shift.
+export function listenToPerformances(store: PerformanceStore, userId: string, since: number) {
+  const q = query(
+    collection(getDb(), 'performances'),
+    where('userId', '==', userId),
+    where('date', '>=', since),
+    orderBy('date', 'desc')
+  );
+  const firstSnapshot = startSpan('firestore.performances.listen');
+  return onSnapshot(
+    q,
+    (snapshot) => {
+      firstSnapshot(true, { docs: snapshot.size, cache: snapshot.metadata.fromCache });
+      store.applyChanges(snapshot.docChanges());
+    },
+    (error) => {
+      firstSnapshot(false);
+      reportError('firestore.performances.listen', error);
+    }
+  );
+}
+
+// Newest first, one page at a time. Needs the (userId, date desc) index in firestore.indexes.json.
+export async function fetchPerformancePage(
+  userId: string,
+  cursor: QueryDocumentSnapshot | null = null,
+  pageSize: number = PAGE_SIZE
+): Promise<PerformancePage> {
+  const constraints: QueryConstraint[] = [where('userId', '==', userId), orderBy('date', 'desc')];
+  if (cursor) constraints.push(startAfter(cursor));
+  // One extra document tells us whether another page exists without a second round-trip
+  constraints.push(limit(pageSize + 1));
+
+  const snapshot = await traced(
+    'firestore.performances.page',
+    () => getDocs(query(collection(getDb(), 'performances'), ...constraints)),
+    { first: !cursor }
+  );
+  const docs = snapshot.docs.slice(0, pageSize);
+  return {
+    performances: docs.map((doc) => ({ id: doc.id, ...doc.data() })) as Performance[],
+    cursor: docs.length > 0 ? docs[docs.length - 1] : cursor,
+    hasMore: snapshot.docs.length > pageSize,
+  };
+}
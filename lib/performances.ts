@@ -0,0 +1,91 @@
+import { StationId, StationKey, STATION_KEYS, stationId } from './stations';
+
+export const SCHEMA_VERSION = 2;
+
+// Canonical performances/{id} document, shared by track.tsx and tracking.tsx.
+// Older documents are rewritten by tools/migrate_performances.py.
+export interface PerformanceDoc {
+  v: typeof SCHEMA_VERSION;
+  userId: string;
+  date: number; // epoch ms, UTC midnight of the session day
+  totalTime: number; // seconds, 0 when only station splits were logged
+  splits: Partial<Record<StationId, number>>; // station ID -> seconds
+  runs?: number[]; // seconds for each 1 km run in race order, from the live race timer
+  notes?: string;
+  createdAt: number; // epoch ms
+}
+
+export interface Performance extends PerformanceDoc {
+  id: string;
+}
+
+// 'YYYY-MM-DD' from an <input type="date"> to the stored epoch day
+export const toEpochDay = (isoDate: string) => Date.parse(`${isoDate}T00:00:00Z`);
+
+// The athlete's local calendar day, stored as UTC midnight
+export const todayEpochDay = () => {
+  const now = new Date();
+  return Date.UTC(now.getFullYear(), now.getMonth(), now.getDate());
+};
+
+export function buildPerformance(
+  userId: string,
+  date: number,
+  totalTime: number,
+  stations: Partial<Record<StationKey, number>>,
+  notes?: string
+): PerformanceDoc {
+  const splits: Partial<Record<StationId, number>> = {};
+  for (const key of STATION_KEYS) {
+    const seconds = stations[key];
+    if (seconds && seconds > 0) splits[stationId(key)] = Math.round(seconds);
+  }
+  return {
+    v: SCHEMA_VERSION,
+    userId,
+    date,
+    totalTime: Math.round(totalTime) || 0,
+    splits,
+    ...(notes ? { notes } : {}),
+    createdAt: Date.now(),
+  };
+}
+
+const ID_ALPHABET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789';
+
+// Same shape as a Firestore auto ID, generated without loading the Firestore SDK
+export function newPerformanceId() {
+  let id = '';
+  while (id.length < 20) {
+    for (const byte of Array.from(crypto.getRandomValues(new Uint8Array(40)))) {
+      // 248 = 4 * 62: rejecting larger bytes keeps every character equally likely
+      if (byte < 248 && id.length < 20) id += ID_ALPHABET[byte % 62];
+    }
+  }
+  return id;
+}
+
+// Building a formatter is the expensive part of toLocaleDateString: keep one per language
+const dayFormats = new Map<string, Intl.DateTimeFormat>();
+
+export const formatDay = (date: number, language: string) => {
+  let format = dayFormats.get(language);
+  if (!format) {
+    format = new Intl.DateTimeFormat(language === 'fr' ? 'fr-FR' : 'en-GB', { timeZone: 'UTC' });
+    dayFormats.set(language, format);
+  }
+  return format.format(date);
+};
+
+// Station ID of a single-station entry, null for a full session
+export const singleStation = (performance: PerformanceDoc): StationId | null => {
+  const ids = Object.keys(performance.splits).map(Number) as StationId[];
+  return performance.totalTime === 0 && ids.length === 1 ? ids[0] : null;
+};
+
+// Single-station entries have no total, show their only split instead
+export const displayTime = (performance: PerformanceDoc) => {
+  if (performance.totalTime > 0) return performance.totalTime;
+  const times = Object.values(performance.splits) as number[];
+  return times.length === 1 ? times[0] : times.reduce((sum, time) => sum + time, 0);
+};
@@ -0,0 +1,127 @@
+import { PerformanceDoc } from './performances';
+import { STATION_IDS, STATION_KEYS, StationKey } from './stations';
+
+// Finish-time prediction and pacing plan.
+// Each race segment keeps a recency-weighted mean (EWMA) of the athlete's times. The state is
+// two numbers per segment, folded into userStats with every write, so a new performance costs
+// O(1) and history is never refitted.
+
+// Weight of the newest performance: about the last 6 sessions carry most of the estimate
+export const FIT_ALPHA = 0.3;
+
+export type Segment = StationKey | 'run' | 'roxzone' | 'total';
+
+// EWMA started from 0: the mean is sum / (1 - (1 - α)^n), and lets tools/backends.py merge a whole import
+// into the stored state exactly (combine_fits)
+export interface SegmentFit {
+  sum: number;
+  n: number;
+}
+
+export type FitState = Partial<Record<Segment, SegmentFit>>;
+
+// Reference times (seconds) of a ~90 min Open finisher: fill segments the athlete never logged
+export const REFERENCE_TIMES: Record<Exclude<Segment, 'total'>, number> = {
+  run: 330, // per km
+  skierg: 270,
+  sledPush: 240,
+  sledPull: 300,
+  burpeeBroadJumps: 330,
+  rowErg: 280,
+  farmerCarry: 120,
+  sandbagLunges: 330,
+  wallBalls: 420,
+  roxzone: 480, // all transitions together
+};
+
+const RUNS = 8;
+
+function observe(fit: FitState, segment: Segment, seconds: number): FitState {
+  const current = fit[segment] ?? { sum: 0, n: 0 };
+  return { ...fit, [segment]: { sum: (1 - FIT_ALPHA) * current.sum + FIT_ALPHA * seconds, n: current.n + 1 } };
+}
+
+export function segmentMean(fit: FitState, segment: Segment): number | null {
+  const state = fit[segment];
+  if (!state || state.n === 0) return null;
+  return state.sum / (1 - Math.pow(1 - FIT_ALPHA, state.n));
+}
+
+// Pure fold of one performance, called from applyPerformance
+export function updateFit(fit: FitState, performance: Pick<PerformanceDoc, 'totalTime' | 'splits' | 'runs'>): FitState {
+  let next = fit;
+  let stationSum = 0;
+  let stations = 0;
+  for (const id of STATION_IDS) {
+    const time = performance.splits[id];
+    if (time && time > 0) {
+      next = observe(next, STATION_KEYS[id - 1], time);
+      stationSum += time;
+      stations += 1;
+    }
+  }
+  const runs = (performance.runs ?? []).filter((time) => time > 0);
+  if (runs.length > 0) next = observe(next, 'run', runs.reduce((sum, time) => sum + time, 0) / runs.length);
+  if (performance.totalTime > 0) {
+    next = observe(next, 'total', performance.totalTime);
+    // A complete race: whatever is not runs or stations was spent in the roxzone
+    if (stations === STATION_IDS.length && runs.length === RUNS) {
+      const roxzone = performance.totalTime - stationSum - runs.reduce((sum, time) => sum + time, 0);
+      if (roxzone > 0) next = observe(next, 'roxzone', roxzone);
+    }
+  }
+  return next;
+}
+
+export interface Prediction {
+  // Seconds per segment; `run` is per km
+  segments: Record<Exclude<Segment, 'total'>, number>;
+  total: number;
+  // Segments backed by the athlete's own logs rather than scaled reference times
+  measured: Segment[];
+}
+
+const SEGMENTS = Object.keys(REFERENCE_TIMES) as Exclude<Segment, 'total'>[];
+
+const raceTime = (segments: Record<Exclude<Segment, 'total'>, number>) =>
+  SEGMENTS.reduce((sum, segment) => sum + segments[segment] * (segment === 'run' ? RUNS : 1), 0);
+
+export function predictFinish(fit: FitState): Prediction | null {
+  const measured = SEGMENTS.filter((segment) => segmentMean(fit, segment) !== null);
+  const totalMean = segmentMean(fit, 'total');
+  if (measured.length === 0 && totalMean === null) return null;
+
+  // Unlogged segments: reference time scaled by how the athlete compares on the logged ones
+  const ratios = measured.map((segment) => segmentMean(fit, segment)! / REFERENCE_TIMES[segment]);
+  const level = ratios.length > 0 ? ratios.reduce((sum, ratio) => sum + ratio, 0) / ratios.length : 1;
+  const segments = {} as Record<Exclude<Segment, 'total'>, number>;
+  for (const segment of SEGMENTS) segments[segment] = segmentMean(fit, segment) ?? REFERENCE_TIMES[segment] * level;
+
+  let total = raceTime(segments);
+  // Logged finish times beat a sum of partly estimated segments: keep the proportions, trust the total
+  if (totalMean !== null && measured.length < SEGMENTS.length) {
+    const scale = totalMean / total;
+    for (const segment of SEGMENTS) segments[segment] *= scale;
+    total = totalMean;
+  }
+  return { segments, total: Math.round(total), measured: totalMean !== null ? [...measured, 'total'] : measured };
+}
+
+// Target split per segment: the predicted profile scaled to the target, so the athlete's
+// relative strengths are kept and the effort to find is spread evenly
+export function pacingPlan(prediction: Prediction, targetSeconds: number) {
+  const scale = targetSeconds / prediction.total;
+  return SEGMENTS.map((segment) => ({
+    segment,
+    predicted: Math.round(prediction.segments[segment]),
+    target: Math.round(prediction.segments[segment] * scale),
+  }));
+}
+
+export function formatDuration(seconds: number) {
+  const rounded = Math.round(seconds);
+  const h = Math.floor(rounded / 3600);
+  const m = Math.floor((rounded % 3600) / 60);
+  const s = (rounded % 60).toString().padStart(2, '0');
+  return h > 0 ? `${h}:${m.toString().padStart(2, '0')}:${s}` : `${m}:${s}`;
+}
@@ -0,0 +1,26 @@
+import { doc, getDoc, setDoc } from 'firebase/firestore';
+import { getDb } from './db';
+import { traced } from './telemetry';
+
+// users/{uid} as written by pages/login.tsx
+export interface UserProfile {
+  name: string;
+  email: string;
+  category: string;
+  targetTime: number;
+  age: number;
+  gender: string;
+  createdAt: string;
+  // Coaches the athlete accepted (lib/squad.ts); absent until the first invite
+  coachIds?: string[];
+}
+
+export async function fetchProfile(userId: string): Promise<UserProfile | null> {
+  const snapshot = await traced('firestore.users.read', () => getDoc(doc(getDb(), 'users', userId)));
+  return snapshot.exists() ? (snapshot.data() as UserProfile) : null;
+}
+
+// Merged: an invite accepted right after signup may have written coachIds first
+export function createProfile(userId: string, profile: UserProfile) {
+  return traced('firestore.users.write', () => setDoc(doc(getDb(), 'users', userId), profile, { merge: true }));
+}
@@ -0,0 +1,81 @@
+import { doc, setDoc, deleteDoc } from 'firebase/firestore';
+import { getDb } from './db';
+import { buildPerformance, PerformanceDoc, todayEpochDay } from './performances';
+import { STATION_KEYS, StationKey } from './stations';
+import { traced } from './telemetry';
+
+// A Hyrox race alternates a 1 km run and a station, eight times
+export interface RaceSegment {
+  kind: 'run' | 'station';
+  index: number;
+}
+
+export const RACE_SEGMENTS: RaceSegment[] = STATION_KEYS.flatMap((_, index) => [
+  { kind: 'run' as const, index },
+  { kind: 'station' as const, index },
+]);
+
+export interface RaceState {
+  startedAt: number; // high-resolution epoch ms
+  marks: number[]; // elapsed ms at the end of each completed segment
+}
+
+const STORAGE_KEY = 'hyrox-live-race';
+
+// Minimum time between two Firestore checkpoints during a race
+export const CHECKPOINT_INTERVAL = 30000;
+
+// performance.now() is monotonic and sub-millisecond; timeOrigin anchors it to the epoch
+export const now = () => performance.timeOrigin + performance.now();
+
+export const elapsed = (race: RaceState) => now() - race.startedAt;
+
+export const segmentDurations = (marks: number[]) => marks.map((mark, i) => mark - (i > 0 ? marks[i - 1] : 0));
+
+export const isFinished = (race: RaceState) => race.marks.length >= RACE_SEGMENTS.length;
+
+export function formatClock(ms: number) {
+  const tenths = Math.floor(ms / 100);
+  const minutes = Math.floor(tenths / 600);
+  const seconds = Math.floor((tenths % 600) / 10);
+  return `${minutes}:${seconds.toString().padStart(2, '0')}.${tenths % 10}`;
+}
+
+// Splits live in localStorage only, so a reload or a dead connection never loses them
+export function saveRace(race: RaceState | null) {
+  if (race) localStorage.setItem(STORAGE_KEY, JSON.stringify(race));
+  else localStorage.removeItem(STORAGE_KEY);
+}
+
+export function loadRace(): RaceState | null {
+  const saved = localStorage.getItem(STORAGE_KEY);
+  return saved ? (JSON.parse(saved) as RaceState) : null;
+}
+
+export function raceToPerformance(userId: string, race: RaceState): PerformanceDoc {
+  const durations = segmentDurations(race.marks).map((ms) => Math.round(ms / 1000));
+  const stations: Partial<Record<StationKey, number>> = {};
+  const runs: number[] = [];
+  RACE_SEGMENTS.slice(0, durations.length).forEach((segment, i) => {
+    if (segment.kind === 'run') runs.push(durations[i]);
+    else stations[STATION_KEYS[segment.index]] = durations[i];
+  });
+  // A race stopped early keeps its splits but no total: the last mark is not a finish time
+  const totalTime = isFinished(race) ? Math.round(race.marks[race.marks.length - 1] / 1000) : 0;
+  return { ...buildPerformance(userId, todayEpochDay(), totalTime, stations), runs };
+}
+
+// One overwritten document per athlete instead of a write per split
+export function checkpointRace(userId: string, race: RaceState) {
+  return traced('firestore.liveRaces.write', () =>
+    setDoc(doc(getDb(), 'liveRaces', userId), {
+      startedAt: Math.round(race.startedAt),
+      marks: race.marks.map(Math.round),
+      updatedAt: Date.now(),
+    })
+  );
+}
+
+export function clearCheckpoint(userId: string) {
+  return traced('firestore.liveRaces.delete', () => deleteDoc(doc(getDb(), 'liveRaces', userId)));
+}
\ No newline at end of file
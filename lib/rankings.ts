@@ -0,0 +1,131 @@
+import { collection, doc, getDoc, getDocs, limit, orderBy, query, where } from 'firebase/firestore';
+import { getDb } from './db';
+import { UserProfile } from './profile';
+import { traced } from './telemetry';
+
+// Leaderboards of best total times for three scopes: category, category + gender,
+// category + gender + age group. Both collections are written only by tools/rankings.py
+// with privileged credentials; clients read them and never write.
+// - rankings/{scopeId}: how many athletes hold each best time, by whole second. Its size depends
+//   on the spread of times, not on the number of athletes. Once fetched it is turned into sorted
+//   times with running totals, so a rank is a binary search.
+// - rankingEntries/{uid}: the athlete's best time, name and scopes, for the top-N query.
+
+// rankings/{scopeId} as stored
+interface RankingDoc {
+  // Best total time in seconds -> athletes holding it
+  counts: Record<string, number>;
+  sum: number;
+  count: number;
+}
+
+// Built once per fetched ranking
+export interface Ranking {
+  // Distinct best times, ascending
+  times: number[];
+  // Athletes at or under times[i]
+  atOrUnder: number[];
+  sum: number;
+  count: number;
+}
+
+export interface RankingEntry {
+  userId: string;
+  name: string;
+  time: number;
+}
+
+export interface RankScope {
+  id: string;
+  level: 'category' | 'gender' | 'ageGroup';
+}
+
+export interface RankPosition {
+  rank: number;
+  total: number;
+  // Share of the bucket slower than `time`
+  percentile: number;
+}
+
+// Official Hyrox age groups, by lower bound
+export const AGE_GROUPS = [16, 25, 30, 35, 40, 45, 50, 55, 60, 65, 70];
+
+export function indexRanking(data: Partial<RankingDoc>): Ranking {
+  const entries = Object.entries(data.counts ?? {})
+    .map(([seconds, athletes]) => [Number(seconds), athletes] as const)
+    .sort((a, b) => a[0] - b[0]);
+  let running = 0;
+  return {
+    times: entries.map(([seconds]) => seconds),
+    atOrUnder: entries.map(([, athletes]) => (running += athletes)),
+    sum: data.sum ?? 0,
+    count: data.count ?? 0,
+  };
+}
+
+// Index of the first time >= `time`
+function lowerBound(times: number[], time: number) {
+  let low = 0;
+  let high = times.length;
+  while (low < high) {
+    const middle = (low + high) >>> 1;
+    if (times[middle] < time) low = middle + 1;
+    else high = middle;
+  }
+  return low;
+}
+
+export function ageGroup(age: number) {
+  let group = AGE_GROUPS[0];
+  for (const bound of AGE_GROUPS) {
+    if (age >= bound) group = bound;
+  }
+  const index = AGE_GROUPS.indexOf(group);
+  return index === AGE_GROUPS.length - 1 ? `${group}+` : `${group}-${AGE_GROUPS[index + 1] - 1}`;
+}
+
+export function rankingScopes(profile: Pick<UserProfile, 'category' | 'gender' | 'age'>): RankScope[] {
+  // Document IDs cannot contain '/'
+  const category = profile.category.replace(/\//g, '-');
+  return [
+    { id: category, level: 'category' },
+    { id: `${category}_${profile.gender}`, level: 'gender' },
+    { id: `${category}_${profile.gender}_${ageGroup(Number(profile.age))}`, level: 'ageGroup' },
+  ];
+}
+
+// O(log distinct times)
+export function rankOf(ranking: Ranking, time: number): RankPosition {
+  const { times, atOrUnder } = ranking;
+  const index = lowerBound(times, time);
+  const faster = index > 0 ? atOrUnder[index - 1] : 0;
+  const tied = index < times.length && times[index] === time ? atOrUnder[index] : faster;
+  const slower = (atOrUnder.length > 0 ? atOrUnder[atOrUnder.length - 1] : 0) - tied;
+  const total = ranking.count;
+  return {
+    rank: faster + 1,
+    total,
+    percentile: total > 0 ? Math.round((100 * slower) / total) : 0,
+  };
+}
+
+export const categoryAverage = (ranking: Ranking) => (ranking.count > 0 ? Math.round(ranking.sum / ranking.count) : null);
+
+export async function fetchRankings(profile: UserProfile) {
+  const scopes = rankingScopes(profile);
+  const snapshots = await traced('firestore.rankings.read', () =>
+    Promise.all(scopes.map((scope) => getDoc(doc(getDb(), 'rankings', scope.id))))
+  );
+  return scopes.map((scope, i) => ({
+    scope,
+    ranking: indexRanking(snapshots[i].exists() ? (snapshots[i].data() as Partial<RankingDoc>) : {}),
+  }));
+}
+
+// Fastest `n` athletes of a scope, with the (scopes array-contains, time) index
+export async function fetchLeaderboard(scopeId: string, n: number): Promise<RankingEntry[]> {
+  const snapshot = await traced('firestore.rankingEntries.read', () =>
+    getDocs(query(collection(getDb(), 'rankingEntries'), where('scopes', 'array-contains', scopeId), orderBy('time'), limit(n)))
+  );
+  return snapshot.docs.map((entry) => ({ userId: entry.id, name: entry.data().name ?? '', time: entry.data().time }));
+}
@@ -0,0 +1,22 @@
+// Where /login sends the user once signed in. Pages behind login pass their own path in `next`,
+// so a deep link such as a coach's /invite?id=... survives the detour through sign-in or signup.
+
+export const DEFAULT_AFTER_LOGIN = '/dashboard';
+
+export const loginPath = (asPath: string) => `/login?next=${encodeURIComponent(asPath)}`;
+
+// Same-origin paths only: anything else (absolute URLs, '//host', '/\host') goes to the dashboard
+export function afterLogin(next: unknown): string {
+  if (typeof next !== 'string' || !next.startsWith('/') || next.startsWith('//') || next.startsWith('/\\')) {
+    return DEFAULT_AFTER_LOGIN;
+  }
+  const base = 'http://same-origin.invalid';
+  let url: URL;
+  try {
+    url = new URL(next, base);
+  } catch {
+    return DEFAULT_AFTER_LOGIN;
+  }
+  if (url.origin !== base || url.pathname === '/login') return DEFAULT_AFTER_LOGIN;
+  return url.pathname + url.search + url.hash;
+}
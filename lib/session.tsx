@@ -0,0 +1,95 @@
+import React, { createContext, useContext, useEffect, useState } from 'react';
+import { useRouter } from 'next/router';
+import { onAuthStateChanged, User } from 'firebase/auth';
+import { getFirebaseAuth } from './firebase';
+import type { UserProfile } from './profile';
+import type { PerformancePage } from './performanceStore';
+import { loginPath } from './redirect';
+import { reportError, startSpan } from './telemetry';
+
+// One auth listener for the whole app, mounted in _app so it survives page transitions.
+// Pages read the cached user and profile instead of waiting for auth and refetching.
+
+interface Session {
+  user: User | null;
+  profile: UserProfile | null;
+  // false until Firebase has restored (or ruled out) the saved login
+  ready: boolean;
+  setProfile: (profile: UserProfile | null) => void;
+}
+
+const SessionContext = createContext<Session>({
+  user: null,
+  profile: null,
+  ready: false,
+  setProfile: () => {},
+});
+
+// First dashboard page, requested as soon as a user is known (typically during the redirect
+// from /login) and handed over once to the dashboard. Firestore modules load with it, not before.
+let dashboardPrefetch: { userId: string; page: Promise<PerformancePage> } | null = null;
+
+function prefetchDashboard(userId: string) {
+  if (dashboardPrefetch?.userId === userId) return;
+  const page = import('./performanceStore').then(({ fetchPerformancePage }) => fetchPerformancePage(userId));
+  // A failed prefetch is retried by the dashboard itself
+  page.catch(() => {
+    if (dashboardPrefetch?.page === page) dashboardPrefetch = null;
+  });
+  dashboardPrefetch = { userId, page };
+}
+
+export function takeDashboardPrefetch(userId: string): Promise<PerformancePage> | null {
+  if (dashboardPrefetch?.userId !== userId) return null;
+  const { page } = dashboardPrefetch;
+  dashboardPrefetch = null;
+  return page;
+}
+
+export function SessionProvider({ children }: { children: React.ReactNode }) {
+  const router = useRouter();
+  const [user, setUser] = useState<User | null>(null);
+  const [profile, setProfile] = useState<UserProfile | null>(null);
+  const [ready, setReady] = useState(false);
+
+  useEffect(() => {
+    // Until Firebase restores (or rules out) the saved login, every page behind auth waits
+    const authResolved = startSpan('auth.resolve');
+    return onAuthStateChanged(getFirebaseAuth(), (currentUser) => {
+      authResolved(true, { signedIn: !!currentUser });
+      setUser(currentUser);
+      setReady(true);
+      if (!currentUser) {
+        setProfile(null);
+        dashboardPrefetch = null;
+        return;
+      }
+      router.prefetch('/dashboard');
+      prefetchDashboard(currentUser.uid);
+      import('./profile')
+        .then(({ fetchProfile }) => fetchProfile(currentUser.uid))
+        // Signup writes the profile itself and may win the race against this read
+        .then((fetched) => setProfile((current) => fetched ?? current))
+        .catch((error) => reportError('session.profile', error));
+    });
+    // The router instance is stable: one listener for the lifetime of the app
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, []);
+
+  return (
+    <SessionContext.Provider value={{ user, profile, ready, setProfile }}>{children}</SessionContext.Provider>
+  );
+}
+
+export const useSession = () => useContext(SessionContext);
+
+// For pages behind login: sends signed-out visitors to /login once auth has resolved,
+// with the current path so they come back to it
+export function useRequireUser() {
+  const session = useSession();
+  const router = useRouter();
+  useEffect(() => {
+    if (session.ready && !session.user) router.push(loginPath(router.asPath));
+  }, [session.ready, session.user, router]);
+  return session;
+}
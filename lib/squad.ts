@@ -0,0 +1,220 @@
+import {
+  arrayRemove,
+  arrayUnion,
+  collection,
+  deleteDoc,
+  doc,
+  documentId,
+  getDoc,
+  getDocs,
+  limit,
+  orderBy,
+  query,
+  setDoc,
+  updateDoc,
+  where,
+  writeBatch,
+} from 'firebase/firestore';
+import { getDb } from './db';
+import { Performance } from './performances';
+import { UserProfile } from './profile';
+import { UserStats, emptyStats } from './userStats';
+import { traced } from './telemetry';
+
+// Coach view: the athletes who accepted the coach's invite, loaded together.
+// Profiles, stats and recent performances are fetched with `in` queries of up to IN_LIMIT ids,
+// at most MAX_PARALLEL queries in flight, so a 50-athlete squad is six requests in one round.
+// Results are cached per athlete and shared by every caller, in flight included.
+
+// Firestore's cap on the values of an `in` filter
+export const IN_LIMIT = 30;
+const MAX_PARALLEL = 6;
+const CACHE_TTL = 60 * 1000;
+// Recent performances shown per athlete
+export const RECENT_DAYS = 28;
+// Upper bound on what one `in` query reads, per athlete in the chunk
+const MAX_RECENT = 50;
+
+export interface SquadAthlete {
+  id: string;
+  profile: UserProfile | null;
+  stats: UserStats;
+  recent: Performance[];
+}
+
+// -- bounded parallelism ------------------------------------------------------------
+
+let active = 0;
+const waiting: (() => void)[] = [];
+
+function acquire(): Promise<void> {
+  if (active < MAX_PARALLEL) {
+    active++;
+    return Promise.resolve();
+  }
+  return new Promise((resolve) => waiting.push(resolve));
+}
+
+// The slot goes straight to the next waiter, so nobody can overtake it in between
+function release() {
+  const next = waiting.shift();
+  if (next) next();
+  else active--;
+}
+
+async function withSlot<T>(run: () => Promise<T>) {
+  await acquire();
+  try {
+    return await run();
+  } finally {
+    release();
+  }
+}
+
+// -- shared cache --------------------------------------------------------------------
+
+const cache = new Map<string, { at: number; value: Promise<unknown> }>();
+
+const chunk = <T>(items: T[], size: number) =>
+  Array.from({ length: Math.ceil(items.length / size) }, (_, i) => items.slice(i * size, (i + 1) * size));
+
+// One value per id: cached and in-flight ids are reused, the rest go out as `in` queries
+function loadMany<T>(
+  kind: string,
+  ids: string[],
+  fetchChunk: (ids: string[]) => Promise<Map<string, T>>,
+  fallback: () => T
+): Promise<T[]> {
+  const now = Date.now();
+  const missing = ids.filter((id) => {
+    const entry = cache.get(`${kind}:${id}`);
+    return !entry || now - entry.at > CACHE_TTL;
+  });
+
+  for (const group of chunk(Array.from(new Set(missing)), IN_LIMIT)) {
+    const result = withSlot(() => traced(`firestore.squad.${kind}`, () => fetchChunk(group), { ids: group.length }));
+    for (const id of group) {
+      const key = `${kind}:${id}`;
+      const value = result.then((values) => values.get(id) ?? fallback());
+      cache.set(key, { at: now, value });
+      // A failed chunk is refetched next time instead of staying cached
+      value.catch(() => {
+        if (cache.get(key)?.value === value) cache.delete(key);
+      });
+    }
+  }
+  return Promise.all(ids.map((id) => cache.get(`${kind}:${id}`)!.value as Promise<T>));
+}
+
+export function invalidateSquadCache(athleteId?: string) {
+  if (!athleteId) return cache.clear();
+  Array.from(cache.keys())
+    .filter((key) => key.endsWith(`:${athleteId}`))
+    .forEach((key) => cache.delete(key));
+}
+
+async function byDocumentId<T>(name: string, ids: string[], read: (data: unknown) => T) {
+  const snapshot = await getDocs(query(collection(getDb(), name), where(documentId(), 'in', ids)));
+  return new Map(snapshot.docs.map((entry) => [entry.id, read(entry.data())]));
+}
+
+// Newest first; one query covers up to IN_LIMIT athletes with the (userId, date desc) index
+async function recentPerformances(ids: string[], since: number) {
+  const snapshot = await getDocs(
+    query(
+      collection(getDb(), 'performances'),
+      where('userId', 'in', ids),
+      where('date', '>=', since),
+      orderBy('date', 'desc'),
+      limit(ids.length * MAX_RECENT)
+    )
+  );
+  const byUser = new Map<string, Performance[]>();
+  for (const entry of snapshot.docs) {
+    const performance = { id: entry.id, ...entry.data() } as Performance;
+    const list = byUser.get(performance.userId) ?? [];
+    list.push(performance);
+    byUser.set(performance.userId, list);
+  }
+  return byUser;
+}
+
+export async function loadSquad(athleteIds: string[]): Promise<SquadAthlete[]> {
+  const since = Date.now() - RECENT_DAYS * 24 * 60 * 60 * 1000;
+  // The three kinds share the parallelism budget and go out together
+  const [profiles, stats, recent] = await Promise.all([
+    loadMany<UserProfile | null>('users', athleteIds, (ids) => byDocumentId('users', ids, (data) => data as UserProfile), () => null),
+    loadMany<UserStats>(
+      'userStats',
+      athleteIds,
+      (ids) => byDocumentId('userStats', ids, (data) => ({ ...emptyStats(), ...(data as Partial<UserStats>) })),
+      emptyStats
+    ),
+    loadMany<Performance[]>('recent', athleteIds, (ids) => recentPerformances(ids, since), () => []),
+  ]);
+  return athleteIds.map((id, i) => ({ id, profile: profiles[i], stats: stats[i], recent: recent[i] }));
+}
+
+// -- roster ------------------------------------------------------------------------------
+// Athletes grant access themselves: accepting a coach's invite adds the coach to
+// users/{athleteUid}.coachIds, and the rules check that list before a coach reads the athlete's
+// profile, stats or performances. The roster is whoever has granted it.
+
+// An invite link works for a week
+const INVITE_TTL = 7 * 24 * 60 * 60 * 1000;
+
+// coachInvites/{inviteId}; the random id is what the link shares
+export interface CoachInvite {
+  coachId: string;
+  coachName: string;
+  createdAt: number;
+  expiresAt: number;
+}
+
+export async function fetchSquadIds(coachId: string): Promise<string[]> {
+  const snapshot = await traced('firestore.users.byCoach', () =>
+    getDocs(query(collection(getDb(), 'users'), where('coachIds', 'array-contains', coachId)))
+  );
+  // The roster query returns the profiles too: loadSquad takes them from the cache
+  const at = Date.now();
+  for (const entry of snapshot.docs) {
+    cache.set(`users:${entry.id}`, { at, value: Promise.resolve(entry.data() as UserProfile) });
+  }
+  return snapshot.docs.map((entry) => entry.id);
+}
+
+export async function createInvite(coachId: string, coachName: string): Promise<string> {
+  const ref = doc(collection(getDb(), 'coachInvites'));
+  const createdAt = Date.now();
+  const invite: CoachInvite = { coachId, coachName, createdAt, expiresAt: createdAt + INVITE_TTL };
+  await traced('firestore.coachInvites.write', () => setDoc(ref, invite));
+  return ref.id;
+}
+
+// null when the invite was used, declined or has expired
+export async function fetchInvite(inviteId: string): Promise<CoachInvite | null> {
+  const snapshot = await traced('firestore.coachInvites.read', () => getDoc(doc(getDb(), 'coachInvites', inviteId)));
+  if (!snapshot.exists()) return null;
+  const invite = snapshot.data() as CoachInvite;
+  return invite.expiresAt > Date.now() ? invite : null;
+}
+
+// Written by the athlete on their own profile; the invite is used up in the same batch
+export function acceptInvite(athleteId: string, inviteId: string, invite: CoachInvite) {
+  const batch = writeBatch(getDb());
+  // Merged rather than updated: a new athlete's profile may still be on its way from signup
+  batch.set(doc(getDb(), 'users', athleteId), { coachIds: arrayUnion(invite.coachId) }, { merge: true });
+  batch.delete(doc(getDb(), 'coachInvites', inviteId));
+  return traced('firestore.coachInvites.accept', () => batch.commit());
+}
+
+export function declineInvite(inviteId: string) {
+  return traced('firestore.coachInvites.delete', () => deleteDoc(doc(getDb(), 'coachInvites', inviteId)));
+}
+
+// The coach can only take themselves off the athlete's list
+export function removeAthlete(coachId: string, athleteId: string) {
+  return traced('firestore.users.write', () =>
+    updateDoc(doc(getDb(), 'users', athleteId), { coachIds: arrayRemove(coachId) })
+  );
+}
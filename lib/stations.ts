@@ -0,0 +1,34 @@
+// Station keys in race order, as written by pages/track.tsx.
+// The station ID stored in performances is the 1-based race position.
+export const STATION_KEYS = [
+  'skierg',
+  'sledPush',
+  'sledPull',
+  'burpeeBroadJumps',
+  'rowErg',
+  'farmerCarry',
+  'sandbagLunges',
+  'wallBalls',
+] as const;
+
+// Labels shown by pages/tracking.tsx and pages/race.tsx, same order as STATION_KEYS
+export const STATION_LABELS = [
+  '1️⃣ SkiErg',
+  '2️⃣ Sled Push',
+  '3️⃣ Sled Pull',
+  '4️⃣ Burpee Broad Jumps',
+  '5️⃣ Rowing',
+  '6️⃣ Farmers Carry',
+  '7️⃣ Fentes marchées',
+  '8️⃣ Wall Balls',
+];
+
+export type StationKey = typeof STATION_KEYS[number];
+
+export type StationId = 1 | 2 | 3 | 4 | 5 | 6 | 7 | 8;
+
+export const STATION_IDS = STATION_KEYS.map((_, index) => (index + 1) as StationId);
+
+export const stationId = (key: StationKey) => (STATION_KEYS.indexOf(key) + 1) as StationId;
+
+export const stationKey = (id: StationId | number): StationKey => STATION_KEYS[id - 1];
\ No newline at end of file
@@ -0,0 +1,146 @@
+import type { NextWebVitalsMetric } from 'next/app';
+
+// Client-side instrumentation: spans around auth, Firestore reads and writes and first render,
+// Web Vitals from _app, and errors. Samples are buffered and handed to the sink in batches,
+// so measuring costs an array push, not a request.
+// Without a sink (NEXT_PUBLIC_TELEMETRY_URL unset, no setSink call) nothing is kept.
+// NEXT_PUBLIC_TELEMETRY_URL=/api/telemetry with TELEMETRY_FILE set writes the samples to a local file.
+
+export type SampleKind = 'span' | 'vital' | 'mark' | 'error';
+
+export type Attributes = Record<string, string | number | boolean>;
+
+export interface Sample {
+  kind: SampleKind;
+  name: string;
+  // Milliseconds, except for unitless vitals such as CLS
+  value: number;
+  ok: boolean;
+  page: string;
+  // Epoch ms when the sample was taken
+  at: number;
+  attributes?: Attributes;
+}
+
+// `unloading` is true when the page is going away: only a beacon is still guaranteed to leave
+export type Sink = (samples: Sample[], unloading: boolean) => void | Promise<void>;
+
+const FLUSH_SIZE = 20;
+const FLUSH_DELAY = 10000;
+// Kept while a sink is failing; the oldest samples go first
+const MAX_BUFFER = 500;
+
+let buffer: Sample[] = [];
+let flushTimer: ReturnType<typeof setTimeout> | null = null;
+let listening = false;
+let sink: Sink | null = process.env.NEXT_PUBLIC_TELEMETRY_URL ? beaconSink(process.env.NEXT_PUBLIC_TELEMETRY_URL) : null;
+
+// POSTs each batch as JSON; sendBeacon while unloading, fetch otherwise
+export function beaconSink(url: string): Sink {
+  return async (samples, unloading) => {
+    const body = JSON.stringify(samples);
+    if (unloading && typeof navigator !== 'undefined' && navigator.sendBeacon) {
+      navigator.sendBeacon(url, new Blob([body], { type: 'application/json' }));
+      return;
+    }
+    const response = await fetch(url, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body,
+      keepalive: true,
+    });
+    if (!response.ok) throw new Error(`Telemetry sink answered ${response.status}`);
+  };
+}
+
+export function setSink(next: Sink | null) {
+  sink = next;
+  if (!sink) buffer = [];
+}
+
+// Clock of spans and marks; pass a reading to mark() to time from that point
+export const now = () => (typeof performance !== 'undefined' ? performance.now() : Date.now());
+
+const currentPage = () => (typeof window !== 'undefined' ? window.location.pathname : '');
+
+function listen() {
+  if (listening || typeof window === 'undefined') return;
+  listening = true;
+  // Last chance to send what is buffered; pagehide covers browsers that skip visibilitychange
+  const onHide = () => flushTelemetry(true);
+  document.addEventListener('visibilitychange', () => {
+    if (document.visibilityState === 'hidden') onHide();
+  });
+  window.addEventListener('pagehide', onHide);
+}
+
+export function record(sample: Omit<Sample, 'page' | 'at'>) {
+  if (!sink) return;
+  listen();
+  buffer.push({ ...sample, page: currentPage(), at: Date.now() });
+  if (buffer.length > MAX_BUFFER) buffer.splice(0, buffer.length - MAX_BUFFER);
+  if (buffer.length >= FLUSH_SIZE) flushTelemetry();
+  else if (!flushTimer) flushTimer = setTimeout(() => flushTelemetry(), FLUSH_DELAY);
+}
+
+export function flushTelemetry(unloading = false) {
+  if (flushTimer) {
+    clearTimeout(flushTimer);
+    flushTimer = null;
+  }
+  if (!sink || buffer.length === 0) return;
+  const samples = buffer;
+  buffer = [];
+  const restore = (error: unknown) => {
+    console.error('Error:', error);
+    // Put the batch back in front of anything recorded meanwhile, within the buffer limit
+    buffer = [...samples, ...buffer].slice(-MAX_BUFFER);
+  };
+  try {
+    Promise.resolve(sink(samples, unloading)).catch(restore);
+  } catch (error) {
+    restore(error);
+  }
+}
+
+// Starts a span; the returned function ends it. Calling it twice records once.
+export function startSpan(name: string, attributes?: Attributes) {
+  const start = now();
+  let ended = false;
+  return (ok = true, extra?: Attributes) => {
+    if (ended) return;
+    ended = true;
+    record({ kind: 'span', name, value: now() - start, ok, attributes: { ...attributes, ...extra } });
+  };
+}
+
+// Awaits `run` inside a span named `name`; failures end the span with ok = false and rethrow
+export async function traced<T>(name: string, run: () => Promise<T>, attributes?: Attributes): Promise<T> {
+  const end = startSpan(name, attributes);
+  try {
+    const result = await run();
+    end(true);
+    return result;
+  } catch (error) {
+    end(false);
+    throw error;
+  }
+}
+
+// Time since `since` (a now() reading, navigation start by default), for one-off milestones such
+// as the first meaningful render. Pages reached by client-side navigation pass their mount time:
+// navigation start is when the app was first loaded, not when the route was entered.
+export function mark(name: string, attributes?: Attributes, since = 0) {
+  record({ kind: 'mark', name, value: now() - since, ok: true, attributes });
+}
+
+export function reportError(name: string, error: unknown) {
+  console.error('Error:', error);
+  const message = error instanceof Error ? error.message : String(error);
+  record({ kind: 'error', name, value: 0, ok: false, attributes: { message } });
+}
+
+// Called from reportWebVitals in pages/_app.tsx: Core Web Vitals plus Next's hydration and route-change timings
+export function recordWebVital(metric: NextWebVitalsMetric) {
+  record({ kind: 'vital', name: metric.name, value: metric.value, ok: true, attributes: { label: metric.label, id: metric.id } });
+}
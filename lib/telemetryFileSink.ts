@@ -0,0 +1,14 @@
+import { promises as fs } from 'fs';
+import path from 'path';
+import type { Sink } from './telemetry';
+
+// Server-side sink: appends each batch to `file` as JSON lines.
+// Used by pages/api/telemetry.ts when TELEMETRY_FILE is set, and by tools/test_telemetry.js.
+export function fileSink(file: string): Sink {
+  let directory: Promise<unknown> | null = null;
+  return async (samples) => {
+    if (!directory) directory = fs.mkdir(path.dirname(file), { recursive: true });
+    await directory;
+    await fs.appendFile(file, samples.map((sample) => JSON.stringify(sample)).join('\n') + '\n');
+  };
+}
@@ -1,104 +0,0 @@
-export const translations = {
-  fr: {
-    appTitle: 'HyroxTracker',
-    tagline: 'Suivez Vos Performances Hyrox',
-    login: 'Connexion',
-    signup: 'Inscription',
-    email: 'Email',
-    password: 'Mot de passe',
-    confirmPassword: 'Confirmer le mot de passe',
-    logout: 'Déconnexion',
-    dashboard: 'Tableau de Bord',
-    profile: 'Profil',
-    hyroxCategory: 'Catégorie Hyrox',
-    targetTime: 'Objectif (min)',
-    age: 'Âge',
-    gender: 'Genre',
-    male: 'Homme',
-    female: 'Femme',
-    trackPerformance: 'Suivi des Performances',
-    logNewPerformance: 'Ajouter une Performance',
-    date: 'Date',
-    totalTime: 'Temps Total (sec)',
-    skierg: 'SkiErg',
-    sledPush: 'Sled Push',
-    sledPull: 'Sled Pull',
-    burpeeBroadJumps: 'Burpee Broad Jumps',
-    rowErg: 'Row Erg',
-    farmerCarry: 'Farmer Carry',
-    sandbagLunges: 'Sandbag Lunges',
-    wallBalls: 'Wall Balls',
-    time: 'Temps (sec)',
-    benchmarks: 'Benchmarks',
-    personalBest: 'Meilleur Personnel',
-    categoryAverage: 'Moyenne de Catégorie',
-    yourPerformance: 'Votre Performance',
-    improvement: 'Amélioration',
-    save: 'Enregistrer',
-    cancel: 'Annuler',
-    delete: 'Supprimer',
-    edit: 'Modifier',
-    submit: 'Soumettre',
-    loading: 'Chargement...',
-    error: 'Erreur',
-    success: 'Succès!',
-    loginRequired: 'Veuillez vous connecter',
-    fillAllFields: 'Veuillez remplir tous les champs',
-    passwordMismatch: 'Les mots de passe ne correspondent pas',
-    accountCreated: 'Compte créé avec succès!',
-    loginSuccess: 'Connexion réussie!',
-    language: 'Langue',
-  },
-  en: {
-    appTitle: 'HyroxTracker',
-    tagline: 'Track Your Hyrox Performance',
-    login: 'Login',
-    signup: 'Sign Up',
-    email: 'Email',
-    password: 'Password',
-    confirmPassword: 'Confirm Password',
-    logout: 'Logout',
-    dashboard: 'Dashboard',
-    profile: 'Profile',
-    hyroxCategory: 'Hyrox Category',
-    targetTime: 'Target Time (min)',
-    age: 'Age',
-    gender: 'Gender',
-    male: 'Male',
-    female: 'Female',
-    trackPerformance: 'Track Performance',
-    logNewPerformance: 'Log New Performance',
-    date: 'Date',
-    totalTime: 'Total Time (sec)',
-    skierg: 'SkiErg',
-    sledPush: 'Sled Push',
-    sledPull: 'Sled Pull',
-    burpeeBroadJumps: 'Burpee Broad Jumps',
-    rowErg: 'Row Erg',
-    farmerCarry: 'Farmer Carry',
-    sandbagLunges: 'Sandbag Lunges',
-    wallBalls: 'Wall Balls',
-    time: 'Time (sec)',
-    benchmarks: 'Benchmarks',
-    personalBest: 'Personal Best',
-    categoryAverage: 'Category Average',
-    yourPerformance: 'Your Performance',
-    improvement: 'Improvement',
-    save: 'Save',
-    cancel: 'Cancel',
-    delete: 'Delete',
-    edit: 'Edit',
-    submit: 'Submit',
-    loading: 'Loading...',
-    error: 'Error',
-    success: 'Success!',
-    loginRequired: 'Please log in',
-    fillAllFields: 'Please fill all fields',
-    passwordMismatch: 'Passwords do not match',
-    accountCreated: 'Account created successfully!',
-    loginSuccess: 'Login successful!',
-    language: 'Language',
-  }
-};
-
-export type Language = 'fr' | 'en';
\ No newline at end of file
@@ -0,0 +1,68 @@
+import { useEffect, useRef, useState } from 'react';
+import { Analytics, AnalyticsMessage, AnalyticsState, decodeAnalytics, encodeRows } from './analytics';
+import { Performance } from './performances';
+import { PerformanceStore } from './performanceStore';
+
+type Post = (message: AnalyticsMessage, transfer?: Transferable[]) => void;
+
+// Feeds the analytics worker with the store's changes (the whole store once, then diffs)
+// plus the queued entries not stored yet, and returns its latest decoded result.
+// The store holds the pages loaded so far, not the whole history: all-time figures come from userStats.
+export function useAnalytics(store: PerformanceStore, unsynced: Performance[]) {
+  const [analytics, setAnalytics] = useState<Analytics | null>(null);
+  const postRef = useRef<Post | null>(null);
+  const sentPending = useRef(new Set<string>());
+
+  useEffect(() => {
+    let post: Post;
+    let worker: Worker | null = null;
+    if (typeof Worker !== 'undefined') {
+      worker = new Worker(new URL('./analytics.worker.ts', import.meta.url));
+      worker.onmessage = (event: MessageEvent<Float64Array>) => setAnalytics(decodeAnalytics(event.data));
+      post = (message, transfer = []) => worker!.postMessage(message, transfer);
+    } else {
+      // No worker support: same computation on this thread
+      const state = new AnalyticsState();
+      post = (message) => {
+        if (message.type === 'upsert') state.upsert(message.ids, message.rows);
+        else state.remove(message.ids);
+        setAnalytics(decodeAnalytics(state.result()));
+      };
+    }
+
+    const send = (upserted: Performance[], removed: string[]) => {
+      if (removed.length > 0) post({ type: 'remove', ids: removed });
+      if (upserted.length > 0) {
+        const { ids, rows } = encodeRows(upserted);
+        post({ type: 'upsert', ids, rows }, [rows.buffer]);
+      }
+    };
+    postRef.current = post;
+    send(store.performances, []);
+    const unsubscribe = store.subscribeChanges(send);
+
+    return () => {
+      unsubscribe();
+      worker?.terminate();
+      postRef.current = null;
+      sentPending.current = new Set();
+    };
+  }, [store]);
+
+  useEffect(() => {
+    const post = postRef.current;
+    if (!post) return;
+    const current = new Set(unsynced.map((perf) => perf.id));
+    // Flushed entries stay: the store now has them under the same ID
+    const gone = Array.from(sentPending.current).filter((id) => !current.has(id) && !store.has(id));
+    const added = unsynced.filter((perf) => !sentPending.current.has(perf.id));
+    if (gone.length > 0) post({ type: 'remove', ids: gone });
+    if (added.length > 0) {
+      const { ids, rows } = encodeRows(added);
+      post({ type: 'upsert', ids, rows }, [rows.buffer]);
+    }
+    sentPending.current = current;
+  }, [unsynced, store]);
+
+  return analytics;
+}
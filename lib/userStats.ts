@@ -0,0 +1,122 @@
+import { doc, getDoc, onSnapshot, runTransaction, serverTimestamp } from 'firebase/firestore';
+import { getDb } from './db';
+import { PerformanceDoc } from './performances';
+import { STATION_IDS, StationKey, stationKey } from './stations';
+import { FitState, updateFit } from './prediction';
+import { reportError, startSpan, traced } from './telemetry';
+
+// Number of latest total times kept for the rolling average
+export const ROLLING_WINDOW = 10;
+
+export interface UserStats {
+  totalSessions: number;
+  totalTimeSum: number;
+  totalTimeCount: number;
+  personalBests: Partial<Record<StationKey, number>>;
+  recentTotalTimes: number[];
+  latestTotalTime: number | null;
+  bestTotalTime: number | null;
+  // Per-segment EWMA behind the finish prediction (lib/prediction)
+  fit: FitState;
+}
+
+export type StatsInput = Pick<PerformanceDoc, 'totalTime' | 'splits' | 'runs'>;
+
+export const emptyStats = (): UserStats => ({
+  totalSessions: 0,
+  totalTimeSum: 0,
+  totalTimeCount: 0,
+  personalBests: {},
+  recentTotalTimes: [],
+  latestTotalTime: null,
+  bestTotalTime: null,
+  fit: {},
+});
+
+export const averageTotalTime = (stats: UserStats) =>
+  stats.totalTimeCount > 0 ? Math.round(stats.totalTimeSum / stats.totalTimeCount) : null;
+
+export const rollingAverage = (stats: UserStats) =>
+  stats.recentTotalTimes.length > 0
+    ? Math.round(stats.recentTotalTimes.reduce((sum, time) => sum + time, 0) / stats.recentTotalTimes.length)
+    : null;
+
+// Pure fold of one performance into the aggregate
+export function applyPerformance(stats: UserStats, input: StatsInput): UserStats {
+  const personalBests = { ...stats.personalBests };
+  for (const id of STATION_IDS) {
+    const time = input.splits[id];
+    const key = stationKey(id);
+    if (time && time > 0 && (!personalBests[key] || time < personalBests[key]!)) {
+      personalBests[key] = time;
+    }
+  }
+  const hasTotal = input.totalTime > 0;
+  return {
+    totalSessions: stats.totalSessions + 1,
+    totalTimeSum: stats.totalTimeSum + (hasTotal ? input.totalTime : 0),
+    totalTimeCount: stats.totalTimeCount + (hasTotal ? 1 : 0),
+    personalBests,
+    recentTotalTimes: hasTotal
+      ? [input.totalTime, ...stats.recentTotalTimes].slice(0, ROLLING_WINDOW)
+      : stats.recentTotalTimes,
+    latestTotalTime: hasTotal ? input.totalTime : stats.latestTotalTime,
+    bestTotalTime:
+      hasTotal && (stats.bestTotalTime === null || input.totalTime < stats.bestTotalTime)
+        ? input.totalTime
+        : stats.bestTotalTime,
+    fit: updateFit(stats.fit, input),
+  };
+}
+
+export async function fetchUserStats(userId: string): Promise<UserStats | null> {
+  const snapshot = await traced('firestore.userStats.read', () => getDoc(doc(getDb(), 'userStats', userId)));
+  return snapshot.exists() ? { ...emptyStats(), ...(snapshot.data() as Partial<UserStats>) } : null;
+}
+
+export function listenToUserStats(userId: string, onStats: (stats: UserStats | null) => void) {
+  // Span until the first snapshot: what the dashboard waits for before showing stats
+  const firstSnapshot = startSpan('firestore.userStats.listen');
+  return onSnapshot(
+    doc(getDb(), 'userStats', userId),
+    (snapshot) => {
+      firstSnapshot(true, { cache: snapshot.metadata.fromCache });
+      onStats(snapshot.exists() ? { ...emptyStats(), ...(snapshot.data() as Partial<UserStats>) } : null);
+    },
+    (error) => {
+      firstSnapshot(false);
+      reportError('firestore.userStats.listen', error);
+    }
+  );
+}
+
+// Writes the performances and the folded userStats/{uid} in one transaction, so two devices
+// writing at once retry against each other's result instead of overwriting it.
+// Performance IDs are chosen by the caller: one that already exists was counted by the transaction
+// that wrote it, so a retry after a lost acknowledgement neither duplicates nor double-counts it.
+// Rankings are not written here: tools/rankings.py picks the athlete up from userStats.updatedAt.
+export async function addPerformancesWithStats(
+  userId: string,
+  entries: { id: string; performance: PerformanceDoc }[]
+) {
+  const statsRef = doc(getDb(), 'userStats', userId);
+  await traced(
+    'firestore.performances.write',
+    () =>
+      runTransaction(getDb(), async (transaction) => {
+        const [snapshot, ...written] = await Promise.all([
+          transaction.get(statsRef),
+          ...entries.map((entry) => transaction.get(doc(getDb(), 'performances', entry.id))),
+        ]);
+        const current = snapshot.exists() ? { ...emptyStats(), ...(snapshot.data() as Partial<UserStats>) } : emptyStats();
+        const fresh = entries.filter((_, i) => !written[i].exists());
+        if (fresh.length === 0) return;
+        const next = fresh.reduce((stats, entry) => applyPerformance(stats, entry.performance), current);
+        for (const { id, performance } of fresh) {
+          transaction.set(doc(getDb(), 'performances', id), performance);
+        }
+        transaction.set(statsRef, { ...next, updatedAt: serverTimestamp() });
+      }),
+    { count: entries.length }
+  );
+}
@@ -0,0 +1,135 @@
+import { PerformanceDoc, newPerformanceId } from './performances';
+import { reportError, traced } from './telemetry';
+
+// Offline-first queue for performance writes.
+// Entries are persisted in IndexedDB first, so logging returns immediately,
+// then flushed in coalesced batches (one transaction and one userStats update per user).
+// The Firestore side (lib/userStats) is imported only when there is something to flush.
+
+export interface PendingPerformance {
+  id: string;
+  performance: PerformanceDoc;
+  queuedAt: number;
+}
+
+const DB_NAME = 'hyrox-write-queue';
+const STORE = 'pending';
+const FLUSH_DELAY = 1000;
+const MAX_RETRY_DELAY = 60000;
+// 500 writes per transaction, minus the userStats update
+const MAX_BATCH = 499;
+
+let dbPromise: Promise<IDBDatabase> | null = null;
+let flushTimer: ReturnType<typeof setTimeout> | null = null;
+let flushing: Promise<void> | null = null;
+let retryDelay = FLUSH_DELAY;
+const listeners = new Set<() => void>();
+
+function openQueue(): Promise<IDBDatabase> {
+  if (!dbPromise) {
+    dbPromise = new Promise((resolve, reject) => {
+      const request = indexedDB.open(DB_NAME, 1);
+      request.onupgradeneeded = () => {
+        const store = request.result.createObjectStore(STORE, { keyPath: 'id' });
+        store.createIndex('userId', 'performance.userId');
+      };
+      request.onsuccess = () => resolve(request.result);
+      request.onerror = () => reject(request.error);
+    });
+  }
+  return dbPromise;
+}
+
+function run<T>(mode: IDBTransactionMode, action: (store: IDBObjectStore) => IDBRequest<T> | void): Promise<T> {
+  return openQueue().then(
+    (db) =>
+      new Promise<T>((resolve, reject) => {
+        const transaction = db.transaction(STORE, mode);
+        const request = action(transaction.objectStore(STORE));
+        transaction.oncomplete = () => resolve(request ? request.result : (undefined as T));
+        transaction.onerror = () => reject(transaction.error);
+      })
+  );
+}
+
+const notify = () => listeners.forEach((listener) => listener());
+
+export function subscribePending(listener: () => void) {
+  listeners.add(listener);
+  return () => {
+    listeners.delete(listener);
+  };
+}
+
+export async function enqueuePerformance(performance: PerformanceDoc): Promise<PendingPerformance> {
+  const entry = { id: newPerformanceId(), performance, queuedAt: Date.now() };
+  await traced('writeQueue.enqueue', () => run('readwrite', (store) => store.put(entry)));
+  notify();
+  scheduleFlush(FLUSH_DELAY);
+  return entry;
+}
+
+export function pendingPerformances(userId: string): Promise<PendingPerformance[]> {
+  return run<PendingPerformance[]>('readonly', (store) => store.index('userId').getAll(userId));
+}
+
+function scheduleFlush(delay: number) {
+  if (flushTimer) clearTimeout(flushTimer);
+  flushTimer = setTimeout(() => {
+    flushTimer = null;
+    flushQueue();
+  }, delay);
+}
+
+async function flushPending() {
+  const pending = (await run<PendingPerformance[]>('readonly', (store) => store.getAll())).sort(
+    (a, b) => a.queuedAt - b.queuedAt
+  );
+  if (pending.length === 0) return;
+  const { addPerformancesWithStats } = await import('./userStats');
+
+  const byUser = new Map<string, PendingPerformance[]>();
+  for (const entry of pending) {
+    const entries = byUser.get(entry.performance.userId) ?? [];
+    entries.push(entry);
+    byUser.set(entry.performance.userId, entries);
+  }
+
+  for (const [userId, entries] of Array.from(byUser.entries())) {
+    for (let i = 0; i < entries.length; i += MAX_BATCH) {
+      const chunk = entries.slice(i, i + MAX_BATCH);
+      await addPerformancesWithStats(userId, chunk);
+      await run('readwrite', (store) => {
+        chunk.forEach((entry) => store.delete(entry.id));
+      });
+      notify();
+    }
+  }
+}
+
+export function flushQueue(): Promise<void> {
+  if (typeof navigator !== 'undefined' && !navigator.onLine) return Promise.resolve();
+  if (!flushing) {
+    flushing = flushPending()
+      .then(() => {
+        retryDelay = FLUSH_DELAY;
+      })
+      .catch((error) => {
+        reportError('writeQueue.flush', error);
+        retryDelay = Math.min(retryDelay * 2, MAX_RETRY_DELAY);
+        scheduleFlush(retryDelay);
+      })
+      .finally(() => {
+        flushing = null;
+      });
+  }
+  return flushing;
+}
+
+// Called once from _app: flush what a previous session left behind and whenever we come back online
+export function startQueue() {
+  const onOnline = () => flushQueue();
+  window.addEventListener('online', onOnline);
+  flushQueue();
+  return () => window.removeEventListener('online', onOnline);
+}
@@ -0,0 +1,27 @@
+import { NextRequest, NextResponse } from 'next/server';
+
+// Written by saveLanguage in lib/i18n.tsx
+const LOCALE_COOKIE = 'NEXT_LOCALE';
+// Same list as i18n.locales in next.config.js; lib/locales is not imported so no dictionary
+// loader ends up in the middleware bundle
+const LOCALES = ['fr', 'en'];
+const DEFAULT_LOCALE = 'fr';
+
+// Unprefixed deep links (/dashboard) resolve to the default locale. Send athletes who picked
+// another language to their prefix before anything renders, instead of swapping on the client.
+export function middleware(request: NextRequest) {
+  const saved = request.cookies.get(LOCALE_COOKIE)?.value;
+  if (!saved || saved === DEFAULT_LOCALE || !LOCALES.includes(saved)) return;
+  // nextUrl.pathname has the locale stripped; request.url still shows whether it was typed
+  const { pathname } = new URL(request.url);
+  if (LOCALES.some((locale) => pathname === `/${locale}` || pathname.startsWith(`/${locale}/`))) return;
+
+  const url = request.nextUrl.clone();
+  url.locale = saved;
+  return NextResponse.redirect(url);
+}
+
+export const config = {
+  // Pages only: no assets, data requests or files with an extension
+  matcher: ['/((?!api|_next|.*\\..*).*)'],
+};
@@ -0,0 +1,7 @@
+module.exports = {
+  i18n: {
+    // Same list as LANGUAGES in lib/locales/index.ts
+    locales: ['fr', 'en'],
+    defaultLocale: 'fr',
+  },
+};
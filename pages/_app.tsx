@@ -1,6 +1,24 @@
-import type { AppProps } from 'next/app';
+import type { AppProps, NextWebVitalsMetric } from 'next/app';
+import { useEffect } from 'react';
 import '../styles/globals.css';
+import { startQueue } from '../lib/writeQueue';
+import { SessionProvider } from '../lib/session';
+import { TranslationsProvider } from '../lib/i18n';
+import { recordWebVital } from '../lib/telemetry';
+
+// Next calls this once per metric (LCP, CLS, INP, TTFB, hydration, route changes...)
+export function reportWebVitals(metric: NextWebVitalsMetric) {
+  recordWebVital(metric);
+}
 
 export default function App({ Component, pageProps }: AppProps) {
-  return <Component {...pageProps} />;
-}
\ No newline at end of file
+  useEffect(() => startQueue(), []);
+
+  return (
+    <TranslationsProvider messages={pageProps.messages}>
+      <SessionProvider>
+        <Component {...pageProps} />
+      </SessionProvider>
+    </TranslationsProvider>
+  );
+}
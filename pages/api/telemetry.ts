@@ -0,0 +1,33 @@
+import type { NextApiRequest, NextApiResponse } from 'next';
+import type { Sample } from '../../lib/telemetry';
+import { fileSink } from '../../lib/telemetryFileSink';
+
+// Receives the batches sent by lib/telemetry's beacon sink.
+// Only active with TELEMETRY_FILE set (local runs and tests); a hosted collector takes its place otherwise.
+
+const MAX_SAMPLES = 500;
+
+const sink = process.env.TELEMETRY_FILE ? fileSink(process.env.TELEMETRY_FILE) : null;
+
+const isSample = (value: any): value is Sample =>
+  !!value && typeof value.name === 'string' && typeof value.kind === 'string' && typeof value.value === 'number';
+
+export default async function handler(req: NextApiRequest, res: NextApiResponse) {
+  if (req.method !== 'POST') {
+    res.setHeader('Allow', 'POST');
+    return res.status(405).end();
+  }
+  if (!sink) return res.status(404).end();
+
+  let body = req.body;
+  try {
+    // sendBeacon may arrive as text/plain
+    if (typeof body === 'string') body = JSON.parse(body);
+  } catch {
+    return res.status(400).end();
+  }
+  if (!Array.isArray(body) || body.length > MAX_SAMPLES || !body.every(isSample)) return res.status(400).end();
+
+  await sink(body, false);
+  res.status(204).end();
+}
@@ -0,0 +1,237 @@
+import React, { useCallback, useEffect, useMemo, useState } from 'react';
+import Link from 'next/link';
+import { useTranslations } from '../lib/i18n';
+import { translationProps } from '../lib/locales';
+import { useRequireUser } from '../lib/session';
+import { rollingAverage } from '../lib/userStats';
+import { formatDuration, predictFinish } from '../lib/prediction';
+import { mark, now, reportError } from '../lib/telemetry';
+import {
+  RECENT_DAYS,
+  SquadAthlete,
+  createInvite,
+  fetchSquadIds,
+  invalidateSquadCache,
+  loadSquad,
+  removeAthlete,
+} from '../lib/squad';
+
+export const getStaticProps = translationProps;
+
+export default function Coach() {
+  const { t, language, toggleLanguage } = useTranslations();
+  const { user, profile } = useRequireUser();
+  const [squad, setSquad] = useState<SquadAthlete[]>([]);
+  const [loading, setLoading] = useState(true);
+  const [inviteLink, setInviteLink] = useState<string | null>(null);
+  const [inviting, setInviting] = useState(false);
+
+  // Roster first, then every athlete in one round of batched queries
+  const load = useCallback(async (coachId: string) => {
+    try {
+      setSquad(await loadSquad(await fetchSquadIds(coachId)));
+    } catch (error) {
+      reportError('coach.load', error);
+    }
+    setLoading(false);
+  }, []);
+
+  useEffect(() => {
+    if (user) load(user.uid);
+  }, [user, load]);
+
+  // Timed from mount, like dashboard.firstRender
+  const [mountedAt] = useState(now);
+  useEffect(() => {
+    if (!loading) mark('coach.firstRender', { athletes: squad.length }, mountedAt);
+    // Once, when the squad first shows
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [loading]);
+
+  // The athlete shows up in the squad once they accept on /invite
+  const handleInvite = async () => {
+    if (!user) return;
+    setInviting(true);
+    try {
+      const inviteId = await createInvite(user.uid, profile?.name ?? user.email ?? '');
+      // Unprefixed: the athlete lands in their own language
+      setInviteLink(`${window.location.origin}/invite?id=${inviteId}`);
+    } catch (error) {
+      reportError('coach.invite', error);
+      alert(t.error);
+    } finally {
+      setInviting(false);
+    }
+  };
+
+  const handleRemove = async (athleteId: string) => {
+    if (!user) return;
+    try {
+      await removeAthlete(user.uid, athleteId);
+      invalidateSquadCache(athleteId);
+      setSquad((current) => current.filter((athlete) => athlete.id !== athleteId));
+    } catch (error) {
+      reportError('coach.remove', error);
+    }
+  };
+
+  // One row per athlete, derived once per load
+  const rows = useMemo(
+    () =>
+      squad.map((athlete) => {
+        const prediction = predictFinish(athlete.stats.fit);
+        const target = athlete.profile ? athlete.profile.targetTime * 60 : null;
+        return {
+          ...athlete,
+          prediction: prediction ? prediction.total : null,
+          gap: prediction && target ? prediction.total - target : null,
+          average: rollingAverage(athlete.stats),
+        };
+      }),
+    [squad]
+  );
+
+  const totals = useMemo(() => {
+    const bests = squad.map((athlete) => athlete.stats.bestTotalTime).filter((time): time is number => time !== null);
+    return {
+      recent: squad.reduce((sum, athlete) => sum + athlete.recent.length, 0),
+      averageBest: bests.length > 0 ? Math.round(bests.reduce((sum, time) => sum + time, 0) / bests.length) : null,
+    };
+  }, [squad]);
+
+  if (loading) {
+    return (
+      <div className="min-h-screen bg-gradient-to-br from-slate-950 via-blue-950 to-slate-900 flex items-center justify-center">
+        <div className="text-white text-2xl font-black" style={{ fontFamily: 'Arial Black, sans-serif' }}>⏳ {t.loading}...</div>
+      </div>
+    );
+  }
+
+  return (
+    <div className="min-h-screen bg-gradient-to-br from-slate-950 via-blue-950 to-slate-900">
+      {/* Header */}
+      <header className="bg-slate-900/50 backdrop-blur border-b-2 border-cyan-400/30 p-6">
+        <div className="max-w-7xl mx-auto flex justify-between items-center">
+          <h1 className="text-3xl font-black text-cyan-400">👥 {t.coachView}</h1>
+          <div className="flex gap-4">
+            <button
+              onClick={toggleLanguage}
+              className="px-6 py-3 bg-cyan-400 hover:bg-cyan-300 text-slate-950 font-black rounded-lg"
+            >
+              {language === 'fr' ? '🇬🇧 EN' : '🇫🇷 FR'}
+            </button>
+            <Link href="/dashboard" className="px-6 py-3 bg-blue-600 hover:bg-blue-700 text-white font-black rounded-lg">
+              ← {t.dashboard}
+            </Link>
+          </div>
+        </div>
+      </header>
+
+      <main className="max-w-7xl mx-auto p-6">
+        {/* Squad totals */}
+        <div className="grid grid-cols-1 md:grid-cols-3 gap-6 mb-8">
+          <div className="bg-gradient-to-br from-slate-800 to-slate-900 rounded-xl shadow-xl p-6 border border-cyan-400/30">
+            <p className="text-gray-400 text-sm font-black" style={{ fontFamily: 'Arial Black, sans-serif' }}>👥 {t.athletes}</p>
+            <p className="text-4xl font-black text-cyan-400">{squad.length}</p>
+          </div>
+          <div className="bg-gradient-to-br from-slate-800 to-slate-900 rounded-xl shadow-xl p-6 border border-cyan-400/30">
+            <p className="text-gray-400 text-sm font-black" style={{ fontFamily: 'Arial Black, sans-serif' }}>
+              📈 {t.recentSessions} ({RECENT_DAYS} {t.days})
+            </p>
+            <p className="text-4xl font-black text-cyan-400">{totals.recent}</p>
+          </div>
+          <div className="bg-gradient-to-br from-slate-800 to-slate-900 rounded-xl shadow-xl p-6 border border-cyan-400/30">
+            <p className="text-gray-400 text-sm font-black" style={{ fontFamily: 'Arial Black, sans-serif' }}>🏆 {t.bestTotal} (Ø)</p>
+            <p className="text-4xl font-black text-cyan-400">{totals.averageBest !== null ? formatDuration(totals.averageBest) : '-'}</p>
+          </div>
+        </div>
+
+        {/* Invite athlete */}
+        <div className="mb-8">
+          <button
+            onClick={handleInvite}
+            disabled={inviting}
+            className="px-6 py-3 bg-gradient-to-r from-cyan-500 to-blue-500 hover:from-cyan-400 hover:to-blue-400 text-slate-950 font-black rounded-lg transition disabled:opacity-50"
+            style={{ fontFamily: 'Arial Black, sans-serif' }}
+          >
+            {inviting ? `⏳ ${t.loading}` : `➕ ${t.inviteAthlete}`}
+          </button>
+          {inviteLink && (
+            <div className="mt-4">
+              <p className="text-gray-400 text-sm font-bold mb-2">{t.inviteLinkHelp}</p>
+              <div className="flex gap-4">
+                <input
+                  readOnly
+                  value={inviteLink}
+                  onFocus={(e) => e.target.select()}
+                  className="flex-1 px-4 py-3 bg-slate-800 border border-cyan-400/30 rounded-lg text-white font-bold focus:outline-none focus:border-cyan-400"
+                />
+                <button
+                  onClick={() => navigator.clipboard?.writeText(inviteLink)}
+                  className="px-6 py-3 bg-slate-700 hover:bg-slate-600 text-gray-300 font-black rounded-lg transition"
+                >
+                  {t.copy}
+                </button>
+              </div>
+            </div>
+          )}
+        </div>
+
+        {/* Squad */}
+        <div className="bg-gradient-to-br from-slate-800 to-slate-900 rounded-xl shadow-xl p-6 border border-cyan-400/30">
+          <h3 className="text-2xl font-black text-cyan-400 mb-6" style={{ fontFamily: 'Arial Black, sans-serif' }}>🎯 {t.squad}</h3>
+          {rows.length === 0 ? (
+            <p className="text-gray-400 font-bold">{t.noAthletes}</p>
+          ) : (
+            <div className="space-y-3">
+              {rows.map((row) => (
+                <div key={row.id} className="bg-slate-800/50 border border-cyan-400/20 rounded-lg p-4 grid grid-cols-2 md:grid-cols-6 gap-4 items-center">
+                  <div className="md:col-span-2">
+                    <p className="text-white font-black text-lg" style={{ fontFamily: 'Arial Black, sans-serif' }}>{row.profile?.name ?? row.id}</p>
+                    <p className="text-gray-400 text-sm">
+                      {row.profile?.category ?? '-'} · {t.targetTime}: {row.profile?.targetTime ?? '-'}
+                    </p>
+                  </div>
+                  <div>
+                    <p className="text-gray-400 text-xs font-bold">{t.sessions}</p>
+                    <p className="text-cyan-400 font-black">
+                      {row.stats.totalSessions} <span className="text-gray-400 text-sm">(+{row.recent.length})</span>
+                    </p>
+                  </div>
+                  <div>
+                    <p className="text-gray-400 text-xs font-bold">{t.bestTotal}</p>
+                    <p className="text-cyan-400 font-black tabular-nums">
+                      {row.stats.bestTotalTime !== null ? formatDuration(row.stats.bestTotalTime) : '-'}
+                      {row.average !== null && <span className="text-gray-400 text-sm"> · Ø {formatDuration(row.average)}</span>}
+                    </p>
+                  </div>
+                  <div>
+                    <p className="text-gray-400 text-xs font-bold">🔮 {t.predictedTime}</p>
+                    <p className="text-cyan-400 font-black tabular-nums">
+                      {row.prediction !== null ? formatDuration(row.prediction) : '-'}
+                      {row.gap !== null && (
+                        <span className={`text-sm ${row.gap > 0 ? 'text-red-400' : 'text-green-400'}`}>
+                          {' '}
+                          ({row.gap > 0 ? '+' : '−'}
+                          {formatDuration(Math.abs(row.gap))})
+                        </span>
+                      )}
+                    </p>
+                  </div>
+                  <div className="text-right">
+                    <button
+                      onClick={() => handleRemove(row.id)}
+                      className="px-4 py-2 bg-slate-700 hover:bg-slate-600 text-gray-300 font-black rounded-lg transition"
+                    >
+                      {t.remove}
+                    </button>
+                  </div>
+                </div>
+              ))}
+            </div>
+          )}
+        </div>
+      </main>
+    </div>
+  );
+}
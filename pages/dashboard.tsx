@@ -1,65 +1,171 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useCallback, useMemo } from 'react';
 import { useRouter } from 'next/router';
-import { auth, db } from '../lib/firebase';
-import { signOut, onAuthStateChanged } from 'firebase/auth';
-import { collection, query, where, getDocs } from 'firebase/firestore';
+import { getFirebaseAuth } from '../lib/firebase';
+import { signOut } from 'firebase/auth';
+import { QueryDocumentSnapshot } from 'firebase/firestore';
 import Link from 'next/link';
-import { translations, Language } from '../lib/translations';
+import { useTranslations } from '../lib/i18n';
+import { translationProps } from '../lib/locales';
+import { Performance } from '../lib/performances';
+import { applyPerformance, emptyStats, listenToUserStats, rollingAverage, UserStats } from '../lib/userStats';
+import { PerformanceStore, fetchPerformancePage, listenToPerformances } from '../lib/performanceStore';
+import { pendingPerformances, subscribePending } from '../lib/writeQueue';
+import { STATION_KEYS } from '../lib/stations';
+import { takeDashboardPrefetch, useRequireUser } from '../lib/session';
+import HistoryList from '../components/HistoryList';
+import { useAnalytics } from '../lib/useAnalytics';
+import { mark, now, reportError } from '../lib/telemetry';
+import { formatDuration, pacingPlan, predictFinish } from '../lib/prediction';
+import { RankScope, Ranking, RankingEntry, categoryAverage, fetchLeaderboard, fetchRankings, rankOf } from '../lib/rankings';
 
-interface Performance {
-  id: string;
-  station: string;
-  time: number;
-  date: string;
-}
+const LEADERBOARD_SIZE = 10;
+
+export const getStaticProps = translationProps;
 
 export default function Dashboard() {
   const router = useRouter();
-  const [language, setLanguage] = useState<Language>('fr');
-  const [user, setUser] = useState<any>(null);
+  const { t, language, toggleLanguage } = useTranslations();
+  const { user, profile } = useRequireUser();
   const [performances, setPerformances] = useState<Performance[]>([]);
+  const [stats, setStats] = useState<UserStats | null>(null);
+  const [pending, setPending] = useState<Performance[]>([]);
+  const [cursor, setCursor] = useState<QueryDocumentSnapshot | null>(null);
+  const [hasMore, setHasMore] = useState(false);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [loading, setLoading] = useState(true);
+  const [rankings, setRankings] = useState<{ scope: RankScope; ranking: Ranking }[]>([]);
+  const [showLeaderboard, setShowLeaderboard] = useState(false);
+  const [leaderboard, setLeaderboard] = useState<RankingEntry[]>([]);
 
-  const t = translations[language];
+  const [store] = useState(() => new PerformanceStore());
 
-  useEffect(() => {
-    const savedLang = localStorage.getItem('hyrox-language') as Language;
-    if (savedLang) setLanguage(savedLang);
+  useEffect(() => store.subscribe(setPerformances), [store]);
+
+  const loadPending = useCallback(async (uid: string) => {
+    const entries = await pendingPerformances(uid);
+    setPending(entries.map((entry) => ({ id: entry.id, ...entry.performance })));
   }, []);
 
-  const toggleLanguage = () => {
-    const newLang = language === 'fr' ? 'en' : 'fr';
-    setLanguage(newLang);
-    localStorage.setItem('hyrox-language', newLang);
-  };
+  const userId = user?.uid ?? null;
 
   useEffect(() => {
-    const unsubscribe = onAuthStateChanged(auth, async (currentUser) => {
-      if (!currentUser) {
-        router.push('/login');
-      } else {
-        setUser(currentUser);
-        try {
-          const q = query(collection(db, 'performances'), where('userId', '==', currentUser.uid));
-          const querySnapshot = await getDocs(q);
-          setPerformances(
-            querySnapshot.docs.map((doc) => ({ id: doc.id, ...doc.data() })) as Performance[]
-          );
-        } catch (error) {
-          console.log('Error:', error);
-        }
+    store.clear();
+    if (!userId) return;
+    let cancelled = false;
+    let stopPerformances = () => {};
+    const stopStats = listenToUserStats(userId, setStats);
+
+    (async () => {
+      try {
+        // Usually already in flight: the session provider starts it as soon as the user signs in
+        const [page] = await Promise.all([
+          takeDashboardPrefetch(userId) ?? fetchPerformancePage(userId),
+          loadPending(userId),
+        ]);
+        if (cancelled) return;
+        store.upsertAll(page.performances);
+        setCursor(page.cursor);
+        setHasMore(page.hasMore);
+        // Live from the oldest loaded date onwards: new, edited and deleted performances arrive as diffs
+        const oldest = page.hasMore ? page.performances[page.performances.length - 1].date : 0;
+        stopPerformances = listenToPerformances(store, userId, oldest);
+      } catch (error) {
+        reportError('dashboard.load', error);
       }
-      setLoading(false);
+      if (!cancelled) setLoading(false);
+    })();
+
+    return () => {
+      cancelled = true;
+      stopPerformances();
+      stopStats();
+    };
+  }, [userId, store, loadPending]);
+
+  // First meaningful render: the spinner gives way to the athlete's data. Timed from mount, since
+  // the dashboard is usually entered by router.push from /login
+  const [mountedAt] = useState(now);
+  useEffect(() => {
+    if (!loading) mark('dashboard.firstRender', { performances: store.performances.length }, mountedAt);
+  }, [loading, store, mountedAt]);
+
+  // Queued writes show up immediately; once flushed they come back through the listener
+  useEffect(() => {
+    if (!user) return;
+    return subscribePending(() => {
+      loadPending(user.uid).catch((error) => reportError('dashboard.pending', error));
     });
-    return () => unsubscribe();
-  }, [router]);
+  }, [user, loadPending]);
+
+  // Derived once per data change, not on every render (language toggle, load-more spinner...)
+  const { history, queuedIds, unsynced } = useMemo(() => {
+    const storedIds = new Set(performances.map((perf) => perf.id));
+    // Committed but not yet acknowledged writes are already in the store and in the live stats
+    const unsynced = pending.filter((perf) => !storedIds.has(perf.id));
+    return {
+      unsynced,
+      queuedIds: new Set(pending.map((perf) => perf.id)),
+      history: unsynced.length > 0 ? [...unsynced.slice().sort((a, b) => b.date - a.date), ...performances] : performances,
+    };
+  }, [performances, pending]);
+  // Means, trends and the predicted total come from the analytics worker
+  const analytics = useAnalytics(store, unsynced);
+  const displayStats = useMemo(
+    () => (unsynced.length > 0 ? unsynced.reduce(applyPerformance, stats ?? emptyStats()) : stats),
+    [unsynced, stats]
+  );
+
+  // Finish projection from the per-segment fit kept in userStats, paced against the profile target
+  const prediction = useMemo(() => (displayStats ? predictFinish(displayStats.fit) : null), [displayStats]);
+  const targetSeconds = (profile?.targetTime ?? 60) * 60;
+  const plan = useMemo(() => (prediction ? pacingPlan(prediction, targetSeconds) : []), [prediction, targetSeconds]);
+
+  // Rankings change rarely: fetched once per profile, and again when our best time moves
+  const bestTotalTime = displayStats?.bestTotalTime ?? null;
+  useEffect(() => {
+    if (!profile) return;
+    fetchRankings(profile)
+      .then(setRankings)
+      .catch((error) => reportError('dashboard.rankings', error));
+  }, [profile, bestTotalTime]);
+
+  // Narrowest scope: same category, gender and age group; queried only once the list is opened
+  const leaderboardScope = rankings.length > 0 ? rankings[rankings.length - 1].scope.id : null;
+  useEffect(() => {
+    if (!showLeaderboard || !leaderboardScope) return;
+    fetchLeaderboard(leaderboardScope, LEADERBOARD_SIZE)
+      .then(setLeaderboard)
+      .catch((error) => reportError('dashboard.leaderboard', error));
+  }, [showLeaderboard, leaderboardScope, bestTotalTime]);
+
+  const scopeLabel = (scope: RankScope) =>
+    scope.level === 'category'
+      ? profile!.category
+      : scope.level === 'gender'
+        ? `${profile!.category} · ${profile!.gender === 'female' ? t.female : t.male}`
+        : `${profile!.category} · ${profile!.gender === 'female' ? t.female : t.male} · ${scope.id.split('_').pop()}`;
+
+  const loadMore = useCallback(async () => {
+    if (!user || !hasMore || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      const page = await fetchPerformancePage(user.uid, cursor);
+      store.upsertAll(page.performances);
+      setCursor(page.cursor);
+      setHasMore(page.hasMore);
+    } catch (error) {
+      reportError('dashboard.loadMore', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  }, [user, store, cursor, hasMore, loadingMore]);
 
   const handleLogout = async () => {
     try {
-      await signOut(auth);
+      await signOut(getFirebaseAuth());
       router.push('/login');
     } catch (error) {
-      console.log('Error:', error);
+      reportError('dashboard.logout', error);
     }
   };
 
@@ -113,7 +219,9 @@ export default function Dashboard() {
             <div className="flex items-center justify-between">
               <div>
                 <p className="text-gray-400 text-sm font-black" style={{ fontFamily: 'Arial Black, sans-serif' }}>📊 {t.trackPerformance}</p>
-                <p className="text-4xl font-black text-cyan-400">{performances.length}</p>
+                <p className="text-4xl font-black text-cyan-400">
+                  {displayStats ? displayStats.totalSessions : `${history.length}${hasMore ? '+' : ''}`}
+                </p>
               </div>
               <div className="text-6xl">📈</div>
             </div>
@@ -123,7 +231,7 @@ export default function Dashboard() {
             <div className="flex items-center justify-between">
               <div>
                 <p className="text-gray-400 text-sm font-black" style={{ fontFamily: 'Arial Black, sans-serif' }}>🏆 CATÉGORIE</p>
-                <p className="text-3xl font-black text-cyan-400">Elite</p>
+                <p className="text-3xl font-black text-cyan-400">{profile?.category ?? '-'}</p>
               </div>
               <div className="text-6xl">🎖️</div>
             </div>
@@ -133,13 +241,75 @@ export default function Dashboard() {
             <div className="flex items-center justify-between">
               <div>
                 <p className="text-gray-400 text-sm font-black" style={{ fontFamily: 'Arial Black, sans-serif' }}>⏱️ {t.targetTime}</p>
-                <p className="text-3xl font-black text-cyan-400">60 min</p>
+                <p className="text-3xl font-black text-cyan-400">{profile?.targetTime ?? 60} min</p>
               </div>
               <div className="text-6xl">⏰</div>
             </div>
           </div>
         </div>
 
+        {/* Personal Bests */}
+        {displayStats && Object.keys(displayStats.personalBests).length > 0 && (
+          <div className="bg-gradient-to-br from-slate-800 to-slate-900 rounded-xl shadow-xl p-6 border border-cyan-400/30 mb-8">
+            <div className="flex justify-between items-center mb-4">
+              <h3 className="text-2xl font-black text-cyan-400" style={{ fontFamily: 'Arial Black, sans-serif' }}>🥇 {t.personalBest}</h3>
+              <div className="text-right">
+                {rollingAverage(displayStats) !== null && (
+                  <p className="text-gray-400 font-bold">
+                    ⏱️ {t.totalTime}: {displayStats.latestTotalTime}s · Ø {rollingAverage(displayStats)}s
+                  </p>
+                )}
+              </div>
+            </div>
+            <div className="grid grid-cols-2 md:grid-cols-4 gap-4">
+              {STATION_KEYS.filter((key) => displayStats.personalBests[key]).map((key) => (
+                <div key={key} className="bg-slate-800/50 border border-cyan-400/20 rounded-lg p-3">
+                  <p className="text-gray-400 text-sm font-bold">{t[key]}</p>
+                  <p className="text-cyan-400 font-black text-xl">{displayStats.personalBests[key]}s</p>
+                  {/* Mean and trend cover the pages loaded so far, unlike the all-time best above */}
+                  {analytics && analytics.stations[key].mean !== null && (
+                    <p className="text-gray-400 text-xs font-bold">
+                      Ø {analytics.stations[key].mean}s
+                      {analytics.stations[key].trend !== null &&
+                        ` · ${analytics.stations[key].trend! <= 0 ? '↘' : '↗'} ${analytics.stations[key].trend}s / 30 ${t.days}`}
+                      {` · ${analytics.stations[key].count} ${t.recentSessions.toLowerCase()}`}
+                    </p>
+                  )}
+                </div>
+              ))}
+            </div>
+          </div>
+        )}
+
+        {/* Race prediction */}
+        {prediction && (
+          <div className="bg-gradient-to-br from-slate-800 to-slate-900 rounded-xl shadow-xl p-6 border border-cyan-400/30 mb-8">
+            <div className="flex justify-between items-center mb-4">
+              <h3 className="text-2xl font-black text-cyan-400" style={{ fontFamily: 'Arial Black, sans-serif' }}>🔮 {t.racePrediction}</h3>
+              <div className="text-right">
+                <p className="text-cyan-400 font-black text-xl tabular-nums">{formatDuration(prediction.total)}</p>
+                <p className="text-gray-400 font-bold tabular-nums">
+                  🎯 {t.target}: {formatDuration(targetSeconds)} ({prediction.total > targetSeconds ? '+' : '−'}
+                  {formatDuration(Math.abs(prediction.total - targetSeconds))})
+                </p>
+              </div>
+            </div>
+            <p className="text-gray-400 text-sm font-black mb-2" style={{ fontFamily: 'Arial Black, sans-serif' }}>{t.pacingPlan}</p>
+            <div className="grid grid-cols-2 md:grid-cols-5 gap-4">
+              {plan.map(({ segment, predicted, target }) => (
+                <div key={segment} className="bg-slate-800/50 border border-cyan-400/20 rounded-lg p-3">
+                  <p className="text-gray-400 text-sm font-bold">
+                    {segment === 'run' ? `🏃 ${t.run} ${t.perKm}` : t[segment]}
+                    {!prediction.measured.includes(segment) && <span className="text-xs"> · {t.estimated}</span>}
+                  </p>
+                  <p className="text-cyan-400 font-black text-xl tabular-nums">{formatDuration(target)}</p>
+                  <p className="text-gray-400 text-xs font-bold tabular-nums">{formatDuration(predicted)}</p>
+                </div>
+              ))}
+            </div>
+          </div>
+        )}
+
         {/* Sections */}
         <div className="grid grid-cols-1 lg:grid-cols-2 gap-6 mb-8">
           <div className="bg-gradient-to-br from-slate-800 to-slate-900 rounded-xl shadow-xl p-6 border border-cyan-400/30">
@@ -152,34 +322,96 @@ export default function Dashboard() {
             >
               ➕ {t.logNewPerformance}
             </Link>
+            <Link
+              href="/race"
+              className="inline-block ml-4 px-6 py-3 bg-blue-600 hover:bg-blue-700 text-white font-black rounded-lg transition transform hover:scale-105"
+              style={{ fontFamily: 'Arial Black, sans-serif' }}
+            >
+              ⏱️ {t.liveRace}
+            </Link>
+            <Link
+              href="/coach"
+              className="inline-block ml-4 px-6 py-3 bg-slate-700 hover:bg-slate-600 text-white font-black rounded-lg transition transform hover:scale-105"
+              style={{ fontFamily: 'Arial Black, sans-serif' }}
+            >
+              👥 {t.coachView}
+            </Link>
           </div>
 
           <div className="bg-gradient-to-br from-slate-800 to-slate-900 rounded-xl shadow-xl p-6 border border-cyan-400/30">
             <h3 className="text-2xl font-black text-cyan-400 mb-4" style={{ fontFamily: 'Arial Black, sans-serif' }}>🏅 {t.benchmarks}</h3>
             <p className="text-gray-400 mb-4">{language === 'fr' ? 'Comparez vos performances avec les meilleurs athlètes' : 'Compare your performance with the best athletes'}</p>
-            <button className="px-6 py-3 bg-gradient-to-r from-cyan-500 to-blue-500 hover:from-cyan-400 hover:to-blue-400 text-slate-950 font-black rounded-lg transition transform hover:scale-105" style={{ fontFamily: 'Arial Black, sans-serif' }}>
-              📊 {t.benchmarks}
+            {rankings.length > 0 && (
+              <div className="space-y-2 mb-4">
+                {rankings.map(({ scope, ranking }) => {
+                  const position = bestTotalTime !== null ? rankOf(ranking, bestTotalTime) : null;
+                  return (
+                    <div key={scope.id} className="bg-slate-800/50 border border-cyan-400/20 rounded-lg p-3 flex justify-between items-center">
+                      <div>
+                        <p className="text-white font-black">{scopeLabel(scope)}</p>
+                        <p className="text-gray-400 text-sm">
+                          {t.categoryAverage}: {categoryAverage(ranking) !== null ? `${categoryAverage(ranking)}s` : '-'}
+                        </p>
+                      </div>
+                      {position && position.total > 0 && (
+                        <p className="text-cyan-400 font-black text-right">
+                          #{position.rank} / {position.total}
+                          <span className="block text-gray-400 text-sm">Top {Math.max(100 - position.percentile, 1)}%</span>
+                        </p>
+                      )}
+                    </div>
+                  );
+                })}
+              </div>
+            )}
+            <button
+              onClick={() => setShowLeaderboard(!showLeaderboard)}
+              disabled={rankings.length === 0}
+              className="px-6 py-3 bg-gradient-to-r from-cyan-500 to-blue-500 hover:from-cyan-400 hover:to-blue-400 text-slate-950 font-black rounded-lg transition transform hover:scale-105 disabled:opacity-50"
+              style={{ fontFamily: 'Arial Black, sans-serif' }}
+            >
+              📊 {t.leaderboard}
             </button>
+            {showLeaderboard && leaderboard.length > 0 && (
+              <ol className="mt-4 space-y-2">
+                {leaderboard.map((entry, i) => (
+                  <li
+                    key={entry.userId}
+                    className={`rounded-lg p-3 flex justify-between ${entry.userId === user?.uid ? 'bg-cyan-400/20 border border-cyan-400' : 'bg-slate-800/50 border border-cyan-400/20'}`}
+                  >
+                    <span className="text-white font-black">#{i + 1} {entry.name}</span>
+                    <span className="text-cyan-400 font-black">{entry.time}s</span>
+                  </li>
+                ))}
+              </ol>
+            )}
           </div>
         </div>
 
         {/* Performances List */}
-        {performances.length > 0 && (
+        {history.length > 0 && (
           <div className="bg-gradient-to-br from-slate-800 to-slate-900 rounded-xl shadow-xl p-6 border border-cyan-400/30">
             <h3 className="text-2xl font-black text-cyan-400 mb-6" style={{ fontFamily: 'Arial Black, sans-serif' }}>🎯 {language === 'fr' ? 'Vos Performances' : 'Your Performances'}</h3>
-            <div className="space-y-3">
-              {performances.map((perf, index) => (
-                <div key={perf.id} className="bg-slate-800/50 border border-cyan-400/20 hover:border-cyan-400/50 rounded-lg p-4 flex justify-between items-center transition">
-                  <div>
-                    <p className="text-white font-black text-lg" style={{ fontFamily: 'Arial Black, sans-serif' }}>#{index + 1} - {perf.station}</p>
-                    <p className="text-gray-400 text-sm">{perf.date}</p>
-                  </div>
-                  <div className="text-right">
-                    <p className="text-cyan-400 font-black text-2xl">{perf.time}s</p>
-                  </div>
-                </div>
-              ))}
-            </div>
+            {/* Infinite scroll: the list asks for the next page as its last rows come into view */}
+            <HistoryList
+              history={history}
+              queuedIds={queuedIds}
+              t={t}
+              language={language}
+              onEndReached={hasMore ? loadMore : undefined}
+            />
+            {hasMore && (
+              <div className="mt-6 text-center">
+                <button
+                  onClick={loadMore}
+                  disabled={loadingMore}
+                  className="px-6 py-3 bg-slate-700 hover:bg-slate-600 text-cyan-400 font-black rounded-lg transition disabled:opacity-50"
+                  style={{ fontFamily: 'Arial Black, sans-serif' }}
+                >
+                  {loadingMore ? `⏳ ${t.loading}` : `⬇️ ${t.loadMore}`}
+                </button>
+              </div>
+            )}
           </div>
         )}
 
@@ -0,0 +1,103 @@
+import React, { useEffect, useState } from 'react';
+import { useRouter } from 'next/router';
+import { useTranslations } from '../lib/i18n';
+import { translationProps } from '../lib/locales';
+import { useRequireUser } from '../lib/session';
+import { reportError } from '../lib/telemetry';
+import { CoachInvite, acceptInvite, declineInvite, fetchInvite } from '../lib/squad';
+
+export const getStaticProps = translationProps;
+
+// Landing page of a coach's invite link: the athlete decides whether the coach may follow them
+export default function Invite() {
+  const router = useRouter();
+  const { t, language, toggleLanguage } = useTranslations();
+  const { user } = useRequireUser();
+  const [invite, setInvite] = useState<CoachInvite | null>(null);
+  const [loading, setLoading] = useState(true);
+  const [saving, setSaving] = useState(false);
+  const inviteId = typeof router.query.id === 'string' ? router.query.id : null;
+
+  useEffect(() => {
+    if (!router.isReady || !user) return;
+    if (!inviteId) {
+      setLoading(false);
+      return;
+    }
+    fetchInvite(inviteId)
+      // A coach opening their own link has nothing to accept
+      .then((found) => setInvite(found && found.coachId !== user.uid ? found : null))
+      .catch((error) => reportError('invite.load', error))
+      .finally(() => setLoading(false));
+  }, [router.isReady, inviteId, user]);
+
+  const handleAnswer = async (accepted: boolean) => {
+    if (!user || !invite || !inviteId) return;
+    setSaving(true);
+    try {
+      if (accepted) await acceptInvite(user.uid, inviteId, invite);
+      else await declineInvite(inviteId);
+      router.push('/dashboard');
+    } catch (error) {
+      reportError(accepted ? 'invite.accept' : 'invite.decline', error);
+      alert(t.error);
+      setSaving(false);
+    }
+  };
+
+  if (loading) {
+    return (
+      <div className="min-h-screen bg-gradient-to-br from-slate-950 via-blue-950 to-slate-900 flex items-center justify-center">
+        <div className="text-white text-2xl font-black" style={{ fontFamily: 'Arial Black, sans-serif' }}>⏳ {t.loading}...</div>
+      </div>
+    );
+  }
+
+  return (
+    <div className="min-h-screen bg-gradient-to-br from-slate-950 via-blue-950 to-slate-900">
+      {/* Header */}
+      <header className="bg-slate-900/50 backdrop-blur border-b-2 border-cyan-400/30 p-6">
+        <div className="max-w-4xl mx-auto flex justify-between items-center">
+          <h1 className="text-3xl font-black text-cyan-400">👥 {t.coachInvite}</h1>
+          <button
+            onClick={toggleLanguage}
+            className="px-6 py-3 bg-cyan-400 hover:bg-cyan-300 text-slate-950 font-black rounded-lg"
+          >
+            {language === 'fr' ? '🇬🇧 EN' : '🇫🇷 FR'}
+          </button>
+        </div>
+      </header>
+
+      <main className="max-w-4xl mx-auto p-6">
+        <div className="bg-gradient-to-br from-slate-800 to-slate-900 rounded-xl shadow-xl p-8 border border-cyan-400/30 text-center">
+          {invite ? (
+            <>
+              <p className="text-white font-black text-xl mb-8">
+                <span className="text-cyan-400">{invite.coachName}</span> {t.inviteRequest}
+              </p>
+              <div className="flex gap-4 justify-center">
+                <button
+                  onClick={() => handleAnswer(true)}
+                  disabled={saving}
+                  className="px-8 py-3 bg-gradient-to-r from-cyan-500 to-blue-500 hover:from-cyan-400 hover:to-blue-400 text-slate-950 font-black rounded-lg transition disabled:opacity-50"
+                  style={{ fontFamily: 'Arial Black, sans-serif' }}
+                >
+                  ✅ {t.accept}
+                </button>
+                <button
+                  onClick={() => handleAnswer(false)}
+                  disabled={saving}
+                  className="px-8 py-3 bg-slate-700 hover:bg-slate-600 text-gray-300 font-black rounded-lg transition disabled:opacity-50"
+                >
+                  {t.decline}
+                </button>
+              </div>
+            </>
+          ) : (
+            <p className="text-gray-400 font-bold">{t.inviteInvalid}</p>
+          )}
+        </div>
+      </main>
+    </div>
+  );
+}
@@ -1,13 +1,18 @@
 import React, { useState, useEffect } from 'react';
 import { useRouter } from 'next/router';
-import { auth, db } from '../lib/firebase';
-import { createUserWithEmailAndPassword, signInWithEmailAndPassword, onAuthStateChanged } from 'firebase/auth';
-import { doc, setDoc } from 'firebase/firestore';
-import { translations, Language } from '../lib/translations';
+import { getFirebaseAuth } from '../lib/firebase';
+import { createUserWithEmailAndPassword, signInWithEmailAndPassword } from 'firebase/auth';
+import { useTranslations } from '../lib/i18n';
+import { translationProps } from '../lib/locales';
+import { useSession } from '../lib/session';
+import { afterLogin } from '../lib/redirect';
+
+export const getStaticProps = translationProps;
 
 export default function Login() {
   const router = useRouter();
-  const [language, setLanguage] = useState<Language>('fr');
+  const { user, setProfile } = useSession();
+  const { t, language, toggleLanguage } = useTranslations();
   const [isSignup, setIsSignup] = useState(false);
   const [loading, setLoading] = useState(false);
   const [form, setForm] = useState({
@@ -21,27 +26,14 @@ export default function Login() {
     gender: 'male',
   });
 
-  const t = translations[language];
+  // Back to the page that sent us here (an invite link, say), the dashboard otherwise
+  const next = afterLogin(router.query.next);
 
+  // Already signed in, or just signed in: the session provider is prefetching the dashboard meanwhile.
+  // The query of a prerendered page is only known once the router is ready.
   useEffect(() => {
-    const savedLang = localStorage.getItem('hyrox-language') as Language;
-    if (savedLang) setLanguage(savedLang);
-  }, []);
-
-  const toggleLanguage = () => {
-    const newLang = language === 'fr' ? 'en' : 'fr';
-    setLanguage(newLang);
-    localStorage.setItem('hyrox-language', newLang);
-  };
-
-  useEffect(() => {
-    const unsubscribe = onAuthStateChanged(auth, (user) => {
-      if (user) {
-        router.push('/dashboard');
-      }
-    });
-    return () => unsubscribe();
-  }, [router]);
+    if (user && router.isReady) router.push(next);
+  }, [user, router, next]);
 
   const handleChange = (e: React.ChangeEvent<HTMLInputElement | HTMLSelectElement>) => {
     const { name, value } = e.target;
@@ -68,9 +60,10 @@ export default function Login() {
           return;
         }
 
-        const userCredential = await createUserWithEmailAndPassword(auth, form.email, form.password);
-        const user = userCredential.user;
-        await setDoc(doc(db, 'users', user.uid), {
+        const userCredential = await createUserWithEmailAndPassword(getFirebaseAuth(), form.email, form.password);
+        // Firestore is only needed here, on signup: keep it out of the login page bundle
+        const { createProfile } = await import('../lib/profile');
+        const profile = {
           name: form.name,
           email: form.email,
           category: form.category,
@@ -78,18 +71,20 @@ export default function Login() {
           age: form.age,
           gender: form.gender,
           createdAt: new Date().toISOString(),
-        });
+        };
+        await createProfile(userCredential.user.uid, profile);
+        setProfile(profile);
         alert(t.accountCreated);
-        router.push('/dashboard');
+        router.push(next);
       } else {
         if (!form.email || !form.password) {
           alert(t.fillAllFields);
           setLoading(false);
           return;
         }
-        await signInWithEmailAndPassword(auth, form.email, form.password);
+        await signInWithEmailAndPassword(getFirebaseAuth(), form.email, form.password);
         alert(t.loginSuccess);
-        router.push('/dashboard');
+        router.push(next);
       }
     } catch (error: any) {
       alert('Error: ' + error.message);
@@ -0,0 +1,193 @@
+import React, { useState, useEffect, useRef } from 'react';
+import { useRouter } from 'next/router';
+import Link from 'next/link';
+import { useTranslations } from '../lib/i18n';
+import { translationProps } from '../lib/locales';
+import { STATION_LABELS } from '../lib/stations';
+import { enqueuePerformance } from '../lib/writeQueue';
+import { useRequireUser } from '../lib/session';
+import { reportError } from '../lib/telemetry';
+import {
+  RACE_SEGMENTS,
+  RaceSegment,
+  RaceState,
+  CHECKPOINT_INTERVAL,
+  now,
+  elapsed,
+  segmentDurations,
+  isFinished,
+  formatClock,
+  saveRace,
+  loadRace,
+  raceToPerformance,
+  checkpointRace,
+  clearCheckpoint,
+} from '../lib/raceTimer';
+
+export const getStaticProps = translationProps;
+
+export default function Race() {
+  const router = useRouter();
+  const { t, language, toggleLanguage } = useTranslations();
+  const { user } = useRequireUser();
+  const [race, setRace] = useState<RaceState | null>(null);
+  const [clock, setClock] = useState(0);
+  const [saving, setSaving] = useState(false);
+  const lastCheckpoint = useRef(0);
+
+  useEffect(() => {
+    setRace(loadRace());
+  }, []);
+
+  // Redraw the clock every frame while racing; the splits themselves come from now(), not from this loop
+  useEffect(() => {
+    if (!race || isFinished(race)) return;
+    let frame = requestAnimationFrame(function tick() {
+      // Same value within a tenth of a second, so React skips the re-render
+      setClock(Math.floor(elapsed(race) / 100) * 100);
+      frame = requestAnimationFrame(tick);
+    });
+    return () => cancelAnimationFrame(frame);
+  }, [race]);
+
+  const segmentLabel = (segment: RaceSegment) =>
+    segment.kind === 'run' ? `🏃 ${t.run} ${segment.index + 1}` : STATION_LABELS[segment.index];
+
+  const update = (next: RaceState | null) => {
+    setRace(next);
+    saveRace(next);
+  };
+
+  const startRace = () => {
+    lastCheckpoint.current = 0;
+    update({ startedAt: now(), marks: [] });
+  };
+
+  const split = () => {
+    if (!race || isFinished(race)) return;
+    const next = { ...race, marks: [...race.marks, elapsed(race)] };
+    update(next);
+
+    if (user && now() - lastCheckpoint.current >= CHECKPOINT_INTERVAL && !isFinished(next)) {
+      lastCheckpoint.current = now();
+      checkpointRace(user.uid, next).catch((error) => reportError('race.checkpoint', error));
+    }
+  };
+
+  const finishRace = async () => {
+    if (!race || !user) return;
+    setSaving(true);
+    try {
+      // The whole race is a single queued document
+      await enqueuePerformance(raceToPerformance(user.uid, race));
+      clearCheckpoint(user.uid).catch((error) => reportError('race.clearCheckpoint', error));
+      update(null);
+      router.push('/dashboard');
+    } catch (error) {
+      reportError('race.finish', error);
+      alert(t.error);
+    } finally {
+      setSaving(false);
+    }
+  };
+
+  const cancelRace = () => {
+    update(null);
+    if (user) clearCheckpoint(user.uid).catch((error) => reportError('race.clearCheckpoint', error));
+  };
+
+  const durations = race ? segmentDurations(race.marks) : [];
+  const current = race && !isFinished(race) ? RACE_SEGMENTS[race.marks.length] : null;
+  const currentStart = race && race.marks.length > 0 ? race.marks[race.marks.length - 1] : 0;
+
+  return (
+    <div className="min-h-screen bg-gradient-to-br from-slate-950 via-blue-950 to-slate-900">
+      {/* Header */}
+      <header className="bg-slate-900/50 backdrop-blur border-b-2 border-cyan-400/30 p-6">
+        <div className="max-w-4xl mx-auto flex justify-between items-center">
+          <h1 className="text-3xl font-black text-cyan-400">⏱️ {t.liveRace}</h1>
+          <div className="flex gap-4">
+            <button
+              onClick={toggleLanguage}
+              className="px-6 py-3 bg-cyan-400 hover:bg-cyan-300 text-slate-950 font-black rounded-lg"
+            >
+              {language === 'fr' ? '🇬🇧 EN' : '🇫🇷 FR'}
+            </button>
+            <Link href="/dashboard" className="px-6 py-3 bg-blue-600 hover:bg-blue-700 text-white font-black rounded-lg">
+              ← {t.dashboard}
+            </Link>
+          </div>
+        </div>
+      </header>
+
+      <main className="max-w-4xl mx-auto p-6">
+        <div className="bg-gradient-to-br from-slate-800 to-slate-900 rounded-xl shadow-xl p-8 border border-cyan-400/30 text-center mb-8">
+          <p className="text-gray-400 font-black mb-2" style={{ fontFamily: 'Arial Black, sans-serif' }}>
+            {current ? segmentLabel(current) : race ? `🏁 ${t.totalTime}` : t.startRace}
+          </p>
+          <p className="text-7xl font-black text-cyan-400 tabular-nums">
+            {formatClock(race && isFinished(race) ? race.marks[race.marks.length - 1] : clock)}
+          </p>
+          {current && (
+            <p className="text-2xl font-black text-white mt-2 tabular-nums">{formatClock(clock - currentStart)}</p>
+          )}
+
+          <div className="flex gap-4 justify-center mt-8">
+            {!race && (
+              <button
+                onClick={startRace}
+                className="px-12 py-4 bg-gradient-to-r from-cyan-500 to-blue-500 hover:from-cyan-400 hover:to-blue-400 text-slate-950 font-black text-xl rounded-xl transition transform hover:scale-105"
+                style={{ fontFamily: 'Arial Black, sans-serif' }}
+              >
+                🚀 {t.startRace}
+              </button>
+            )}
+            {current && (
+              <button
+                onClick={split}
+                className="px-12 py-4 bg-gradient-to-r from-cyan-500 to-blue-500 hover:from-cyan-400 hover:to-blue-400 text-slate-950 font-black text-xl rounded-xl transition transform hover:scale-105"
+                style={{ fontFamily: 'Arial Black, sans-serif' }}
+              >
+                ⏭️ {t.nextSplit}
+              </button>
+            )}
+            {race && (
+              <button
+                onClick={finishRace}
+                disabled={saving || race.marks.length === 0}
+                className="px-8 py-4 bg-blue-600 hover:bg-blue-700 text-white font-black text-xl rounded-xl transition disabled:opacity-50"
+                style={{ fontFamily: 'Arial Black, sans-serif' }}
+              >
+                {saving ? `⏳ ${t.loading}` : `🏁 ${t.finishRace}`}
+              </button>
+            )}
+            {race && (
+              <button
+                onClick={cancelRace}
+                className="px-8 py-4 bg-slate-700 hover:bg-slate-600 text-gray-300 font-black text-xl rounded-xl transition"
+                style={{ fontFamily: 'Arial Black, sans-serif' }}
+              >
+                {t.cancel}
+              </button>
+            )}
+          </div>
+        </div>
+
+        {durations.length > 0 && (
+          <div className="bg-gradient-to-br from-slate-800 to-slate-900 rounded-xl shadow-xl p-6 border border-cyan-400/30">
+            <div className="space-y-2">
+              {durations.map((duration, i) => (
+                <div key={i} className="bg-slate-800/50 border border-cyan-400/20 rounded-lg p-3 flex justify-between items-center">
+                  <p className="text-white font-black">{segmentLabel(RACE_SEGMENTS[i])}</p>
+                  <p className="text-cyan-400 font-black tabular-nums">
+                    {formatClock(duration)} <span className="text-gray-400 text-sm">({formatClock(race!.marks[i])})</span>
+                  </p>
+                </div>
+              ))}
+            </div>
+          </div>
+        )}
+      </main>
+    </div>
+  );
+}
@@ -1,9 +1,11 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState } from 'react';
 import { useRouter } from 'next/router';
-import { auth, db } from '../lib/firebase';
-import { onAuthStateChanged } from 'firebase/auth';
-import { collection, addDoc, serverTimestamp } from 'firebase/firestore';
-import { translations, Language } from '../lib/translations';
+import { useTranslations } from '../lib/i18n';
+import { translationProps } from '../lib/locales';
+import { enqueuePerformance } from '../lib/writeQueue';
+import { buildPerformance, toEpochDay } from '../lib/performances';
+import { useRequireUser } from '../lib/session';
+import { reportError } from '../lib/telemetry';
 
 interface FormData {
   date: string;
@@ -18,11 +20,12 @@ interface FormData {
   wallBalls: number;
 }
 
+export const getStaticProps = translationProps;
+
 export default function TrackPerformance() {
   const router = useRouter();
-  const [user, setUser] = useState<any>(null);
-  const [language, setLanguage] = useState<Language>('fr');
-  const [loading, setLoading] = useState(true);
+  const { user, ready } = useRequireUser();
+  const { t, language, toggleLanguage } = useTranslations();
   const [submitting, setSubmitting] = useState(false);
   const [form, setForm] = useState<FormData>({
     date: new Date().toISOString().split('T')[0],
@@ -37,7 +40,6 @@ export default function TrackPerformance() {
     wallBalls: 0,
   });
 
-  const t = translations[language];
   const stations = [
     { key: 'skierg', label: t.skierg },
     { key: 'sledPush', label: t.sledPush },
@@ -49,30 +51,6 @@ export default function TrackPerformance() {
     { key: 'wallBalls', label: t.wallBalls },
   ];
 
-  useEffect(() => {
-    const savedLang = localStorage.getItem('hyrox-language') as Language;
-    if (savedLang) setLanguage(savedLang);
-  }, []);
-
-  const toggleLanguage = () => {
-    const newLang = language === 'fr' ? 'en' : 'fr';
-    setLanguage(newLang);
-    localStorage.setItem('hyrox-language', newLang);
-  };
-
-  useEffect(() => {
-    const unsubscribe = onAuthStateChanged(auth, (currentUser) => {
-      if (currentUser) {
-        setUser(currentUser);
-      } else {
-        router.push('/login');
-      }
-      setLoading(false);
-    });
-
-    return () => unsubscribe();
-  }, [router]);
-
   const handleChange = (e: React.ChangeEvent<HTMLInputElement>) => {
     const { name, value } = e.target;
     setForm({
@@ -94,34 +72,33 @@ export default function TrackPerformance() {
         return;
       }
 
-      await addDoc(collection(db, 'performances'), {
-        userId: user.uid,
-        date: form.date,
-        totalTime: form.totalTime,
-        stations: {
-          skierg: form.skierg,
-          sledPush: form.sledPush,
-          sledPull: form.sledPull,
-          burpeeBroadJumps: form.burpeeBroadJumps,
-          rowErg: form.rowErg,
-          farmerCarry: form.farmerCarry,
-          sandbagLunges: form.sandbagLunges,
-          wallBalls: form.wallBalls,
-        },
-        createdAt: serverTimestamp(),
-      });
+      const stations = {
+        skierg: form.skierg,
+        sledPush: form.sledPush,
+        sledPull: form.sledPull,
+        burpeeBroadJumps: form.burpeeBroadJumps,
+        rowErg: form.rowErg,
+        farmerCarry: form.farmerCarry,
+        sandbagLunges: form.sandbagLunges,
+        wallBalls: form.wallBalls,
+      };
+
+      // Queued locally and flushed in the background, so this returns without a network round-trip
+      await enqueuePerformance(
+        buildPerformance(user.uid, toEpochDay(form.date), form.totalTime, stations)
+      );
 
       alert(t.success);
       router.push('/dashboard');
     } catch (error) {
-      console.error('Error:', error);
+      reportError('track.submit', error);
       alert(t.error);
     } finally {
       setSubmitting(false);
     }
   };
 
-  if (loading) return <div className="p-8">{t.loading}</div>;
+  if (!ready || !user) return <div className="p-8">{t.loading}</div>;
 
   return (
     <div className="min-h-screen bg-gradient-to-br from-blue-50 to-orange-50">
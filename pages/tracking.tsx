@@ -1,27 +1,20 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState } from 'react';
 import { useRouter } from 'next/router';
-import { auth, db } from '../lib/firebase';
-import { collection, addDoc } from 'firebase/firestore';
-import { onAuthStateChanged } from 'firebase/auth';
 import Link from 'next/link';
-import { translations } from '../lib/translations';
-import type { Language } from '../lib/translations';
+import { useTranslations } from '../lib/i18n';
+import { translationProps } from '../lib/locales';
+import { enqueuePerformance } from '../lib/writeQueue';
+import { buildPerformance, todayEpochDay } from '../lib/performances';
+import { STATION_KEYS, STATION_LABELS as stations } from '../lib/stations';
+import { useRequireUser } from '../lib/session';
+import { reportError } from '../lib/telemetry';
 
-const stations = [
-  '1️⃣ SkiErg',
-  '2️⃣ Sled Push',
-  '3️⃣ Sled Pull',
-  '4️⃣ Burpee Broad Jumps',
-  '5️⃣ Rowing',
-  '6️⃣ Farmers Carry',
-  '7️⃣ Fentes marchées',
-  '8️⃣ Wall Balls',
-];
+export const getStaticProps = translationProps;
 
 export default function Tracking() {
   const router = useRouter();
-  const [language, setLanguage] = useState<Language>('fr');
-  const [user, setUser] = useState<any>(null);
+  const { t, language, toggleLanguage } = useTranslations();
+  const { user } = useRequireUser();
   const [loading, setLoading] = useState(false);
   const [form, setForm] = useState({
     station: stations[0],
@@ -30,30 +23,6 @@ export default function Tracking() {
     notes: '',
   });
 
-  const t = translations[language];
-
-  useEffect(() => {
-    const savedLang = localStorage.getItem('hyrox-language') as Language;
-    if (savedLang) setLanguage(savedLang);
-  }, []);
-
-  const toggleLanguage = () => {
-    const newLang = language === 'fr' ? 'en' : 'fr';
-    setLanguage(newLang);
-    localStorage.setItem('hyrox-language', newLang);
-  };
-
-  useEffect(() => {
-    const unsubscribe = onAuthStateChanged(auth, (currentUser) => {
-      if (!currentUser) {
-        router.push('/login');
-      } else {
-        setUser(currentUser);
-      }
-    });
-    return () => unsubscribe();
-  }, [router]);
-
   const handleChange = (e: React.ChangeEvent<HTMLInputElement | HTMLSelectElement | HTMLTextAreaElement>) => {
     const { name, value } = e.target;
     setForm(prev => ({
@@ -67,6 +36,8 @@ export default function Tracking() {
     setLoading(true);
 
     try {
+      if (!user) return;
+
       if (!form.minutes || !form.station) {
         alert('Veuillez remplir tous les champs');
         setLoading(false);
@@ -75,16 +46,13 @@ export default function Tracking() {
 
       const totalSeconds = parseInt(form.minutes) * 60 + (parseInt(form.seconds) || 0);
 
-      await addDoc(collection(db, 'performances'), {
-        userId: user?.uid,
-        station: form.station,
-        minutes: parseInt(form.minutes),
-        seconds: parseInt(form.seconds) || 0,
-        totalSeconds: totalSeconds,
-        notes: form.notes,
-        date: new Date().toLocaleDateString('fr-FR'),
-        timestamp: new Date(),
-      });
+      // The labels above follow race order, so the index gives the station key
+      const stationKey = STATION_KEYS[stations.indexOf(form.station)];
+
+      // Queued locally and flushed in the background, so this returns without a network round-trip
+      await enqueuePerformance(
+        buildPerformance(user.uid, todayEpochDay(), 0, { [stationKey]: totalSeconds }, form.notes)
+      );
 
       alert('✅ Performance enregistrée !');
       setForm({
@@ -96,7 +64,7 @@ export default function Tracking() {
       
       router.push('/dashboard');
     } catch (error) {
-      console.error('Error:', error);
+      reportError('tracking.submit', error);
       alert('❌ Erreur lors de l\'enregistrement');
     } finally {
       setLoading(false);
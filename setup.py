@@ -1,5 +1,12 @@
-import os
+import argparse
+import hashlib
+import html
 import json
+import os
+import re
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 # Créer les fichiers
 files = {
@@ -23,7 +30,7 @@ export default app;""",
 
     "lib/translations.ts": """export const translations = {
   fr: {
-    appTitle: 'HyroxTracker',
+    appTitle: {{app_title}},
     tagline: 'Suivez Vos Performances Hyrox',
     login: 'Connexion',
     signup: 'Inscription',
@@ -73,7 +80,7 @@ export default app;""",
     language: 'Langue',
   },
   en: {
-    appTitle: 'HyroxTracker',
+    appTitle: {{app_title}},
     tagline: 'Track Your Hyrox Performance',
     login: 'Login',
     signup: 'Sign Up',
@@ -163,7 +170,7 @@ export default function Login() {
     password: '',
     confirmPassword: '',
     name: '',
-    category: 'Open',
+    category: {{default_category}},
     targetTime: 60,
     age: 30,
     gender: 'male',
@@ -252,7 +259,7 @@ export default function Login() {
   };
 
   return (
-    <div className="min-h-screen bg-gradient-to-br from-blue-600 to-orange-500 flex items-center justify-center">
+    <div className="min-h-screen bg-gradient-to-br {{gradient}} flex items-center justify-center">
       <div className="w-full max-w-md">
         <div className="text-right mb-4">
           <button
@@ -293,9 +300,7 @@ export default function Login() {
                       onChange={handleChange}
                       className="w-full px-4 py-2 border border-gray-300 rounded-lg focus:outline-none focus:ring-2 focus:ring-blue-500"
                     >
-                      <option>Open</option>
-                      <option>Doubles</option>
-                      <option>Elite</option>
+{{category_options}}
                     </select>
                   </div>
                   <div>
@@ -378,7 +383,7 @@ export default function Login() {
             <button
               type="submit"
               disabled={loading}
-              className="w-full bg-gradient-to-r from-blue-600 to-orange-500 text-white font-bold py-3 rounded-lg hover:shadow-lg transition disabled:opacity-50"
+              className="w-full bg-gradient-to-r {{gradient}} text-white font-bold py-3 rounded-lg hover:shadow-lg transition disabled:opacity-50"
             >
               {loading ? t.loading : isSignup ? t.signup : t.login}
             </button>
@@ -398,13 +403,20 @@ export default function Login() {
   );
 }""",
 
-    "pages/dashboard.tsx": """import React, { useState, useEffect } from 'react';
+    "pages/dashboard.tsx": """import React, { useState, useEffect, useRef, useMemo } from 'react';
+import dynamic from 'next/dynamic';
 import { useRouter } from 'next/router';
 import { auth, db } from '../lib/firebase';
 import { onAuthStateChanged, signOut } from 'firebase/auth';
 import { collection, query, where, getDocs, doc, getDoc } from 'firebase/firestore';
 import { translations, Language } from '../lib/translations';
-import { LineChart, Line, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer } from 'recharts';
+import { ZOOM_LEVELS, Zoom, cachedSeries } from '../lib/downsample';
+
+// recharts lives in its own chunk, fetched once the chart card scrolls into view
+const ProgressChart = dynamic(() => import('../components/ProgressChart'), {
+  ssr: false,
+  loading: () => <div className="h-[300px]" />,
+});
 
 interface Performance {
   id: string;
@@ -430,6 +442,9 @@ export default function Dashboard() {
   const [performances, setPerformances] = useState<Performance[]>([]);
   const [profile, setProfile] = useState<UserProfile | null>(null);
   const [loading, setLoading] = useState(true);
+  const [chartVisible, setChartVisible] = useState(false);
+  const [zoom, setZoom] = useState<Zoom>('all');
+  const chartRef = useRef<HTMLDivElement>(null);
   const t = translations[language];
 
   useEffect(() => {
@@ -437,6 +452,16 @@ export default function Dashboard() {
     if (savedLang) setLanguage(savedLang);
   }, []);
 
+  useEffect(() => {
+    const card = chartRef.current;
+    if (!card || chartVisible) return;
+    const observer = new IntersectionObserver((entries) => {
+      if (entries[0].isIntersecting) setChartVisible(true);
+    }, { rootMargin: '200px' });
+    observer.observe(card);
+    return () => observer.disconnect();
+  }, [loading, chartVisible]);
+
   const toggleLanguage = () => {
     const newLang = language === 'fr' ? 'en' : 'fr';
     setLanguage(newLang);
@@ -478,15 +503,20 @@ export default function Dashboard() {
     router.push('/login');
   };
 
-  if (loading) return <div className="p-8">{t.loading}</div>;
-
-  const chartData = performances
-    .slice()
-    .reverse()
-    .map(p => ({
-      date: new Date(p.date).toLocaleDateString(),
-      totalTime: p.totalTime,
+  // At most MAX_POINTS points whatever the history length; series are cached per user
+  const chartData = useMemo(() => {
+    if (!user) return [];
+    const points = performances
+      .filter(p => p.totalTime > 0)
+      .map(p => ({ time: new Date(p.date).getTime(), value: p.totalTime }))
+      .sort((a, b) => a.time - b.time);
+    return cachedSeries(user.uid, points, zoom).map(p => ({
+      date: new Date(p.time).toLocaleDateString(),
+      totalTime: Math.round(p.value),
     }));
+  }, [performances, user, zoom]);
+
+  if (loading) return <div className="p-8">{t.loading}</div>;
 
   return (
     <div className="min-h-screen bg-gradient-to-br from-blue-50 to-orange-50">
@@ -538,19 +568,23 @@ export default function Dashboard() {
           </div>
         )}
 
-        <div className="bg-white rounded-lg shadow-md p-6 mb-8">
-          <h2 className="text-2xl font-bold mb-4 text-blue-700">{t.trackPerformance}</h2>
+        <div ref={chartRef} className="bg-white rounded-lg shadow-md p-6 mb-8">
+          <div className="flex justify-between items-center mb-4">
+            <h2 className="text-2xl font-bold text-blue-700">{t.trackPerformance}</h2>
+            <div className="flex gap-2">
+              {ZOOM_LEVELS.map(level => (
+                <button
+                  key={level}
+                  onClick={() => setZoom(level)}
+                  className={`px-3 py-1 rounded-lg ${zoom === level ? 'bg-blue-600 text-white' : 'bg-blue-100 text-blue-700 hover:bg-blue-200'}`}
+                >
+                  {level.toUpperCase()}
+                </button>
+              ))}
+            </div>
+          </div>
           {chartData.length > 0 ? (
-            <ResponsiveContainer width="100%" height={300}>
-              <LineChart data={chartData}>
-                <CartesianGrid strokeDasharray="3 3" />
-                <XAxis dataKey="date" />
-                <YAxis />
-                <Tooltip />
-                <Legend />
-                <Line type="monotone" dataKey="totalTime" stroke="#0ea5e9" name="Total Time (sec)" />
-              </LineChart>
-            </ResponsiveContainer>
+            chartVisible ? <ProgressChart data={chartData} /> : <div className="h-[300px]" />
           ) : (
             <p className="text-gray-500">{t.logNewPerformance}</p>
           )}
@@ -574,7 +608,7 @@ export default function Dashboard() {
 
         <button
           onClick={() => router.push('/track')}
-          className="w-full bg-gradient-to-r from-blue-600 to-orange-500 text-white font-bold py-4 rounded-lg hover:shadow-lg transition"
+          className="w-full bg-gradient-to-r {{gradient}} text-white font-bold py-4 rounded-lg hover:shadow-lg transition"
         >
           {t.logNewPerformance}
         </button>
@@ -583,6 +617,167 @@ export default function Dashboard() {
   );
 }""",
 
+    "lib/downsample.ts": """// Progress chart series: aggregated per week or month depending on the zoom level,
+// then reduced with LTTB (Largest-Triangle-Three-Buckets) to at most MAX_POINTS points.
+
+export interface SeriesPoint {
+  time: number;
+  value: number;
+}
+
+export type Zoom = '3m' | '1y' | 'all';
+
+export const ZOOM_LEVELS: Zoom[] = ['3m', '1y', 'all'];
+
+// Points drawn by the chart, whatever the history length
+export const MAX_POINTS = 120;
+
+const DAY = 24 * 60 * 60 * 1000;
+const ZOOM_SPAN: Record<Zoom, number> = { '3m': 90 * DAY, '1y': 365 * DAY, all: Infinity };
+
+// Keeps the first and last points and, in each bucket, the point forming the largest
+// triangle with the previous pick and the next bucket's average: peaks survive.
+export function lttb(points: SeriesPoint[], threshold: number): SeriesPoint[] {
+  if (threshold >= points.length || threshold < 3) return points;
+  const sampled = [points[0]];
+  const bucketSize = (points.length - 2) / (threshold - 2);
+  let previous = 0;
+
+  for (let i = 0; i < threshold - 2; i++) {
+    const start = Math.floor(i * bucketSize) + 1;
+    const end = Math.floor((i + 1) * bucketSize) + 1;
+
+    const nextEnd = Math.min(Math.floor((i + 2) * bucketSize) + 1, points.length);
+    let avgTime = 0;
+    let avgValue = 0;
+    for (let j = end; j < nextEnd; j++) {
+      avgTime += points[j].time;
+      avgValue += points[j].value;
+    }
+    const count = Math.max(nextEnd - end, 1);
+    avgTime /= count;
+    avgValue /= count;
+
+    let maxArea = -1;
+    let picked = start;
+    for (let j = start; j < end; j++) {
+      const area = Math.abs(
+        (points[previous].time - avgTime) * (points[j].value - points[previous].value) -
+          (points[previous].time - points[j].time) * (avgValue - points[previous].value)
+      );
+      if (area > maxArea) {
+        maxArea = area;
+        picked = j;
+      }
+    }
+    sampled.push(points[picked]);
+    previous = picked;
+  }
+
+  sampled.push(points[points.length - 1]);
+  return sampled;
+}
+
+function bucketStart(time: number, unit: 'week' | 'month') {
+  const date = new Date(time);
+  if (unit === 'month') return Date.UTC(date.getUTCFullYear(), date.getUTCMonth(), 1);
+  // Weeks start on Monday
+  const weekday = (date.getUTCDay() + 6) % 7;
+  return Date.UTC(date.getUTCFullYear(), date.getUTCMonth(), date.getUTCDate() - weekday);
+}
+
+// Mean value per week or month; `points` must be sorted by time
+export function aggregate(points: SeriesPoint[], unit: 'week' | 'month'): SeriesPoint[] {
+  const result: SeriesPoint[] = [];
+  let bucket = NaN;
+  let sum = 0;
+  let count = 0;
+  for (const point of points) {
+    const start = bucketStart(point.time, unit);
+    if (start !== bucket && count > 0) {
+      result.push({ time: bucket, value: sum / count });
+      sum = 0;
+      count = 0;
+    }
+    bucket = start;
+    sum += point.value;
+    count += 1;
+  }
+  if (count > 0) result.push({ time: bucket, value: sum / count });
+  return result;
+}
+
+export function buildSeries(points: SeriesPoint[], zoom: Zoom): SeriesPoint[] {
+  const last = points.length > 0 ? points[points.length - 1].time : 0;
+  const visible = points.filter(point => point.time >= last - ZOOM_SPAN[zoom]);
+  const grouped = zoom === '3m' ? visible : aggregate(visible, zoom === '1y' ? 'week' : 'month');
+  return lttb(grouped, MAX_POINTS);
+}
+
+// Every zoom level is computed at once and cached per user, in memory and in localStorage,
+// until the data changes
+type CachedSeries = { signature: string; series: Record<Zoom, SeriesPoint[]> };
+
+const memoryCache = new Map<string, CachedSeries>();
+
+function signature(points: SeriesPoint[]) {
+  let sum = 0;
+  for (const point of points) sum += point.value;
+  const last = points.length > 0 ? points[points.length - 1].time : 0;
+  return `${points.length}:${last}:${sum}`;
+}
+
+function readCache(userId: string): CachedSeries | null {
+  const cached = memoryCache.get(userId);
+  if (cached) return cached;
+  try {
+    const stored = localStorage.getItem(`hyrox-chart-${userId}`);
+    return stored ? (JSON.parse(stored) as CachedSeries) : null;
+  } catch {
+    return null;
+  }
+}
+
+export function cachedSeries(userId: string, points: SeriesPoint[], zoom: Zoom): SeriesPoint[] {
+  const key = signature(points);
+  let cached = readCache(userId);
+  if (!cached || cached.signature !== key) {
+    const series = {} as Record<Zoom, SeriesPoint[]>;
+    for (const level of ZOOM_LEVELS) series[level] = buildSeries(points, level);
+    cached = { signature: key, series };
+    try {
+      localStorage.setItem(`hyrox-chart-${userId}`, JSON.stringify(cached));
+    } catch {
+      // Storage full or disabled: the memory cache is enough
+    }
+  }
+  memoryCache.set(userId, cached);
+  return cached.series[zoom];
+}""",
+
+    "components/ProgressChart.tsx": """import { LineChart, Line, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer } from 'recharts';
+
+export interface ChartPoint {
+  date: string;
+  totalTime: number;
+}
+
+// Loaded with next/dynamic from pages/dashboard.tsx: keep recharts imports in this file only
+export default function ProgressChart({ data }: { data: ChartPoint[] }) {
+  return (
+    <ResponsiveContainer width="100%" height={300}>
+      <LineChart data={data}>
+        <CartesianGrid strokeDasharray="3 3" />
+        <XAxis dataKey="date" />
+        <YAxis />
+        <Tooltip />
+        <Legend />
+        <Line type="monotone" dataKey="totalTime" stroke="#0ea5e9" name="Total Time (sec)" />
+      </LineChart>
+    </ResponsiveContainer>
+  );
+}""",
+
     "pages/track.tsx": """import React, { useState, useEffect } from 'react';
 import { useRouter } from 'next/router';
 import { auth, db } from '../lib/firebase';
@@ -624,14 +819,7 @@ export default function TrackPerformance() {
 
   const t = translations[language];
   const stations = [
-    { key: 'skierg', label: t.skierg },
-    { key: 'sledPush', label: t.sledPush },
-    { key: 'sledPull', label: t.sledPull },
-    { key: 'burpeeBroadJumps', label: t.burpeeBroadJumps },
-    { key: 'rowErg', label: t.rowErg },
-    { key: 'farmerCarry', label: t.farmerCarry },
-    { key: 'sandbagLunges', label: t.sandbagLunges },
-    { key: 'wallBalls', label: t.wallBalls },
+{{station_list}}
   ];
 
   useEffect(() => {
@@ -782,7 +970,7 @@ export default function TrackPerformance() {
               <button
                 type="submit"
                 disabled={submitting}
-                className="flex-1 bg-gradient-to-r from-blue-600 to-orange-500 text-white font-bold py-3 rounded-lg hover:shadow-lg transition disabled:opacity-50"
+                className="flex-1 bg-gradient-to-r {{gradient}} text-white font-bold py-3 rounded-lg hover:shadow-lg transition disabled:opacity-50"
               >
                 {submitting ? t.loading : t.save}
               </button>
@@ -855,6 +1043,10 @@ code {
   images: {
     unoptimized: true,
   },
+  experimental: {
+    // Only the recharts / framer-motion modules actually imported end up in the chunks
+    optimizePackageImports: ['recharts', 'framer-motion'],
+  },
 }""",
 
     "tailwind.config.js": """module.exports = {
@@ -876,12 +1068,296 @@ code {
 }""",
 }
 
+# Paramètres des templates (valeurs d'origine de HyroxTracker)
+STATIONS = [
+    'skierg',
+    'sledPush',
+    'sledPull',
+    'burpeeBroadJumps',
+    'rowErg',
+    'farmerCarry',
+    'sandbagLunges',
+    'wallBalls',
+]
+
+DEFAULT_TENANT = {
+    'app_title': 'HyroxTracker',
+    'gradient': 'from-blue-600 to-orange-500',
+    'categories': ['Open', 'Doubles', 'Elite'],
+    'stations': STATIONS,
+}
+
+PLACEHOLDER = re.compile(r'\{\{\s*([A-Za-z_]\w*)\s*\}\}')
+
+MANIFEST = '.hyrox-manifest.json'
+
+# mkstemp crée les fichiers en 0600: on rétablit les droits habituels
+UMASK = os.umask(0)
+os.umask(UMASK)
+
+
+def js_string(value):
+    return "'" + value.replace('\\', '\\\\').replace("'", "\\'") + "'"
+
+
+def compile_template(text):
+    """Découpe un template en morceaux: octets fixes ou nom de variable."""
+    parts = []
+    position = 0
+    for match in PLACEHOLDER.finditer(text):
+        parts.append(text[position:match.start()].encode('utf-8'))
+        parts.append(match.group(1))
+        position = match.end()
+    parts.append(text[position:].encode('utf-8'))
+    return tuple(part for part in parts if part)
+
+
+def render(template, context):
+    # Générateur: le fichier n'est jamais assemblé en mémoire
+    for part in template:
+        yield context[part] if isinstance(part, str) else part
+
+
+def is_string_list(value):
+    return isinstance(value, list) and all(isinstance(item, str) and item for item in value)
+
+
+def tenant_context(tenant):
+    config = {**DEFAULT_TENANT, **tenant}
+    label = config.get('name', 'défaut')
+    if 'name' in config:
+        # Le nom devient un dossier sous --root: un seul segment, sans remonter
+        name = config['name']
+        if not isinstance(name, str) or name in ('.', '..') or os.path.basename(name) != name or '\\' in name:
+            raise ValueError(f'nom de gym invalide: {name!r} (un nom de dossier simple est attendu)')
+    for field in ('app_title', 'gradient'):
+        if not isinstance(config[field], str):
+            raise ValueError(f'{field} doit être une chaîne pour {label}')
+    for field in ('categories', 'stations'):
+        if not is_string_list(config[field]):
+            raise ValueError(f'{field} doit être une liste de chaînes non vides pour {label}')
+    unknown = [station for station in config['stations'] if station not in STATIONS]
+    if unknown:
+        raise ValueError(f"stations inconnues pour {label}: {', '.join(unknown)}")
+    if not config['categories']:
+        raise ValueError(f'aucune catégorie pour {label}')
+
+    context = {
+        'app_title': js_string(config['app_title']),
+        'gradient': config['gradient'],
+        'default_category': js_string(config['categories'][0]),
+        'category_options': '\n'.join(
+            f'                      <option>{html.escape(category)}</option>' for category in config['categories']
+        ),
+        'station_list': '\n'.join(
+            f"    {{ key: '{station}', label: t.{station} }}," for station in config['stations']
+        ),
+    }
+    return {name: value.encode('utf-8') for name, value in context.items()}
+
+
+def load_tenants(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith(('.yaml', '.yml')):
+            try:
+                import yaml
+            except ImportError:
+                raise SystemExit('PyYAML est requis pour lire ' + path)
+            tenants = yaml.safe_load(f)
+        else:
+            tenants = json.load(f)
+    if not isinstance(tenants, list) or not all(isinstance(t, dict) and t.get('name') for t in tenants):
+        raise SystemExit(f'{path}: une liste de gyms avec un champ "name" est attendue')
+    return tenants
+
+
+def content_hash(chunks):
+    digest = hashlib.sha256()
+    for chunk in chunks:
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def manifest_entry(digest, st):
+    return {'sha256': digest, 'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+
+
+def load_manifest(root):
+    try:
+        with open(os.path.join(root, MANIFEST), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def atomic_write(path, chunks):
+    # Écrire dans un fichier temporaire du même dossier puis renommer
+    directory = os.path.dirname(path) or '.'
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+        os.chmod(tmp, 0o666 & ~UMASK)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _write_timed(target, chunks):
+    start = time.perf_counter()
+    atomic_write(target, chunks)
+    return time.perf_counter() - start
+
+
+def _fsync_path(path, flags=os.O_RDONLY):
+    fd = os.open(path, flags)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def emit(root, entries, pool, fsync=False, fsync_batch=64):
+    """Écrit les (chemin, morceaux) en parallèle et renvoie {chemin: secondes}."""
+    targets = [(filepath, os.path.join(root, filepath), chunks) for filepath, chunks in entries]
+
+    # Chaque dossier n'est créé qu'une seule fois
+    directories = sorted({os.path.dirname(target) or '.' for _, target, _ in targets})
+    for directory in directories:
+        os.makedirs(directory, exist_ok=True)
+
+    futures = [(filepath, pool.submit(_write_timed, target, chunks)) for filepath, target, chunks in targets]
+    timings = {filepath: future.result() for filepath, future in futures}
+
+    if fsync:
+        # fsync groupés après toutes les écritures, puis un seul fsync par dossier
+        paths = [target for _, target, _ in targets]
+        for i in range(0, len(paths), fsync_batch):
+            list(pool.map(_fsync_path, paths[i:i + fsync_batch]))
+        list(pool.map(_fsync_path, directories))
+
+    return timings
+
+
+def print_timings(timings, limit=10):
+    total = sum(timings.values())
+    print(f'\n⏱️ {len(timings)} fichier(s) écrit(s) en {total * 1000:.1f} ms (cumulé)')
+    for filepath, seconds in sorted(timings.items(), key=lambda item: item[1], reverse=True)[:limit]:
+        print(f'   {seconds * 1000:8.2f} ms  {filepath}')
+
+
+def write_incremental(root, templates, context, pool, fsync=False):
+    previous_manifest = load_manifest(root)
+    manifest = dict(previous_manifest)
+    summary = {'created': [], 'updated': [], 'unchanged': []}
+    pending = []
+
+    for filepath, template in templates.items():
+        digest = content_hash(render(template, context))
+        target = os.path.join(root, filepath)
+
+        try:
+            st = os.stat(target)
+        except FileNotFoundError:
+            st = None
+
+        if st is not None:
+            entry = manifest.get(filepath)
+            if entry and entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns:
+                previous = entry['sha256']
+            else:
+                # Absent du manifeste ou modifié à la main: relire le fichier
+                with open(target, 'rb') as f:
+                    previous = content_hash(iter(lambda: f.read(1 << 16), b''))
+            if previous == digest:
+                manifest[filepath] = manifest_entry(digest, st)
+                summary['unchanged'].append(filepath)
+                continue
+            status = 'updated'
+        else:
+            status = 'created'
+
+        pending.append((filepath, digest))
+        summary[status].append(filepath)
+
+    timings = emit(root, [(filepath, render(templates[filepath], context)) for filepath, _ in pending], pool, fsync)
+    for filepath, digest in pending:
+        manifest[filepath] = manifest_entry(digest, os.stat(os.path.join(root, filepath)))
+
+    if manifest != previous_manifest:
+        atomic_write(
+            os.path.join(root, MANIFEST),
+            [json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8')],
+        )
+
+    for filepath in summary['created']:
+        print(f'✅ Créé: {filepath}')
+    for filepath in summary['updated']:
+        print(f'🔄 Mis à jour: {filepath}')
+    print(
+        f"\n📋 {len(summary['created'])} créé(s), "
+        f"{len(summary['updated'])} mis à jour, "
+        f"{len(summary['unchanged'])} inchangé(s)"
+    )
+    return timings
+
+
+def write_all(root, templates, context, pool, fsync=False):
+    entries = [(filepath, render(template, context)) for filepath, template in templates.items()]
+    timings = emit(root, entries, pool, fsync)
+    for filepath in timings:
+        print(f'✅ Créé: {filepath}')
+    return timings
+
+
+parser = argparse.ArgumentParser(description='Génère les fichiers HyroxTracker')
+parser.add_argument('--root', default='.', help='dossier de sortie')
+parser.add_argument(
+    '--incremental',
+    action='store_true',
+    help="ne réécrire que les fichiers dont le contenu a changé (manifeste {})".format(MANIFEST),
+)
+parser.add_argument(
+    '--tenants',
+    help='liste JSON/YAML de gyms; chaque gym est générée dans --root/<name> (ou son champ "root")',
+)
+parser.add_argument('--jobs', type=int, default=min(32, (os.cpu_count() or 1) * 4), help="nombre de threads d'écriture")
+parser.add_argument('--fsync', action='store_true', help='forcer la persistance sur disque (fsync groupés)')
+parser.add_argument('--timings', action='store_true', help='afficher le temps d\'écriture par fichier')
+args = parser.parse_args()
+
+# Compiler chaque template une seule fois pour toutes les gyms
+templates = {filepath: compile_template(content) for filepath, content in files.items()}
+
+if args.tenants:
+    tenants = load_tenants(args.tenants)
+else:
+    tenants = [{}]
+
+# Valider toutes les gyms avant d'écrire quoi que ce soit
+targets = []
+for tenant in tenants:
+    try:
+        context = tenant_context(tenant)
+    except ValueError as error:
+        raise SystemExit(f'❌ {error}')
+    root = tenant.get('root') or (os.path.join(args.root, tenant['name']) if args.tenants else args.root)
+    targets.append((root, tenant, context))
+
 # Créer tous les fichiers
-for filepath, content in files.items():
-    os.makedirs(os.path.dirname(filepath), exist_ok=True)
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(content)
-    print(f'✅ Créé: {filepath}')
+write = write_incremental if args.incremental else write_all
+timings = {}
+with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+    for root, tenant, context in targets:
+        if args.tenants:
+            print(f"\n🏋️ {tenant['name']} → {root}")
+        for filepath, seconds in write(root, templates, context, pool, args.fsync).items():
+            timings[os.path.join(root, filepath)] = seconds
+
+if args.timings:
+    print_timings(timings)
 
 print('\\n🎉 TOUS LES FICHIERS CRÉÉS AVEC SUCCÈS!')
 print('\\nMaintenant, dans le terminal, tapez: npm run dev')
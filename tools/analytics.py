@@ -0,0 +1,249 @@
+"""Statistiques de coaching sur un export de la collection `performances`.
+
+L'export est chargé en colonnes NumPy (une colonne par station, une pour
+`totalTime`, une pour la date, un code entier par athlète), trié par athlète
+puis par date. Toutes les agrégations par athlète passent ensuite par
+`ufunc.reduceat` sur ces blocs contigus: aucune boucle Python par document.
+
+Formats acceptés: JSON lines (`{"id", "data"}` comme tools/localstore.py, ou
+un document à plat par ligne), tableau JSON ou objet JSON `{id: document}`.
+Les anciens schémas sont convertis avec tools/migrate_performances.py.
+Une archive .hyxa (tools/archive.py) est lue en mmap, sans décompresser les
+colonnes inutiles à l'analyse.
+
+    pip install numpy
+    python tools/analytics.py data/performances.jsonl --users data/users.jsonl --output report.json
+"""
+import argparse
+import json
+import warnings
+from array import array
+
+import numpy as np
+
+from localstore import STATIONS, iter_documents
+from migrate_performances import SCHEMA_VERSION, to_canonical
+
+DAY_MS = 86_400_000
+PERCENTILES = (10, 25, 50, 75, 90)
+# Nombre minimum de séances pour calculer une tendance
+MIN_TREND_POINTS = 3
+
+
+class PerformanceColumns:
+    """Performances en colonnes, triées par (athlète, date)."""
+
+    def __init__(self, user_ids, users, dates, totals, stations):
+        order = np.lexsort((dates, users))
+        self.user_ids = user_ids
+        self.users = users[order]
+        self.dates = dates[order]
+        self.totals = totals[order]
+        self.stations = stations[order]
+        # Début du bloc de chaque athlète; les athlètes sans performance n'apparaissent pas
+        if len(self.users) == 0:
+            self.starts = np.empty(0, dtype=np.intp)
+        else:
+            self.starts = np.flatnonzero(np.r_[True, self.users[1:] != self.users[:-1]])
+        self.athletes = self.users[self.starts]
+
+    def __len__(self):
+        return len(self.users)
+
+
+def load_columns(path):
+    if path.endswith('.hyxa'):
+        return load_archive_columns(path)
+    user_codes = {}
+    users = array('q')
+    dates = array('q')
+    totals = array('d')
+    stations = array('d')
+    for _, data in iter_documents(path):
+        document = data if data.get('v') == SCHEMA_VERSION else to_canonical(data)
+        if not document.get('userId') or document.get('date') is None:
+            continue
+        users.append(user_codes.setdefault(document['userId'], len(user_codes)))
+        dates.append(int(document['date']))
+        totals.append(document.get('totalTime') or np.nan)
+        splits = document.get('splits') or {}
+        stations.extend(float(splits.get(str(i + 1)) or np.nan) for i in range(len(STATIONS)))
+
+    return PerformanceColumns(
+        list(user_codes),
+        np.frombuffer(users, dtype=np.int64),
+        np.frombuffer(dates, dtype=np.int64),
+        np.frombuffer(totals, dtype=np.float64),
+        np.frombuffer(stations, dtype=np.float64).reshape(-1, len(STATIONS)),
+    )
+
+
+def load_archive_columns(path):
+    from archive import ArchiveReader
+
+    user_codes = {}
+    users, dates, totals, stations = [], [], [], []
+    with ArchiveReader(path) as reader:
+        for _, values in reader.columns(['users', 'user', 'date', 'totalTime', *STATIONS]):
+            # Dictionnaire du bloc -> codes globaux; '' = document sans userId exploitable
+            codes = np.array([user_codes.setdefault(uid, len(user_codes)) if uid else -1 for uid in values['users']], dtype=np.int64)
+            block_users = codes[np.frombuffer(values['user'], dtype=np.uint32)]
+            keep = block_users >= 0
+            users.append(block_users[keep])
+            dates.append(np.cumsum(np.frombuffer(values['date'], dtype=np.int64))[keep])
+            totals.append(np.frombuffer(values['totalTime'], dtype=np.int32)[keep])
+            stations.append(np.column_stack([np.frombuffer(values[key], dtype=np.int32) for key in STATIONS])[keep])
+
+    # 0 = temps absent dans l'archive
+    totals = np.concatenate(totals).astype(np.float64) if totals else np.empty(0)
+    stations = np.concatenate(stations).astype(np.float64) if stations else np.empty((0, len(STATIONS)))
+    totals[totals == 0] = np.nan
+    stations[stations == 0] = np.nan
+    return PerformanceColumns(
+        list(user_codes),
+        np.concatenate(users) if users else np.empty(0, dtype=np.int64),
+        np.concatenate(dates) if dates else np.empty(0, dtype=np.int64),
+        totals,
+        stations,
+    )
+
+
+def load_categories(path, user_ids):
+    categories = {doc_id: data.get('category') or 'Unknown' for doc_id, data in iter_documents(path)}
+    return np.array([categories.get(uid, 'Unknown') for uid in user_ids])
+
+
+# -- agrégats par athlète -------------------------------------------------------
+
+def grouped_sum(columns, values):
+    return np.add.reduceat(values, columns.starts, axis=0)
+
+
+def athlete_bests(columns):
+    """Meilleur temps par athlète et par station (fmin ignore les NaN)."""
+    return np.fmin.reduceat(columns.stations, columns.starts, axis=0)
+
+
+def athlete_means(columns):
+    present = ~np.isnan(columns.stations)
+    counts = grouped_sum(columns, present.astype(np.int64))
+    sums = grouped_sum(columns, np.where(present, columns.stations, 0.0))
+    return np.divide(sums, counts, out=np.full(sums.shape, np.nan), where=counts > 0), counts
+
+
+def field_percentiles(bests):
+    """Part (en %) des athlètes plus lents, station par station."""
+    percentiles = np.full(bests.shape, np.nan)
+    for j in range(bests.shape[1]):
+        column = bests[:, j]
+        valid = ~np.isnan(column)
+        field = np.sort(column[valid])
+        if len(field) == 0:
+            continue
+        slower = len(field) - np.searchsorted(field, column[valid], side='right')
+        percentiles[valid, j] = 100.0 * slower / len(field)
+    return percentiles
+
+
+def trends(columns):
+    """Pente des moindres carrés par athlète et station, en secondes par 30 jours.
+
+    Négatif = l'athlète progresse.
+    """
+    y = columns.stations
+    present = ~np.isnan(y)
+    x = ((columns.dates - columns.dates.min()) / DAY_MS)[:, None] * present
+    y = np.where(present, y, 0.0)
+
+    n = grouped_sum(columns, present.astype(np.float64))
+    sx = grouped_sum(columns, x)
+    sy = grouped_sum(columns, y)
+    sxy = grouped_sum(columns, x * y)
+    sxx = grouped_sum(columns, x * x)
+
+    denominator = n * sxx - sx ** 2
+    valid = (n >= MIN_TREND_POINTS) & (denominator > 0)
+    slope = np.divide(n * sxy - sx * sy, denominator, out=np.full(n.shape, np.nan), where=valid)
+    return slope * 30
+
+
+def weaknesses(percentiles):
+    """Stations triées de la plus faible à la plus forte, par athlète."""
+    return np.argsort(np.where(np.isnan(percentiles), np.inf, percentiles), axis=1, kind='stable')
+
+
+def category_percentiles(bests, categories):
+    result = {}
+    with warnings.catch_warnings():
+        # Catégories où personne n'a fait une station: NaN attendu
+        warnings.simplefilter('ignore', RuntimeWarning)
+        for category in np.unique(categories):
+            values = np.nanpercentile(bests[categories == category], PERCENTILES, axis=0)
+            result[str(category)] = {
+                station: {f'p{p}': _number(values[i, j]) for i, p in enumerate(PERCENTILES)}
+                for j, station in enumerate(STATIONS)
+            }
+    return result
+
+
+def _number(value):
+    return None if np.isnan(value) else round(float(value), 1)
+
+
+def report(columns, categories=None):
+    if len(columns) == 0:
+        return {'documents': 0, 'athletes': {}}
+
+    bests = athlete_bests(columns)
+    means, counts = athlete_means(columns)
+    percentiles = field_percentiles(bests)
+    slopes = trends(columns)
+    ranking = weaknesses(percentiles)
+    sessions = np.diff(np.r_[columns.starts, len(columns)])
+    best_totals = np.fmin.reduceat(columns.totals, columns.starts)
+
+    athletes = {}
+    for row, code in enumerate(columns.athletes):
+        athletes[columns.user_ids[code]] = {
+            'sessions': int(sessions[row]),
+            'bestTotalTime': _number(best_totals[row]),
+            'stations': {
+                station: {
+                    'best': _number(bests[row, j]),
+                    'mean': _number(means[row, j]),
+                    'count': int(counts[row, j]),
+                    'percentile': _number(percentiles[row, j]),
+                    'trendPer30Days': _number(slopes[row, j]),
+                }
+                for j, station in enumerate(STATIONS)
+            },
+            'weakestFirst': [STATIONS[j] for j in ranking[row] if not np.isnan(percentiles[row, j])],
+        }
+
+    result = {'documents': len(columns), 'athletes': athletes}
+    if categories is not None:
+        result['categories'] = category_percentiles(bests, categories[columns.athletes])
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Analyse vectorisée des performances exportées')
+    parser.add_argument('performances', help='export de la collection performances (.jsonl, .json ou .hyxa)')
+    parser.add_argument('--users', help='export de la collection users, pour les percentiles par catégorie')
+    parser.add_argument('--output', help='fichier JSON de sortie (stdout par défaut)')
+    args = parser.parse_args(argv)
+
+    columns = load_columns(args.performances)
+    categories = load_categories(args.users, columns.user_ids) if args.users else None
+    result = report(columns, categories)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"✅ {result['documents']} performance(s), {len(result['athletes'])} athlète(s) → {args.output}")
+    else:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,392 @@
+"""Archive compacte de la collection `performances` (fichiers .hyxa).
+
+Un dump JSON répète `sandbagLunges`, `burpeeBroadJumps`... dans chaque
+document. L'archive stocke les performances v2 en colonnes, par blocs de
+`--block` documents triés par (athlète, date):
+
+    'HYXA' | bloc 1 | bloc 2 | ... | schéma JSON | longueur du schéma (u32) | 'HYXA'
+
+- chaque colonne d'un bloc est compressée séparément (zlib): une lecture
+  ne décompresse que les colonnes demandées;
+- `date` est codée en écarts avec le document précédent, `createdAt` en
+  écart avec `date`: des petits entiers qui se compressent bien;
+- les athlètes sont un dictionnaire par bloc, les temps des entiers 32 bits
+  avec 0 pour « absent », une colonne par station;
+- le schéma (en fin de fichier, comme Parquet, pour écrire en flux) donne
+  les clés de station de lib/stations.ts, les colonnes et la position de
+  chaque bloc. Une station est relue par son nom, pas par sa position.
+
+Ce que les colonnes ne représentent pas (champ inconnu, temps non entier)
+part dans la colonne `extra` en JSON: export puis import ne perd rien.
+
+La lecture passe par mmap: seuls les blocs et colonnes lus sont chargés.
+
+    python tools/archive.py export backup.hyxa --local data/
+    python tools/archive.py export backup.hyxa --from performances.jsonl
+    python tools/archive.py info backup.hyxa
+    python tools/archive.py dump backup.hyxa > performances.jsonl
+    python tools/archive.py import backup.hyxa --project my-project
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+import zlib
+from array import array
+
+from backends import MAX_BATCH, FirestoreBackend, LocalBackend
+from localstore import STATIONS, iter_documents
+from migrate_performances import SCHEMA_VERSION, to_canonical
+
+MAGIC = b'HYXA'
+FORMAT_VERSION = 1
+BLOCK_ROWS = 65536
+
+# Nom de colonne -> type: code array ('q' 64 bits, 'i'/'I' 32 bits, 'B') ou 'str' (nombre u32, longueurs u32, UTF-8)
+COLUMNS = {
+    'id': 'str',
+    'users': 'str',  # dictionnaire du bloc
+    'user': 'I',
+    'date': 'q',  # écart avec la ligne précédente
+    'createdAt': 'q',  # écart avec date
+    'totalTime': 'i',
+    **{station: 'i' for station in STATIONS},
+    'runCount': 'B',
+    'runs': 'i',  # valeurs de toutes les lignes, à la suite
+    'notes': 'str',
+    'extra': 'str',
+}
+KNOWN_FIELDS = {'v', 'userId', 'date', 'createdAt', 'totalTime', 'splits', 'runs', 'notes'}
+
+
+# -- codage des colonnes ---------------------------------------------------------
+
+def _pack(typecode, values):
+    data = array(typecode, values)
+    if sys.byteorder == 'big':
+        data.byteswap()
+    return data.tobytes()
+
+
+def _unpack(typecode, raw):
+    data = array(typecode)
+    data.frombytes(raw)
+    if sys.byteorder == 'big':
+        data.byteswap()
+    return data
+
+
+def encode_column(kind, values):
+    if kind == 'str':
+        encoded = [value.encode('utf-8') for value in values]
+        raw = _pack('I', [len(encoded)] + [len(value) for value in encoded]) + b''.join(encoded)
+    else:
+        raw = _pack(kind, values)
+    return zlib.compress(raw, 6)
+
+
+def decode_column(kind, compressed):
+    raw = zlib.decompress(compressed)
+    if kind != 'str':
+        return _unpack(kind, raw)
+    size = array('I').itemsize
+    (count,) = _unpack('I', raw[:size])
+    lengths = _unpack('I', raw[size:(count + 1) * size])
+    values = []
+    position = (count + 1) * size
+    for length in lengths:
+        values.append(raw[position:position + length].decode('utf-8'))
+        position += length
+    return values
+
+
+def _is_time(value):
+    return isinstance(value, int) and not isinstance(value, bool) and 0 <= value < 2 ** 31
+
+
+def encode_block(records):
+    """[(id, document v2)] -> {colonne: octets compressés}."""
+    records = sorted(records, key=lambda record: (record[1].get('userId') or '', record[1].get('date') or 0))
+    users = {}
+    columns = {name: [] for name in COLUMNS}
+    previous_date = 0
+    for doc_id, document in records:
+        extra = {key: value for key, value in document.items() if key not in KNOWN_FIELDS}
+        if document.get('v') != SCHEMA_VERSION:
+            extra['v'] = document.get('v')
+        for key in ('userId', 'date', 'createdAt'):
+            if not isinstance(document.get(key), str if key == 'userId' else int):
+                extra[key] = document.get(key)
+        day = document['date'] if 'date' not in extra else 0
+        created_at = document['createdAt'] if 'createdAt' not in extra else day
+
+        splits = document.get('splits') or {}
+        if set(splits) - {str(i + 1) for i in range(len(STATIONS))} or not all(map(_is_time, splits.values())):
+            extra['splits'] = splits
+            splits = {}
+        runs = document.get('runs')
+        if runs is not None and (len(runs) > 255 or not all(map(_is_time, runs))):
+            extra['runs'] = runs
+            runs = None
+        total = document.get('totalTime') or 0
+        if not _is_time(total):
+            extra['totalTime'] = total
+            total = 0
+        notes = document.get('notes')
+        if notes is not None and not isinstance(notes, str):
+            extra['notes'] = notes
+            notes = None
+
+        columns['id'].append(doc_id)
+        columns['user'].append(users.setdefault(document.get('userId') if 'userId' not in extra else '', len(users)))
+        columns['date'].append(day - previous_date)
+        previous_date = day
+        columns['createdAt'].append(created_at - day)
+        columns['totalTime'].append(total)
+        for index, station in enumerate(STATIONS):
+            columns[station].append(splits.get(str(index + 1)) or 0)
+        # 0 = pas de `runs`, n + 1 = n temps de course
+        columns['runCount'].append(0 if runs is None else len(runs) + 1)
+        columns['runs'].extend(runs or [])
+        # '' = pas de notes, sinon le texte précédé d'un espace
+        columns['notes'].append('' if notes is None else ' ' + notes)
+        columns['extra'].append(json.dumps(extra, ensure_ascii=False, separators=(',', ':')) if extra else '')
+    columns['users'] = list(users)
+    return {name: encode_column(COLUMNS[name], values) for name, values in columns.items()}
+
+
+# -- écriture ---------------------------------------------------------------------
+
+class ArchiveWriter:
+    """Écrit une archive en flux: un bloc est encodé dès qu'il est plein."""
+
+    def __init__(self, path, block_rows=BLOCK_ROWS):
+        self.path = path
+        self.block_rows = block_rows
+        self.file = open(path + '.tmp', 'wb')
+        self.file.write(MAGIC)
+        self.offset = len(MAGIC)
+        self.pending = []
+        self.blocks = []
+        self.rows = 0
+
+    def add(self, doc_id, document):
+        self.pending.append((doc_id, document))
+        if len(self.pending) >= self.block_rows:
+            self._flush_block()
+
+    def _flush_block(self):
+        if not self.pending:
+            return
+        block = {'rows': len(self.pending), 'columns': {}}
+        for name, data in encode_block(self.pending).items():
+            self.file.write(data)
+            block['columns'][name] = [self.offset, len(data)]
+            self.offset += len(data)
+        self.blocks.append(block)
+        self.rows += len(self.pending)
+        self.pending = []
+
+    def close(self):
+        self._flush_block()
+        schema = json.dumps({
+            'format': 'hyrox-performances',
+            'version': FORMAT_VERSION,
+            'schemaVersion': SCHEMA_VERSION,
+            'codec': 'zlib',
+            'stations': STATIONS,
+            'columns': COLUMNS,
+            'rows': self.rows,
+            'blocks': self.blocks,
+        }, separators=(',', ':')).encode('utf-8')
+        self.file.write(schema + struct.pack('<I', len(schema)) + MAGIC)
+        self.file.close()
+        os.replace(self.path + '.tmp', self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.file.close()
+            os.remove(self.path + '.tmp')
+
+
+# -- lecture ----------------------------------------------------------------------
+
+class ArchiveReader:
+    """Archive ouverte en mmap; `columns()` ne décompresse que ce qui est demandé."""
+
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.map[:4] != MAGIC or self.map[-4:] != MAGIC:
+            self.close()
+            raise SystemExit(f"❌ {path} n'est pas une archive .hyxa")
+        (length,) = struct.unpack('<I', self.map[-8:-4])
+        self.schema = json.loads(self.map[-8 - length:-8])
+        if self.schema['version'] > FORMAT_VERSION:
+            self.close()
+            raise SystemExit(f"❌ Archive en version {self.schema['version']}, ce script lit jusqu'à {FORMAT_VERSION}")
+        self.rows = self.schema['rows']
+
+    def columns(self, names=None):
+        """Un dict {colonne: valeurs} par bloc. Les stations sont relues par nom."""
+        names = names or list(self.schema['columns'])
+        for block in self.schema['blocks']:
+            values = {}
+            for name in names:
+                if name not in block['columns']:
+                    # Station absente de cette archive: toujours 0
+                    values[name] = array('i', bytes(block['rows'] * array('i').itemsize))
+                    continue
+                offset, length = block['columns'][name]
+                view = memoryview(self.map)[offset:offset + length]
+                try:
+                    values[name] = decode_column(self.schema['columns'][name], view)
+                finally:
+                    view.release()
+            yield block['rows'], values
+
+    def documents(self):
+        """(id, document v2) dans l'ordre de l'archive."""
+        for rows, columns in self.columns():
+            users = columns['users']
+            day = 0
+            run_position = 0
+            for row in range(rows):
+                day += columns['date'][row]
+                document = {
+                    'v': SCHEMA_VERSION,
+                    'userId': users[columns['user'][row]],
+                    'date': day,
+                    'totalTime': columns['totalTime'][row],
+                    'splits': {
+                        str(STATIONS.index(station) + 1): columns[station][row]
+                        for station in self.schema['stations']
+                        if station in STATIONS and columns[station][row]
+                    },
+                    'createdAt': day + columns['createdAt'][row],
+                }
+                count = columns['runCount'][row]
+                if count:
+                    document['runs'] = list(columns['runs'][run_position:run_position + count - 1])
+                    run_position += count - 1
+                if columns['notes'][row]:
+                    document['notes'] = columns['notes'][row][1:]
+                if columns['extra'][row]:
+                    document.update(json.loads(columns['extra'][row]))
+                yield columns['id'][row], document
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# -- commandes --------------------------------------------------------------------
+
+def source_documents(args):
+    """(id, document v2) depuis un dump (--from) ou la collection (--local, --project)."""
+    if args.source:
+        for doc_id, data in iter_documents(args.source):
+            yield doc_id, to_canonical(data) or data
+        return
+    backend = LocalBackend(args.local) if args.local else FirestoreBackend(args.project)
+    try:
+        for chunk in backend.chunks(None, MAX_BATCH):
+            for doc_id, data in chunk:
+                yield doc_id, to_canonical(data) or data
+    finally:
+        backend.close()
+
+
+def export(args):
+    start = time.perf_counter()
+    with ArchiveWriter(args.output, args.block) as writer:
+        for doc_id, document in source_documents(args):
+            writer.add(doc_id, document)
+    size = os.path.getsize(args.output)
+    print(f'✅ {writer.rows} performance(s) → {args.output} ({size / 1024:.1f} ko) en {time.perf_counter() - start:.1f} s')
+
+
+def info(args):
+    with ArchiveReader(args.archive) as reader:
+        sizes = {}
+        for block in reader.schema['blocks']:
+            for name, (_, length) in block['columns'].items():
+                sizes[name] = sizes.get(name, 0) + length
+        print(f"{reader.rows} performance(s), {len(reader.schema['blocks'])} bloc(s), stations: {', '.join(reader.schema['stations'])}")
+        for name, size in sorted(sizes.items(), key=lambda item: -item[1]):
+            print(f'   {name:<18} {size / 1024:10.1f} ko')
+
+
+def dump(args):
+    with ArchiveReader(args.archive) as reader:
+        for doc_id, document in reader.documents():
+            sys.stdout.write(json.dumps({'id': doc_id, 'data': document}, ensure_ascii=False) + '\n')
+
+
+def import_archive(args):
+    # Mêmes écritures que l'import de résultats: dédoublonnage par id, userStats mis à jour
+    from import_results import import_results
+
+    if not 1 <= args.batch <= MAX_BATCH:
+        raise SystemExit(f'❌ --batch doit être entre 1 et {MAX_BATCH}')
+    backend = LocalBackend(args.local) if args.local else FirestoreBackend(args.project)
+    try:
+        with ArchiveReader(args.archive) as reader:
+            counts = import_results(backend, reader.documents(), args.batch, args.jobs, args.dry_run)
+    finally:
+        backend.close()
+    print(
+        f"✅ {counts['imported']} importée(s), {counts['duplicates']} déjà présente(s), "
+        f"{counts['users']} athlète(s) en {counts['seconds']} s"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Archive colonnaire compressée des performances')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    export_parser = commands.add_parser('export', help='collection ou dump JSON -> archive')
+    export_parser.add_argument('output')
+    export_parser.add_argument('--from', dest='source', help='dump .jsonl/.json au lieu de la collection')
+    export_parser.add_argument('--local', help='dossier tools/localstore.py')
+    export_parser.add_argument('--project', default=os.environ.get('NEXT_PUBLIC_FIREBASE_PROJECT_ID'))
+    export_parser.add_argument('--block', type=int, default=BLOCK_ROWS, help='documents par bloc')
+    export_parser.set_defaults(func=export)
+
+    info_parser = commands.add_parser('info', help='schéma et taille de chaque colonne')
+    info_parser.add_argument('archive')
+    info_parser.set_defaults(func=info)
+
+    dump_parser = commands.add_parser('dump', help='archive -> JSON lines sur stdout')
+    dump_parser.add_argument('archive')
+    dump_parser.set_defaults(func=dump)
+
+    import_parser = commands.add_parser('import', help='archive -> collection')
+    import_parser.add_argument('archive')
+    import_parser.add_argument('--local', help='dossier tools/localstore.py')
+    import_parser.add_argument('--project', default=os.environ.get('NEXT_PUBLIC_FIREBASE_PROJECT_ID'))
+    import_parser.add_argument('--batch', type=int, default=MAX_BATCH, help=f'documents par commit (max {MAX_BATCH})')
+    import_parser.add_argument('--jobs', type=int, default=4, help='paquets écrits en parallèle')
+    import_parser.add_argument('--dry-run', action='store_true', help='lire sans rien écrire')
+    import_parser.set_defaults(func=import_archive)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
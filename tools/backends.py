@@ -0,0 +1,504 @@
+"""Accès à la collection `performances`: Firestore ou dossier tools/localstore.py.
+
+Utilisé par les scripts de migration et d'import. Le client Firestore respecte
+FIRESTORE_EMULATOR_HOST, ce qui permet de viser l'émulateur local.
+"""
+import bisect
+import threading
+import time
+
+from localstore import STATIONS, LocalStore
+
+# Taille maximale d'un commit Firestore
+MAX_BATCH = 500
+
+# Même valeur que ROLLING_WINDOW dans lib/userStats.ts
+ROLLING_WINDOW = 10
+
+# Comme AGE_GROUPS dans lib/rankings.ts
+AGE_GROUPS = [16, 25, 30, 35, 40, 45, 50, 55, 60, 65, 70]
+
+# Même valeur que FIT_ALPHA dans lib/prediction.ts
+FIT_ALPHA = 0.3
+
+
+def empty_stats():
+    return {
+        'totalSessions': 0,
+        'totalTimeSum': 0,
+        'totalTimeCount': 0,
+        'personalBests': {},
+        'recentTotalTimes': [],
+        'latestTotalTime': None,
+        'bestTotalTime': None,
+        'fit': {},
+    }
+
+
+def apply_performance(stats, performance):
+    """Équivalent Python de applyPerformance() dans lib/userStats.ts."""
+    personal_bests = dict(stats['personalBests'])
+    for index, key in enumerate(STATIONS):
+        time = (performance.get('splits') or {}).get(str(index + 1))
+        if time and time > 0 and (not personal_bests.get(key) or time < personal_bests[key]):
+            personal_bests[key] = time
+    total = performance.get('totalTime') or 0
+    has_total = total > 0
+    return {
+        'totalSessions': stats['totalSessions'] + 1,
+        'totalTimeSum': stats['totalTimeSum'] + (total if has_total else 0),
+        'totalTimeCount': stats['totalTimeCount'] + (1 if has_total else 0),
+        'personalBests': personal_bests,
+        'recentTotalTimes': ([total] + stats['recentTotalTimes'])[:ROLLING_WINDOW] if has_total else stats['recentTotalTimes'],
+        'latestTotalTime': total if has_total else stats['latestTotalTime'],
+        'bestTotalTime': min_time(stats['bestTotalTime'], total if has_total else None),
+        'fit': update_fit(stats['fit'], performance),
+    }
+
+
+def combine_stats(current, added):
+    """Agrégat existant suivi des performances de `added`, dans cet ordre."""
+    current = {**empty_stats(), **(current or {})}
+    personal_bests = dict(current['personalBests'])
+    for key, time in added['personalBests'].items():
+        if not personal_bests.get(key) or time < personal_bests[key]:
+            personal_bests[key] = time
+    return {
+        'totalSessions': current['totalSessions'] + added['totalSessions'],
+        'totalTimeSum': current['totalTimeSum'] + added['totalTimeSum'],
+        'totalTimeCount': current['totalTimeCount'] + added['totalTimeCount'],
+        'personalBests': personal_bests,
+        'recentTotalTimes': (added['recentTotalTimes'] + current['recentTotalTimes'])[:ROLLING_WINDOW],
+        'latestTotalTime': added['latestTotalTime'] if added['latestTotalTime'] is not None else current['latestTotalTime'],
+        'bestTotalTime': min_time(current['bestTotalTime'], added['bestTotalTime']),
+        'fit': combine_fits(current['fit'], added['fit']),
+    }
+
+
+def fold_added(performances):
+    """Agrégat de `performances` dans l'ordre donné, à combiner avec combine_stats()."""
+    stats = empty_stats()
+    for performance in performances:
+        stats = apply_performance(stats, performance)
+    return stats
+
+
+def fold_history(performances):
+    """userStats d'un historique complet, dans l'ordre où les séances ont eu lieu."""
+    return fold_added(sorted(performances, key=lambda p: (p.get('date') or 0, p.get('createdAt') or 0)))
+
+
+def now_ms():
+    return int(time.time() * 1000)
+
+
+def min_time(a, b):
+    return b if a is None else a if b is None else min(a, b)
+
+
+# -- prédiction (voir lib/prediction.ts) ------------------------------------------
+
+def _observe(fit, segment, seconds):
+    current = fit.get(segment) or {'sum': 0, 'n': 0}
+    return {**fit, segment: {'sum': (1 - FIT_ALPHA) * current['sum'] + FIT_ALPHA * seconds, 'n': current['n'] + 1}}
+
+
+def update_fit(fit, performance):
+    """Équivalent de updateFit(): moyennes exponentielles par segment."""
+    splits = performance.get('splits') or {}
+    station_times = []
+    for index, key in enumerate(STATIONS):
+        time = splits.get(str(index + 1))
+        if time and time > 0:
+            fit = _observe(fit, key, time)
+            station_times.append(time)
+    runs = [time for time in performance.get('runs') or [] if time > 0]
+    if runs:
+        fit = _observe(fit, 'run', sum(runs) / len(runs))
+    total = performance.get('totalTime') or 0
+    if total > 0:
+        fit = _observe(fit, 'total', total)
+        if len(station_times) == len(STATIONS) and len(runs) == 8:
+            roxzone = total - sum(station_times) - sum(runs)
+            if roxzone > 0:
+                fit = _observe(fit, 'roxzone', roxzone)
+    return fit
+
+
+def combine_fits(base, added):
+    """Équivalent de combineFits(): `added` replié après `base`, sans rien recalculer."""
+    result = dict(base)
+    for segment, state in added.items():
+        previous = base.get(segment) or {'sum': 0, 'n': 0}
+        result[segment] = {
+            'sum': (1 - FIT_ALPHA) ** state['n'] * previous['sum'] + state['sum'],
+            'n': previous['n'] + state['n'],
+        }
+    return result
+
+
+# -- classements (voir lib/rankings.ts) -------------------------------------------
+
+def age_group(age):
+    index = max(bisect.bisect_right(AGE_GROUPS, age) - 1, 0)
+    if index == len(AGE_GROUPS) - 1:
+        return f'{AGE_GROUPS[index]}+'
+    return f'{AGE_GROUPS[index]}-{AGE_GROUPS[index + 1] - 1}'
+
+
+def ranking_scopes(profile):
+    category = str(profile.get('category') or 'Open').replace('/', '-')
+    gender = profile.get('gender') or 'male'
+    return [
+        category,
+        f'{category}_{gender}',
+        f"{category}_{gender}_{age_group(int(profile.get('age') or 0))}",
+    ]
+
+
+def ranking_entry(profile, best):
+    """rankingEntries/{uid} d'un athlète, None s'il n'est pas classé."""
+    if not profile or best is None:
+        return None
+    return {'name': profile.get('name', ''), 'time': best, 'scopes': ranking_scopes(profile)}
+
+
+def ranking_delta(old, new):
+    """Variation des histogrammes rankings/{scope} quand l'entrée passe de `old` à `new`."""
+    delta = {}
+    for entry, sign in ((old, -1), (new, 1)):
+        if not entry:
+            continue
+        for scope in entry['scopes']:
+            change = delta.setdefault(scope, {'counts': {}, 'sum': 0, 'count': 0})
+            key = str(entry['time'])
+            change['counts'][key] = change['counts'].get(key, 0) + sign
+            change['sum'] += sign * entry['time']
+            change['count'] += sign
+    for change in delta.values():
+        change['counts'] = {key: value for key, value in change['counts'].items() if value}
+    return {scope: change for scope, change in delta.items() if change['counts'] or change['sum'] or change['count']}
+
+
+def ranking_histograms(entries):
+    """Histogrammes complets à partir de toutes les entrées {uid: entrée}."""
+    histograms = {}
+    for entry in entries.values():
+        for scope, change in ranking_delta(None, entry).items():
+            histogram = histograms.setdefault(scope, {'counts': {}, 'sum': 0, 'count': 0})
+            for key, value in change['counts'].items():
+                histogram['counts'][key] = histogram['counts'].get(key, 0) + value
+            histogram['sum'] += change['sum']
+            histogram['count'] += change['count']
+    return histograms
+
+
+class LocalBackend:
+    def __init__(self, path):
+        self.store = LocalStore(path)
+        # LocalStore n'est pas thread-safe
+        self.lock = threading.Lock()
+
+    def chunks(self, after, size):
+        ids = sorted(doc_id for doc_id in self.store.docs['performances'] if after is None or doc_id > after)
+        for i in range(0, len(ids), size):
+            yield [(doc_id, self.store.get('performances', doc_id)) for doc_id in ids[i:i + size]]
+
+    def existing(self, ids):
+        with self.lock:
+            return {doc_id for doc_id in ids if doc_id in self.store.docs['performances']}
+
+    def write(self, updates):
+        with self.lock:
+            for doc_id, data in updates:
+                self.store.set('performances', doc_id, data)
+            self.store.flush()
+
+    def users_by_email(self):
+        return {data['email'].lower(): uid for uid, data in self.store.docs['users'].items() if data.get('email')}
+
+    def user_ids(self):
+        with self.lock:
+            return {data.get('userId') for data in self.store.docs['performances'].values() if data.get('userId')}
+
+    def rebuild_stats(self, user_id):
+        with self.lock:
+            stats = fold_history(self.store.user_performances(user_id, descending=False))
+            self.store.set('userStats', user_id, {**stats, 'updatedAt': now_ms()})
+            return stats
+
+    def performance_keys(self, user_id):
+        with self.lock:
+            return {
+                (data.get('date'), data['totalTime'])
+                for data in self.store.user_performances(user_id)
+                if (data.get('totalTime') or 0) > 0
+            }
+
+    def write_with_stats(self, updates):
+        """Écrit les performances absentes et les replie dans userStats en même temps."""
+        with self.lock:
+            fresh = [(doc_id, data) for doc_id, data in updates if doc_id not in self.store.docs['performances']]
+            by_user = {}
+            for doc_id, data in fresh:
+                self.store.set('performances', doc_id, data)
+                by_user.setdefault(data['userId'], []).append(data)
+            for user_id, performances in by_user.items():
+                self._add_stats(user_id, fold_added(performances))
+            self.store.flush()
+            return fresh
+
+    def add_stats(self, user_id, added):
+        with self.lock:
+            self._add_stats(user_id, added)
+
+    def _add_stats(self, user_id, added):
+        combined = combine_stats(self.store.get('userStats', user_id), added)
+        self.store.set('userStats', user_id, {**combined, 'updatedAt': now_ms()})
+
+    # -- classements (tools/rankings.py) --------------------------------------------
+
+    def ranking_sources(self):
+        with self.lock:
+            return [
+                (user_id, self.store.get('users', user_id), stats.get('bestTotalTime'), stats.get('updatedAt'))
+                for user_id, stats in self.store.docs['userStats'].items()
+            ]
+
+    def changed_stats(self, since):
+        with self.lock:
+            changed = [
+                (user_id, stats.get('bestTotalTime'), stats['updatedAt'])
+                for user_id, stats in self.store.docs['userStats'].items()
+                if stats.get('updatedAt') is not None and (since is None or stats['updatedAt'] > since)
+            ]
+        return sorted(changed, key=lambda item: item[2])
+
+    def profiles(self, user_ids):
+        with self.lock:
+            return {user_id: self.store.get('users', user_id) for user_id in user_ids}
+
+    def place_ranking(self, user_id, entry):
+        """Remplace l'entrée de l'athlète et répercute l'écart sur les histogrammes; False si rien ne change."""
+        with self.lock:
+            old = self.store.get('rankingEntries', user_id)
+            if old == entry:
+                return False
+            for scope, change in ranking_delta(old, entry).items():
+                histogram = dict(self.store.get('rankings', scope) or {'counts': {}, 'sum': 0, 'count': 0})
+                counts = dict(histogram['counts'])
+                for key, value in change['counts'].items():
+                    counts[key] = counts.get(key, 0) + value
+                    if not counts[key]:
+                        del counts[key]
+                histogram.update(counts=counts, sum=histogram['sum'] + change['sum'], count=histogram['count'] + change['count'])
+                self.store.set('rankings', scope, histogram)
+            if entry:
+                self.store.set('rankingEntries', user_id, entry)
+            else:
+                self.store.delete('rankingEntries', user_id)
+            self.store.flush()
+            return True
+
+    def replace_rankings(self, histograms, entries):
+        with self.lock:
+            for name, documents in (('rankings', histograms), ('rankingEntries', entries)):
+                for doc_id in set(self.store.docs[name]) - set(documents):
+                    self.store.delete(name, doc_id)
+                for doc_id, data in documents.items():
+                    self.store.set(name, doc_id, data)
+            self.store.flush()
+
+    def ranking_cursor(self):
+        return (self.store.get('rankingState', 'cursor') or {}).get('updatedAt')
+
+    def save_ranking_cursor(self, updated_at):
+        with self.lock:
+            self.store.set('rankingState', 'cursor', {'updatedAt': updated_at})
+            self.store.flush()
+
+    def close(self):
+        self.store.close()
+
+
+class FirestoreBackend:
+    def __init__(self, project):
+        try:
+            from google.cloud import firestore
+        except ImportError:
+            raise SystemExit('❌ google-cloud-firestore est requis (pip install google-cloud-firestore)')
+        self.firestore = firestore
+        self.client = firestore.Client(project=project)
+        self.collection = self.client.collection('performances')
+
+    def chunks(self, after, size):
+        cursor = self.collection.document(after).get() if after else None
+        while True:
+            query = self.collection.order_by('__name__').limit(size)
+            if cursor is not None:
+                query = query.start_after(cursor)
+            snapshots = list(query.stream())
+            if not snapshots:
+                return
+            yield [(snapshot.id, snapshot.to_dict()) for snapshot in snapshots]
+            cursor = snapshots[-1]
+
+    def existing(self, ids):
+        references = [self.collection.document(doc_id) for doc_id in ids]
+        return {snapshot.id for snapshot in self.client.get_all(references) if snapshot.exists}
+
+    def write(self, updates):
+        for i in range(0, len(updates), MAX_BATCH):
+            batch = self.client.batch()
+            for doc_id, data in updates[i:i + MAX_BATCH]:
+                batch.set(self.collection.document(doc_id), data)
+            batch.commit()
+
+    def users_by_email(self):
+        users = self.client.collection('users').select(['email']).stream()
+        return {snapshot.get('email').lower(): snapshot.id for snapshot in users if snapshot.get('email')}
+
+    def user_ids(self):
+        return {snapshot.get('userId') for snapshot in self.collection.select(['userId']).stream() if snapshot.get('userId')}
+
+    def rebuild_stats(self, user_id):
+        reference = self.client.collection('userStats').document(user_id)
+        history = self.collection.where('userId', '==', user_id)
+
+        # Historique relu dans la transaction: une écriture de l'app entre-temps la fait rejouer
+        @self.firestore.transactional
+        def rebuild(transaction):
+            stats = fold_history(snapshot.to_dict() for snapshot in transaction.get(history))
+            transaction.set(reference, {**stats, 'updatedAt': self.firestore.SERVER_TIMESTAMP})
+            return stats
+
+        return rebuild(self.client.transaction())
+
+    def performance_keys(self, user_id):
+        query = self.collection.where('userId', '==', user_id).select(['date', 'totalTime'])
+        return {
+            (snapshot.get('date'), snapshot.get('totalTime'))
+            for snapshot in query.stream()
+            if (snapshot.get('totalTime') or 0) > 0
+        }
+
+    def write_with_stats(self, updates):
+        """Écrit les performances absentes et les replie dans userStats, une transaction par athlète."""
+        by_user = {}
+        for doc_id, data in updates:
+            by_user.setdefault(data['userId'], []).append((doc_id, data))
+        fresh = []
+        for user_id, entries in by_user.items():
+            # Une place pour userStats dans chaque transaction
+            for i in range(0, len(entries), MAX_BATCH - 1):
+                fresh.extend(self._write_user(user_id, entries[i:i + MAX_BATCH - 1]))
+        return fresh
+
+    def _write_user(self, user_id, entries):
+        reference = self.client.collection('userStats').document(user_id)
+        documents = [self.collection.document(doc_id) for doc_id, _ in entries]
+
+        # Comme addPerformancesWithStats(): un id déjà écrit a été compté par la transaction qui l'a créé
+        @self.firestore.transactional
+        def write(transaction):
+            snapshot = reference.get(transaction=transaction)
+            present = {entry.id for entry in self.client.get_all(documents, transaction=transaction) if entry.exists}
+            fresh = [(doc_id, data) for doc_id, data in entries if doc_id not in present]
+            if not fresh:
+                return fresh
+            current = snapshot.to_dict() if snapshot.exists else {}
+            combined = combine_stats(current, fold_added(data for _, data in fresh))
+            for doc_id, data in fresh:
+                transaction.set(self.collection.document(doc_id), data)
+            transaction.set(reference, {**combined, 'updatedAt': self.firestore.SERVER_TIMESTAMP})
+            return fresh
+
+        return write(self.client.transaction())
+
+    def add_stats(self, user_id, added):
+        reference = self.client.collection('userStats').document(user_id)
+
+        # Lecture et écriture dans une transaction, comme addPerformancesWithStats() côté app
+        @self.firestore.transactional
+        def update(transaction):
+            snapshot = reference.get(transaction=transaction)
+            combined = combine_stats(snapshot.to_dict() if snapshot.exists else {}, added)
+            transaction.set(reference, {**combined, 'updatedAt': self.firestore.SERVER_TIMESTAMP})
+
+        update(self.client.transaction())
+
+    # -- classements (tools/rankings.py) --------------------------------------------
+
+    def ranking_sources(self):
+        stats = {
+            snapshot.id: (snapshot.get('bestTotalTime'), snapshot.get('updatedAt'))
+            for snapshot in self.client.collection('userStats').select(['bestTotalTime', 'updatedAt']).stream()
+        }
+        profiles = self.profiles(stats)
+        return [(user_id, profiles.get(user_id), best, updated_at) for user_id, (best, updated_at) in stats.items()]
+
+    def changed_stats(self, since):
+        query = self.client.collection('userStats').select(['bestTotalTime', 'updatedAt']).order_by('updatedAt')
+        if since is not None:
+            query = query.where('updatedAt', '>', since)
+        return [(snapshot.id, snapshot.get('bestTotalTime'), snapshot.get('updatedAt')) for snapshot in query.stream()]
+
+    def profiles(self, user_ids):
+        references = [self.client.collection('users').document(user_id) for user_id in user_ids]
+        profiles = {}
+        for i in range(0, len(references), MAX_BATCH):
+            for snapshot in self.client.get_all(references[i:i + MAX_BATCH]):
+                profiles[snapshot.id] = snapshot.to_dict() if snapshot.exists else None
+        return profiles
+
+    def place_ranking(self, user_id, entry):
+        reference = self.client.collection('rankingEntries').document(user_id)
+        rankings = self.client.collection('rankings')
+        increment = self.firestore.Increment
+
+        @self.firestore.transactional
+        def place(transaction):
+            snapshot = reference.get(transaction=transaction)
+            old = snapshot.to_dict() if snapshot.exists else None
+            if old == entry:
+                return False
+            for scope, change in ranking_delta(old, entry).items():
+                transaction.set(rankings.document(scope), {
+                    'counts': {key: increment(value) for key, value in change['counts'].items()},
+                    'sum': increment(change['sum']),
+                    'count': increment(change['count']),
+                    'updatedAt': self.firestore.SERVER_TIMESTAMP,
+                }, merge=True)
+            if entry:
+                transaction.set(reference, entry)
+            else:
+                transaction.delete(reference)
+            return True
+
+        return place(self.client.transaction())
+
+    def replace_rankings(self, histograms, entries):
+        writes = []
+        for name, documents in (('rankings', histograms), ('rankingEntries', entries)):
+            collection = self.client.collection(name)
+            stale = {reference.id for reference in collection.list_documents()} - set(documents)
+            writes.extend((collection.document(doc_id), None) for doc_id in stale)
+            writes.extend((collection.document(doc_id), data) for doc_id, data in documents.items())
+        for i in range(0, len(writes), MAX_BATCH):
+            batch = self.client.batch()
+            for reference, data in writes[i:i + MAX_BATCH]:
+                if data is None:
+                    batch.delete(reference)
+                else:
+                    batch.set(reference, data)
+            batch.commit()
+
+    def ranking_cursor(self):
+        snapshot = self.client.collection('rankingState').document('cursor').get()
+        return snapshot.get('updatedAt') if snapshot.exists else None
+
+    def save_ranking_cursor(self, updated_at):
+        self.client.collection('rankingState').document('cursor').set({'updatedAt': updated_at})
+
+    def close(self):
+        self.client.close()
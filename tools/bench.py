@@ -0,0 +1,280 @@
+"""Benchmarks du chemin des données, en local: écriture, requête, agrégats, rendu.
+
+1. `seed`: N athlètes et M performances dans un tools/localstore.py temporaire
+   (ou `--path` existant), même distribution que `localstore.py seed`.
+2. `query`: la requête du dashboard pour un échantillon d'athlètes, page de
+   20 via l'index (userId, date) contre lecture complète + tri client,
+   aussi par taille d'historique pour voir ce qui grandit avec elle.
+3. `stats`: agrégat userStats recalculé sur tout l'historique contre une
+   performance repliée sur l'agrégat stocké (addPerformancesWithStats).
+4. `write`: une performance par écriture, comme les anciens addDoc de
+   track.tsx; une station par document, comme tracking.tsx; puis les paquets
+   de la file d'écriture (lib/writeQueue.ts) avec une mise à jour userStats
+   par paquet. Avec `--emulator`, les mêmes écritures visent aussi
+   l'émulateur Firestore.
+5. `render`: tools/bench_render.js (Node, après `npm install`) pour le store
+   client, les agrégats du dashboard et le rendu de l'historique.
+
+Le rapport JSON (`--output`) a une entrée par mesure avec p50/p95 en ms.
+Avec `--baseline`, chaque p50 est comparé au rapport précédent; `--strict`
+sort en erreur au-delà de `--tolerance`.
+
+    python tools/bench.py --users 500 --docs 100000 --output bench.json
+    python tools/bench.py --baseline main-bench.json --strict
+    python tools/bench.py --emulator localhost:8080 --docs 5000 --skip-render
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone
+
+from backends import MAX_BATCH, LocalBackend, apply_performance, empty_stats
+from localstore import STATIONS, LocalStore, fake_performance, new_id, push_to_emulator, seed_store
+
+# Régression signalée au-delà de +20 % sur le p50
+DEFAULT_TOLERANCE = 0.2
+# Tailles d'historique pour les mesures par athlète
+HISTORY_BUCKETS = (10, 100, 1000)
+# Même valeur que MAX_BATCH dans lib/writeQueue.ts (500 moins la mise à jour userStats)
+QUEUE_BATCH = MAX_BATCH - 1
+PAGE_SIZE = 20
+
+
+def summarize(timings):
+    timings = sorted(timings)
+    return {
+        'p50_ms': round(timings[len(timings) // 2] * 1000, 3),
+        'p95_ms': round(timings[int(len(timings) * 0.95)] * 1000, 3),
+        'ops': len(timings),
+    }
+
+
+def timed(action):
+    start = time.perf_counter()
+    action()
+    return time.perf_counter() - start
+
+
+def bucket_of(size):
+    for limit in HISTORY_BUCKETS:
+        if size <= limit:
+            return f'<={limit}'
+    return f'>{HISTORY_BUCKETS[-1]}'
+
+
+def bench_query(store, sample):
+    results = {}
+    by_bucket = {}
+    page, full = [], []
+    for uid in sample:
+        page.append(timed(lambda: store.user_performances(uid, limit=PAGE_SIZE)))
+        elapsed = timed(lambda: store.scan_user_performances(uid))
+        full.append(elapsed)
+        by_bucket.setdefault(bucket_of(len(store._user_bucket(uid))), []).append(elapsed)
+    results['query.page'] = summarize(page)
+    results['query.fetch_sort'] = summarize(full)
+    for bucket, timings in sorted(by_bucket.items()):
+        results[f'query.fetch_sort[{bucket}]'] = summarize(timings)
+    return results
+
+
+def bench_stats(store, sample, rng):
+    full, incremental = [], []
+    for uid in sample:
+        history = store.user_performances(uid, descending=False)
+        full.append(timed(lambda: fold(history)))
+        stored = fold(history)
+        added = fake_performance(uid, rng, date.today())
+        incremental.append(timed(lambda: apply_performance(stored, added)))
+    return {'stats.full': summarize(full), 'stats.incremental': summarize(incremental)}
+
+
+def fold(history):
+    stats = empty_stats()
+    for performance in history:
+        stats = apply_performance(stats, performance)
+    return stats
+
+
+def session(uid, rng):
+    return fake_performance(uid, rng, date.today() - timedelta(days=rng.randrange(365)))
+
+
+def single_station(performance):
+    """Une séance telle que tracking.tsx l'enregistrait: un document par station."""
+    return [
+        {**performance, 'totalTime': 0, 'splits': {station: time}}
+        for station, time in performance['splits'].items()
+    ]
+
+
+def bench_write(path, uids, writes, rng):
+    backend = LocalBackend(path)
+    results = {}
+    try:
+        sessions = [session(rng.choice(uids), rng) for _ in range(writes)]
+
+        # track.tsx avant la file: un addDoc et une mise à jour userStats par performance
+        timings = []
+        for performance in sessions:
+            timings.append(timed(lambda: write_with_stats(backend, [(new_id(), performance)])))
+        results['write.track_single'] = summarize(timings)
+
+        # tracking.tsx: une écriture par station
+        timings = []
+        for performance in sessions[:max(writes // len(STATIONS), 1)]:
+            for document in single_station(performance):
+                timings.append(timed(lambda: write_with_stats(backend, [(new_id(), document)])))
+        results['write.tracking_station'] = summarize(timings)
+
+        # File d'écriture: un commit et une mise à jour userStats par athlète et par paquet
+        by_user = {}
+        for performance in sessions:
+            by_user.setdefault(performance['userId'], []).append((new_id(), performance))
+        timings = []
+        start = time.perf_counter()
+        for entries in by_user.values():
+            for i in range(0, len(entries), QUEUE_BATCH):
+                timings.append(timed(lambda: write_with_stats(backend, entries[i:i + QUEUE_BATCH])))
+        results['write.queue_batch'] = summarize(timings)
+        results['write.queue_batch']['per_performance_ms'] = round((time.perf_counter() - start) * 1000 / writes, 3)
+    finally:
+        backend.close()
+    return results
+
+
+def write_with_stats(backend, entries):
+    backend.write(entries)
+    stats = {}
+    for _, performance in entries:
+        uid = performance['userId']
+        stats[uid] = apply_performance(stats.get(uid) or empty_stats(), performance)
+    for uid, added in stats.items():
+        backend.add_stats(uid, added)
+
+
+def bench_emulator(host, project, uids, writes, rng):
+    documents = [(new_id(), session(rng.choice(uids), rng)) for _ in range(writes)]
+    timings = [timed(lambda: push_to_emulator(host, project, 'performances', [document], batch_size=1)) for document in documents]
+    results = {'emulator.write_single': summarize(timings)}
+    timings = [
+        timed(lambda: push_to_emulator(host, project, 'performances', documents[i:i + QUEUE_BATCH], batch_size=QUEUE_BATCH))
+        for i in range(0, len(documents), QUEUE_BATCH)
+    ]
+    results['emulator.write_batch'] = summarize(timings)
+    return results
+
+
+def bench_render(sizes, repeat):
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench_render.js')
+    if not shutil.which('node'):
+        return {}, 'node introuvable'
+    completed = subprocess.run(
+        ['node', script, '--sizes', ','.join(str(size) for size in sizes), '--repeat', str(repeat)],
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        # Typiquement: dépendances npm absentes (Error: Cannot find module 'typescript')
+        errors = [line for line in completed.stderr.splitlines() if 'Error' in line]
+        return {}, errors[0].strip() if errors else 'échec'
+    return json.loads(completed.stdout)['results'], None
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for name, entry in results.items():
+        previous = baseline.get(name)
+        if not previous or not previous.get('p50_ms'):
+            continue
+        entry['baselineP50Ms'] = previous['p50_ms']
+        if entry['p50_ms'] > previous['p50_ms'] * (1 + tolerance):
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmarks locaux: écriture, requête, agrégats, rendu')
+    parser.add_argument('--users', type=int, default=500)
+    parser.add_argument('--docs', type=int, default=50000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--path', help='dossier tools/localstore.py déjà rempli (sinon dossier temporaire)')
+    parser.add_argument('--queries', type=int, default=200, help='athlètes échantillonnés par mesure')
+    parser.add_argument('--writes', type=int, default=1000, help='performances écrites par chemin')
+    parser.add_argument('--emulator', help="host:port de l'émulateur Firestore, pour les écritures")
+    parser.add_argument('--project', default=os.environ.get('NEXT_PUBLIC_FIREBASE_PROJECT_ID', 'demo-hyrox'))
+    parser.add_argument('--render-sizes', default='100,1000,10000', help='tailles d\'historique pour bench_render.js')
+    parser.add_argument('--repeat', type=int, default=20, help='répétitions par mesure de rendu')
+    parser.add_argument('--skip-render', action='store_true')
+    parser.add_argument('--output', default='bench-results.json')
+    parser.add_argument('--baseline', help='rapport JSON précédent à comparer')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help='hausse du p50 tolérée (0.2 = 20 %%)')
+    parser.add_argument('--strict', action='store_true', help='code de sortie 1 en cas de régression')
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    path = args.path or tempfile.mkdtemp(prefix='hyrox-bench-')
+    results = {}
+    try:
+        with LocalStore(path) as store:
+            if args.path and store.docs['users']:
+                uids = list(store.docs['users'])
+            else:
+                start = time.perf_counter()
+                uids = seed_store(store, args.users, args.docs, rng)
+                results['seed'] = {'seconds': round(time.perf_counter() - start, 3)}
+            sample = [rng.choice(uids) for _ in range(args.queries)]
+            print(f"🌱 {len(store.docs['users'])} athlète(s), {len(store.docs['performances'])} performance(s)")
+            results.update(bench_query(store, sample))
+            results.update(bench_stats(store, sample, rng))
+        results.update(bench_write(path, uids, args.writes, rng))
+        if args.emulator:
+            results.update(bench_emulator(args.emulator, args.project, uids, args.writes, rng))
+    finally:
+        if not args.path:
+            shutil.rmtree(path, ignore_errors=True)
+
+    skipped = None
+    if not args.skip_render:
+        render, skipped = bench_render([int(size) for size in args.render_sizes.split(',')], args.repeat)
+        results.update(render)
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+    regressions = compare(results, baseline, args.tolerance)
+
+    report = {
+        'generatedAt': datetime.now(timezone.utc).isoformat(),
+        'python': sys.version.split()[0],
+        'params': {key: getattr(args, key) for key in ('users', 'docs', 'seed', 'queries', 'writes', 'render_sizes')},
+        'renderSkipped': skipped,
+        'regressions': regressions,
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    for name, entry in results.items():
+        if 'p50_ms' not in entry:
+            continue
+        status = '❌' if name in regressions else '✅'
+        delta = f"  ({entry['p50_ms'] - entry['baselineP50Ms']:+.3f} ms)" if 'baselineP50Ms' in entry else ''
+        print(f"{status} {name:<34} p50 {entry['p50_ms']:>10.3f} ms  p95 {entry['p95_ms']:>10.3f} ms{delta}")
+    if skipped:
+        print(f'⏭️ rendu ignoré: {skipped}')
+    print(f'\n📋 Rapport → {args.output}')
+
+    if args.strict and regressions:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
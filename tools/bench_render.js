@@ -0,0 +1,122 @@
+// Headless half of tools/bench.py: times what the dashboard recomputes from the history on
+// each render, and the server render of the history list, for growing history sizes.
+// The app's TypeScript is transpiled on require with the project's own `typescript`, so this
+// needs `npm install` and nothing else. Prints one JSON object on stdout.
+//
+//   node tools/bench_render.js --sizes 100,1000,10000 --repeat 20
+
+const fs = require('fs');
+const path = require('path');
+const { performance } = require('perf_hooks');
+
+const ts = require('typescript');
+
+const compilerOptions = {
+  module: ts.ModuleKind.CommonJS,
+  target: ts.ScriptTarget.ES2019,
+  jsx: ts.JsxEmit.ReactJSX,
+  esModuleInterop: true,
+};
+
+for (const extension of ['.ts', '.tsx']) {
+  require.extensions[extension] = (module, filename) => {
+    const source = fs.readFileSync(filename, 'utf8');
+    module._compile(ts.transpileModule(source, { compilerOptions, fileName: filename }).outputText, filename);
+  };
+}
+
+const root = path.join(__dirname, '..');
+const React = require('react');
+const { renderToString } = require('react-dom/server');
+const { PerformanceStore } = require(path.join(root, 'lib/performanceStore'));
+const { applyPerformance, emptyStats } = require(path.join(root, 'lib/userStats'));
+const { AnalyticsState, encodeRows } = require(path.join(root, 'lib/analytics'));
+const { predictFinish } = require(path.join(root, 'lib/prediction'));
+const HistoryList = require(path.join(root, 'components/HistoryList')).default;
+const messages = require(path.join(root, 'lib/locales/fr')).default;
+
+function option(name, fallback) {
+  const index = process.argv.indexOf(`--${name}`);
+  return index >= 0 ? process.argv[index + 1] : fallback;
+}
+
+const sizes = option('sizes', '100,1000,10000').split(',').map(Number);
+const repeat = Number(option('repeat', '20'));
+const seed = Number(option('seed', '0'));
+
+// Same generator on every run, so two reports compare the same histories
+function random(state) {
+  return () => {
+    state = (state + 0x6d2b79f5) | 0;
+    let t = Math.imul(state ^ (state >>> 15), 1 | state);
+    t = (t + Math.imul(t ^ (t >>> 7), 61 | t)) ^ t;
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
+
+// Same shape as fake_performance() in tools/localstore.py
+function history(size) {
+  const next = random(seed + size);
+  const today = Date.UTC(2025, 0, 1);
+  return Array.from({ length: size }, (_, i) => {
+    const splits = {};
+    for (let id = 1; id <= 8; id++) splits[id] = 180 + Math.floor(next() * 420);
+    const totalTime = Object.values(splits).reduce((sum, time) => sum + time, 0) + 1800 + Math.floor(next() * 600);
+    return {
+      id: `perf${i.toString().padStart(8, '0')}`,
+      v: 2,
+      userId: 'bench',
+      date: today - Math.floor(next() * 5 * 365) * 86400000,
+      totalTime,
+      splits,
+      createdAt: today,
+    };
+  });
+}
+
+function measure(run) {
+  const timings = [];
+  for (let i = 0; i < repeat; i++) {
+    const start = performance.now();
+    run();
+    timings.push(performance.now() - start);
+  }
+  timings.sort((a, b) => a - b);
+  const round = (value) => Math.round(value * 1000) / 1000;
+  return {
+    p50_ms: round(timings[Math.floor(timings.length / 2)]),
+    p95_ms: round(timings[Math.floor(timings.length * 0.95)]),
+    ops: repeat,
+  };
+}
+
+const results = {};
+for (const size of sizes) {
+  const performances = history(size);
+  const loaded = new PerformanceStore();
+  loaded.upsertAll(performances);
+  const ordered = loaded.performances;
+  const fresh = { ...performances[0], id: 'fresh', date: Date.UTC(2025, 0, 2) };
+
+  results[`store.load[n=${size}]`] = measure(() => new PerformanceStore().upsertAll(performances));
+  // One live snapshot change on a loaded store: binary-search insert, one array copy
+  results[`store.upsert_one[n=${size}]`] = measure(() => {
+    loaded.upsertAll([fresh]);
+  });
+  results[`stats.fold[n=${size}]`] = measure(() => ordered.reduce(applyPerformance, emptyStats()));
+  results[`analytics.full[n=${size}]`] = measure(() => {
+    const { ids, rows } = encodeRows(ordered);
+    const state = new AnalyticsState();
+    state.upsert(ids, rows);
+    state.result();
+  });
+  const stats = ordered.reduce(applyPerformance, emptyStats());
+  results[`prediction[n=${size}]`] = measure(() => predictFinish(stats.fit));
+  // Virtualized: the server render must not grow with the history
+  const list = React.createElement(HistoryList, { history: ordered, queuedIds: new Set(), t: messages, language: 'fr' });
+  // A list that renders no rows would time an empty div
+  if (!/class="absolute /.test(renderToString(list))) throw new Error(`HistoryList rendered no rows for n=${size}`);
+  results[`render.history_list[n=${size}]`] = measure(() => renderToString(list));
+}
+
+process.stdout.write(JSON.stringify({ node: process.version, sizes, results }) + '\n');
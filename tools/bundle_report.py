@@ -0,0 +1,143 @@
+"""Budget de taille JS par page, à partir des manifestes de `next build`.
+
+Pour chaque page: JS chargé au premier affichage (fichiers de la page + ceux de
+`/_app`, tailles gzip comme dans la sortie de `next build`) et chunks chargés à
+la demande via next/dynamic. Le rapport JSON est écrit dans .next/bundle-report.json.
+Les kB sont ceux de `next build`: 1 kB = 1000 octets, budgets compris.
+
+Le graphique chargé à la demande (components/ProgressChart.tsx, recharts) et
+`optimizePackageImports` n'existent que dans les projets générés par setup.py:
+ce dépôt n'importe ni recharts ni framer-motion, aucune de ses pages ne les
+embarque et le rapport n'y montre pas de chunk de graphique. framer-motion
+n'est importé nulle part, même dans le modèle: il n'y a rien à découper.
+
+Avec --baseline, chaque page est comparée à un rapport précédent (par exemple
+celui de la branche principale, copié avant de reconstruire).
+
+    npm run analyze
+    python tools/bundle_report.py --budget /dashboard=150 --strict
+    python tools/bundle_report.py --baseline main-bundle-report.json
+
+Comparer deux commits, avec le même node_modules:
+
+    git checkout <avant> && npx next build && python tools/bundle_report.py --output avant.json
+    git checkout <après> && npx next build && python tools/bundle_report.py --baseline avant.json
+"""
+import argparse
+import gzip
+import json
+import os
+import sys
+
+# Budget par défaut du JS de premier chargement, en kB gzip
+DEFAULT_BUDGET = 170
+# Comme l'affichage de next build
+KB = 1000
+
+
+def gzip_size(path):
+    with open(path, 'rb') as f:
+        return len(gzip.compress(f.read(), compresslevel=9))
+
+
+def load_json(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def page_report(build_dir, build_manifest, loadable_manifest, budgets):
+    sizes = {}
+
+    def size(files):
+        total = 0
+        for name in files:
+            if name.endswith('.js'):
+                if name not in sizes:
+                    sizes[name] = gzip_size(os.path.join(build_dir, name))
+                total += sizes[name]
+        return total
+
+    pages = build_manifest.get('pages', {})
+    shared = set(pages.get('/_app', []))
+    report = {}
+    for route, files in sorted(pages.items()):
+        if route in ('/_app', '/_error', '/_document'):
+            continue
+        first_load = size(shared | set(files))
+        # Clés du manifeste: 'pages/dashboard.tsx -> ../components/ProgressChart'
+        lazy = {
+            module.split(' -> ', 1)[1]: size(entry.get('files', []))
+            for module, entry in loadable_manifest.items()
+            if route_of(module.split(' -> ', 1)[0]) == route
+        }
+        budget = budgets.get(route, budgets['*'])
+        report[route] = {
+            'firstLoadKb': round(first_load / KB, 1),
+            'budgetKb': budget,
+            'overBudget': first_load / KB > budget,
+            'lazyKb': {module: round(total / KB, 1) for module, total in sorted(lazy.items())},
+        }
+    return report
+
+
+def route_of(source):
+    # 'pages/dashboard.tsx' -> '/dashboard', 'pages/index.tsx' -> '/'
+    route = '/' + os.path.splitext(source)[0].split('pages/', 1)[-1]
+    if route.endswith('/index'):
+        route = route[:-len('/index')] or '/'
+    return route
+
+
+def parse_budgets(values):
+    budgets = {'*': DEFAULT_BUDGET}
+    for value in values:
+        route, _, kb = value.partition('=')
+        try:
+            budgets[route] = float(kb)
+        except ValueError:
+            raise SystemExit(f'❌ --budget attend route=kB: {value}')
+    return budgets
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Rapport de taille des bundles Next.js')
+    parser.add_argument('--build-dir', default='.next', help='dossier de sortie de next build')
+    parser.add_argument('--budget', action='append', default=[], metavar='ROUTE=KB', help=f'budget par page (défaut {DEFAULT_BUDGET} kB)')
+    parser.add_argument('--output', help='rapport JSON (défaut <build-dir>/bundle-report.json)')
+    parser.add_argument('--baseline', help='rapport JSON précédent à comparer')
+    parser.add_argument('--strict', action='store_true', help='code de sortie 1 si une page dépasse son budget')
+    args = parser.parse_args(argv)
+
+    build_manifest = load_json(os.path.join(args.build_dir, 'build-manifest.json'))
+    if not build_manifest:
+        raise SystemExit(f'❌ {args.build_dir}/build-manifest.json introuvable: lancer `next build` d\'abord')
+    loadable_manifest = load_json(os.path.join(args.build_dir, 'react-loadable-manifest.json'))
+    report = page_report(args.build_dir, build_manifest, loadable_manifest, parse_budgets(args.budget))
+    baseline = load_json(args.baseline) if args.baseline else {}
+    for route, entry in report.items():
+        if route in baseline:
+            entry['baselineFirstLoadKb'] = baseline[route]['firstLoadKb']
+
+    output = args.output or os.path.join(args.build_dir, 'bundle-report.json')
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    for route, entry in report.items():
+        status = '❌' if entry['overBudget'] else '✅'
+        delta = ''
+        if 'baselineFirstLoadKb' in entry:
+            delta = f"  ({entry['firstLoadKb'] - entry['baselineFirstLoadKb']:+.1f} kB)"
+        print(f"{status} {route:<20} {entry['firstLoadKb']:>7.1f} kB / {entry['budgetKb']:g} kB{delta}")
+        for module, kb in entry['lazyKb'].items():
+            print(f'      ⏳ {module}: {kb:.1f} kB à la demande')
+    print(f'\n📋 Rapport → {output}')
+
+    if args.strict and any(entry['overBudget'] for entry in report.values()):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,336 @@
+"""Import en masse de résultats officiels (CSV, JSON lines ou tableau JSON).
+
+Le fichier est lu en flux: lecteur -> lignes normalisées -> documents v2 ->
+paquets de `--batch` documents. Chaque paquet est dédoublonné puis écrit par un
+pool de `--jobs` threads, avec au plus `--jobs` paquets en vol: la mémoire ne
+dépend pas de la taille du fichier.
+
+L'id d'un document importé est dérivé de son contenu (athlète, date, temps):
+réimporter le même fichier ne crée pas de doublons. Une ligne dont l'athlète a
+déjà une séance à la même date avec le même temps total (saisie dans l'app,
+par exemple) est aussi comptée comme doublon. Chaque paquet est écrit avec sa
+mise à jour userStats: un import interrompu puis relancé ne perd pas de stats.
+
+Colonnes reconnues (casse et ponctuation ignorées): userId ou email, date,
+total, une colonne par station ('SkiErg', 'Sled Push', 'wallBalls', ...) et
+'Run 1'..'Run 8'. `--map` ajoute une correspondance: `--map skierg="Ski Erg Time"`.
+Temps acceptés: 'HH:MM:SS', 'MM:SS' ou secondes.
+
+    python tools/import_results.py results.csv --local data/ --user <uid>
+    FIRESTORE_EMULATOR_HOST=localhost:8080 python tools/import_results.py results.jsonl --project demo-hyrox
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import re
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import date, datetime, timezone
+
+from backends import MAX_BATCH, FirestoreBackend, LocalBackend
+from localstore import STATIONS, date_key, epoch_day
+from migrate_performances import SCHEMA_VERSION
+
+RUNS = 8
+READ_SIZE = 1 << 16
+
+ALIASES = {
+    'userid': 'userId',
+    'uid': 'userId',
+    'email': 'email',
+    'date': 'date',
+    'eventdate': 'date',
+    'racedate': 'date',
+    'total': 'totalTime',
+    'totaltime': 'totalTime',
+    'time': 'totalTime',
+    'finishtime': 'totalTime',
+    'skierg': 'skierg',
+    'ski': 'skierg',
+    'sledpush': 'sledPush',
+    'sledpull': 'sledPull',
+    'burpeebroadjumps': 'burpeeBroadJumps',
+    'burpeebroadjump': 'burpeeBroadJumps',
+    'bbj': 'burpeeBroadJumps',
+    'rowerg': 'rowErg',
+    'row': 'rowErg',
+    'rowing': 'rowErg',
+    'farmercarry': 'farmerCarry',
+    'farmerscarry': 'farmerCarry',
+    'sandbaglunges': 'sandbagLunges',
+    'lunges': 'sandbagLunges',
+    'wallballs': 'wallBalls',
+    'wallball': 'wallBalls',
+    **{f'run{i}': f'run{i}' for i in range(1, RUNS + 1)},
+}
+
+
+def normalize(header):
+    return re.sub(r'[^a-z0-9]', '', header.lower())
+
+
+def parse_time(value):
+    """'1:05:30', '05:30' ou '330' -> secondes; None si vide ou illisible."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return int(value) if value > 0 else None
+    value = value.strip()
+    if not value:
+        return None
+    try:
+        seconds = 0.0
+        for part in value.split(':'):
+            seconds = seconds * 60 + float(part)
+    except ValueError:
+        return None
+    return round(seconds) if seconds > 0 else None
+
+
+def parse_date(value):
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        return epoch_day(datetime.fromtimestamp(value / 1000, tz=timezone.utc).date())
+    value = value.strip()
+    try:
+        return epoch_day(date.fromisoformat(date_key(value[:10])))
+    except ValueError:
+        return None
+
+
+# -- lecteurs -------------------------------------------------------------------
+
+def iter_json_array(f):
+    """Éléments d'un tableau JSON, décodés au fil de la lecture."""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    eof = False
+    while True:
+        while position < len(buffer) and buffer[position] in ' \t\r\n,[':
+            position += 1
+        if position < len(buffer) and buffer[position] == ']':
+            return
+        try:
+            item, position = decoder.raw_decode(buffer, position)
+            yield item
+            continue
+        except json.JSONDecodeError:
+            if eof:
+                if buffer[position:].strip():
+                    raise
+                return
+        # Élément incomplet: on garde la fin du tampon et on relit
+        buffer = buffer[position:]
+        position = 0
+        chunk = f.read(READ_SIZE)
+        eof = not chunk
+        buffer += chunk
+
+
+def iter_rows(path):
+    """Dictionnaires bruts, une ligne ou un élément à la fois."""
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        if path.endswith('.csv'):
+            yield from csv.DictReader(f)
+        elif path.endswith('.jsonl'):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from iter_json_array(f)
+
+
+def flatten(row):
+    # {"splits": {"skierg": "4:30"}} -> {"skierg": "4:30"}
+    flat = {}
+    for key, value in row.items():
+        if isinstance(value, dict):
+            flat.update(value)
+        elif key is not None:
+            flat[key] = value
+    return flat
+
+
+def map_columns(rows, overrides):
+    """Renomme les colonnes vers les clés de ALIASES; les autres sont ignorées."""
+    mapping = None
+    for row in rows:
+        row = flatten(row)
+        if mapping is None or any(key not in mapping for key in row):
+            mapping = mapping or {}
+            for header in row:
+                if header not in mapping:
+                    mapping[header] = overrides.get(header) or ALIASES.get(normalize(header))
+        yield {mapping[key]: value for key, value in row.items() if mapping[key]}
+
+
+def to_documents(rows, resolve_user, default_date, stats):
+    """Lignes normalisées -> (id, document v2); les lignes rejetées sont comptées dans `stats`."""
+    created_at = int(time.time() * 1000)
+    for row in rows:
+        user_id = resolve_user(row)
+        day = parse_date(row.get('date')) or default_date
+        splits = {}
+        for index, key in enumerate(STATIONS):
+            seconds = parse_time(row.get(key))
+            if seconds:
+                splits[str(index + 1)] = seconds
+        total = parse_time(row.get('totalTime')) or 0
+        if not user_id or day is None or not (splits or total):
+            stats['rejected'] += 1
+            continue
+
+        document = {
+            'v': SCHEMA_VERSION,
+            'userId': user_id,
+            'date': day,
+            'totalTime': total,
+            'splits': splits,
+            'createdAt': created_at,
+        }
+        runs = [parse_time(row.get(f'run{i}')) or 0 for i in range(1, RUNS + 1)]
+        if any(runs):
+            document['runs'] = runs
+        yield document_id(document), document
+
+
+def document_id(document):
+    key = json.dumps([document['userId'], document['date'], document['totalTime'], document['splits']], sort_keys=True)
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:20]
+
+
+def chunked(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# -- écriture -------------------------------------------------------------------
+
+def write_chunk(backend, chunk, dry_run):
+    if dry_run:
+        present = backend.existing([doc_id for doc_id, _ in chunk])
+        return [(doc_id, document) for doc_id, document in chunk if doc_id not in present]
+    # Performances et userStats dans la même écriture: un import interrompu ne laisse
+    # pas de performances sans leurs stats, et la reprise les voit comme doublons à raison
+    return backend.write_with_stats(chunk)
+
+
+def import_results(backend, documents, batch_size=MAX_BATCH, jobs=4, dry_run=False):
+    counts = {'imported': 0, 'duplicates': 0}
+    users = set()
+    # Ids des paquets pas encore écrits: backend.existing() ne peut pas encore les voir
+    recent = OrderedDict()
+    window = (jobs + 1) * batch_size
+    # (date, totalTime) déjà en base par athlète, lus avant d'écrire ses lignes, puis complétés
+    # par les lignes acceptées: les séances saisies dans l'app ont un id aléatoire, que l'id
+    # dérivé du contenu ne retrouve pas
+    known = {}
+
+    def unseen(items):
+        for doc_id, document in items:
+            if doc_id in recent:
+                counts['duplicates'] += 1
+                continue
+            if document['totalTime'] > 0:
+                uid = document['userId']
+                if uid not in known:
+                    known[uid] = backend.performance_keys(uid)
+                key = (document['date'], document['totalTime'])
+                if key in known[uid]:
+                    counts['duplicates'] += 1
+                    continue
+                # Une autre ligne du fichier avec la même date et le même temps est aussi un doublon
+                known[uid].add(key)
+            recent[doc_id] = None
+            if len(recent) > window:
+                recent.popitem(last=False)
+            yield doc_id, document
+
+    def collect(done):
+        for future in done:
+            fresh = future.result()
+            counts['imported'] += len(fresh)
+            users.update(document['userId'] for _, document in fresh)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        pending = set()
+        sent = 0
+        for chunk in chunked(unseen(documents), batch_size):
+            if len(pending) >= jobs:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            pending.add(pool.submit(write_chunk, backend, chunk, dry_run))
+            sent += len(chunk)
+            if sent % (batch_size * 20) == 0:
+                print(f"   {sent} lue(s), {counts['imported']} importée(s)")
+        collect(wait(pending).done)
+
+    counts['duplicates'] += sent - counts['imported']
+    counts['users'] = len(users)
+    counts['seconds'] = round(time.perf_counter() - start, 1)
+    return counts
+
+
+def parse_mapping(values):
+    overrides = {}
+    for value in values:
+        key, _, header = value.partition('=')
+        if not header:
+            raise SystemExit(f'❌ --map attend clé=colonne: {value}')
+        overrides[header] = key
+    return overrides
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Import de résultats de course dans performances')
+    parser.add_argument('input', help='fichier .csv, .jsonl ou .json')
+    parser.add_argument('--project', default=os.environ.get('NEXT_PUBLIC_FIREBASE_PROJECT_ID'))
+    parser.add_argument('--local', help='importer dans un dossier tools/localstore.py au lieu de Firestore')
+    parser.add_argument('--user', help='userId des lignes sans userId ni email connu')
+    parser.add_argument('--date', help='date (YYYY-MM-DD) des lignes sans date')
+    parser.add_argument('--map', action='append', default=[], metavar='CLÉ=COLONNE', help='correspondance de colonne')
+    parser.add_argument('--batch', type=int, default=MAX_BATCH, help=f'documents par commit (max {MAX_BATCH})')
+    parser.add_argument('--jobs', type=int, default=4, help="paquets écrits en parallèle")
+    parser.add_argument('--dry-run', action='store_true', help='lire et dédoublonner sans rien écrire')
+    args = parser.parse_args(argv)
+
+    if not 1 <= args.batch <= MAX_BATCH:
+        raise SystemExit(f'❌ --batch doit être entre 1 et {MAX_BATCH}')
+    default_date = parse_date(args.date) if args.date else None
+    if args.date and default_date is None:
+        raise SystemExit(f'❌ Date invalide: {args.date}')
+
+    backend = LocalBackend(args.local) if args.local else FirestoreBackend(args.project)
+    try:
+        emails = backend.users_by_email()
+
+        def resolve_user(row):
+            return row.get('userId') or emails.get((row.get('email') or '').strip().lower()) or args.user
+
+        rejected = {'rejected': 0}
+        rows = map_columns(iter_rows(args.input), parse_mapping(args.map))
+        documents = to_documents(rows, resolve_user, default_date, rejected)
+        counts = import_results(backend, documents, args.batch, args.jobs, args.dry_run)
+    finally:
+        backend.close()
+
+    print(
+        f"✅ {counts['imported']} importée(s), {counts['duplicates']} doublon(s), "
+        f"{rejected['rejected']} rejetée(s), {counts['users']} athlète(s) en {counts['seconds']} s"
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,405 @@
+"""Stand-in local des collections Firestore `users`, `performances`, `userStats`
+et des classements (`rankings`, `rankingEntries`, `rankingState`).
+
+Les documents sont stockés en JSON lines (un fichier par collection) et
+indexés en mémoire:
+- `performances` par `userId` (buckets triés par date) et par `date`,
+- la requête du dashboard `where('userId', '==', uid)` + tri par date
+  devient un accès direct au bucket au lieu d'un parcours complet.
+
+    python tools/localstore.py seed data/ --docs 1000000 --users 2000
+    python tools/localstore.py bench data/ --queries 200
+    python tools/localstore.py seed data/ --docs 10000 --emulator localhost:8080
+"""
+import argparse
+import bisect
+import json
+import os
+import random
+import secrets
+import string
+import time
+import urllib.request
+from datetime import date, datetime, timedelta, timezone
+
+COLLECTIONS = ('users', 'performances', 'userStats', 'rankings', 'rankingEntries', 'rankingState')
+
+STATIONS = [
+    'skierg',
+    'sledPush',
+    'sledPull',
+    'burpeeBroadJumps',
+    'rowErg',
+    'farmerCarry',
+    'sandbagLunges',
+    'wallBalls',
+]
+
+ID_ALPHABET = string.ascii_letters + string.digits
+
+
+def new_id():
+    # Même forme que les identifiants auto de Firestore (20 caractères)
+    return ''.join(secrets.choice(ID_ALPHABET) for _ in range(20))
+
+
+def date_key(value):
+    """Clé triable 'YYYY-MM-DD' pour toutes les dates écrites par l'app.
+
+    Schéma v2: epoch ms. Anciens documents: 'YYYY-MM-DD' (track.tsx) ou
+    toLocaleDateString('fr-FR') soit 'DD/MM/YYYY' (tracking.tsx).
+    """
+    if value is None or value == '':
+        return ''
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value / 1000, tz=timezone.utc).date().isoformat()
+    value = str(value)
+    if '/' in value:
+        day, month, year = value.split('/')
+        return f'{year}-{int(month):02d}-{int(day):02d}'
+    return value
+
+
+def epoch_day(day):
+    """Date du jour de séance -> epoch ms à minuit UTC (champ `date` v2)."""
+    return int(datetime(day.year, day.month, day.day, tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def iter_documents(path):
+    """(id, document) pour chaque document d'un export."""
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith('.jsonl'):
+            for number, line in enumerate(f):
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if 'data' in record:
+                    if not record.get('deleted'):
+                        yield record['id'], record['data']
+                else:
+                    yield record.pop('id', str(number)), record
+            return
+        content = json.load(f)
+    if isinstance(content, dict):
+        yield from content.items()
+    else:
+        for number, record in enumerate(content):
+            yield record.pop('id', str(number)), record
+
+
+class LocalStore:
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self.docs = {name: {} for name in COLLECTIONS}
+        self._by_user = {}
+        self._by_date = []
+        self._dirty_users = set()
+        self._date_dirty = False
+        self._dead_by_user = {}
+        self._dead_dates = set()
+        self._files = {}
+        for name in COLLECTIONS:
+            self._load(name)
+
+    # -- stockage -----------------------------------------------------------
+
+    def _file(self, name):
+        return os.path.join(self.path, f'{name}.jsonl')
+
+    def _load(self, name):
+        try:
+            f = open(self._file(name), 'r', encoding='utf-8')
+        except FileNotFoundError:
+            return
+        with f:
+            for line in f:
+                record = json.loads(line)
+                if record.get('deleted'):
+                    self._remove(name, record['id'])
+                else:
+                    self._put(name, record['id'], record['data'])
+
+    def _append(self, name, record):
+        f = self._files.get(name)
+        if f is None:
+            f = self._files[name] = open(self._file(name), 'a', encoding='utf-8')
+        f.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')))
+        f.write('\n')
+
+    def flush(self):
+        for f in self._files.values():
+            f.flush()
+
+    def close(self):
+        for f in self._files.values():
+            f.close()
+        self._files.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -- index ----------------------------------------------------------------
+
+    def _put(self, name, doc_id, data):
+        if doc_id in self.docs[name]:
+            self._remove(name, doc_id)
+        self.docs[name][doc_id] = data
+        if name != 'performances':
+            return
+        # Ajout en fin de liste: le tri est fait paresseusement à la requête
+        entry = (date_key(data.get('date')), doc_id)
+        uid = data.get('userId')
+        dead = self._dead_by_user.get(uid)
+        if dead and entry in dead:
+            # Réécriture à l'identique: l'entrée encore dans la liste redevient vivante
+            dead.discard(entry)
+        else:
+            self._by_user.setdefault(uid, []).append(entry)
+            self._dirty_users.add(uid)
+        if entry in self._dead_dates:
+            self._dead_dates.discard(entry)
+        else:
+            self._by_date.append(entry)
+            self._date_dirty = True
+
+    def _remove(self, name, doc_id):
+        data = self.docs[name].pop(doc_id, None)
+        if data is None or name != 'performances':
+            return
+        # Pierre tombale plutôt que list.remove (O(n) par écrasement, quadratique au rejeu du journal):
+        # les listes sont compactées en une passe à la prochaine requête
+        entry = (date_key(data.get('date')), doc_id)
+        self._dead_by_user.setdefault(data.get('userId'), set()).add(entry)
+        self._dead_dates.add(entry)
+
+    def _user_bucket(self, uid):
+        bucket = self._by_user.get(uid, [])
+        dead = self._dead_by_user.pop(uid, None)
+        if dead:
+            bucket[:] = [entry for entry in bucket if entry not in dead]
+        if uid in self._dirty_users:
+            bucket.sort()
+            self._dirty_users.discard(uid)
+        return bucket
+
+    def _date_index(self):
+        if self._dead_dates:
+            self._by_date = [entry for entry in self._by_date if entry not in self._dead_dates]
+            self._dead_dates = set()
+        if self._date_dirty:
+            self._by_date.sort()
+            self._date_dirty = False
+        return self._by_date
+
+    # -- API façon Firestore ------------------------------------------------
+
+    def add(self, name, data):
+        doc_id = new_id()
+        self.set(name, doc_id, data)
+        return doc_id
+
+    def set(self, name, doc_id, data):
+        self._put(name, doc_id, data)
+        self._append(name, {'id': doc_id, 'data': data})
+
+    def get(self, name, doc_id):
+        return self.docs[name].get(doc_id)
+
+    def delete(self, name, doc_id):
+        self._remove(name, doc_id)
+        self._append(name, {'id': doc_id, 'deleted': True})
+
+    def user_performances(self, uid, descending=True, limit=None, start_after=None):
+        """where('userId', '==', uid) + orderBy('date') via l'index userId.
+
+        `start_after` est le curseur (date, id) du dernier document de la page
+        précédente, comme `startAfter(lastDoc)` côté client.
+        """
+        bucket = self._user_bucket(uid)
+        if descending:
+            end = bisect.bisect_left(bucket, tuple(start_after)) if start_after else len(bucket)
+            keys = bucket[max(0, end - limit) if limit else 0:end][::-1]
+        else:
+            start = bisect.bisect_right(bucket, tuple(start_after)) if start_after else 0
+            keys = bucket[start:start + limit] if limit else bucket[start:]
+        performances = self.docs['performances']
+        return [{'id': doc_id, **performances[doc_id]} for _, doc_id in keys]
+
+    def performances_between(self, start, end):
+        """orderBy('date') sur [start, end] via l'index ordonné."""
+        index = self._date_index()
+        lo = bisect.bisect_left(index, (date_key(start), ''))
+        hi = bisect.bisect_right(index, (date_key(end), '\uffff'))
+        performances = self.docs['performances']
+        return [{'id': doc_id, **performances[doc_id]} for _, doc_id in index[lo:hi]]
+
+    def scan_user_performances(self, uid):
+        """Ce que fait le dashboard aujourd'hui: filtre complet puis tri client."""
+        perfs = [
+            {'id': doc_id, **data}
+            for doc_id, data in self.docs['performances'].items()
+            if data.get('userId') == uid
+        ]
+        perfs.sort(key=lambda p: date_key(p.get('date')), reverse=True)
+        return perfs
+
+
+# -- Émulateur Firestore ------------------------------------------------------
+
+def to_firestore_value(value):
+    if value is None:
+        return {'nullValue': None}
+    if isinstance(value, bool):
+        return {'booleanValue': value}
+    if isinstance(value, int):
+        return {'integerValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    if isinstance(value, dict):
+        return {'mapValue': {'fields': {k: to_firestore_value(v) for k, v in value.items()}}}
+    if isinstance(value, (list, tuple)):
+        return {'arrayValue': {'values': [to_firestore_value(v) for v in value]}}
+    return {'stringValue': str(value)}
+
+
+def push_to_emulator(host, project, name, documents, batch_size=500):
+    """Écrit des (id, data) dans l'émulateur Firestore par commits de 500."""
+    base = f'projects/{project}/databases/(default)/documents'
+    url = f'http://{host}/v1/{base}:commit'
+    batch = []
+
+    def commit():
+        body = json.dumps({'writes': batch}).encode('utf-8')
+        request = urllib.request.Request(
+            url,
+            data=body,
+            headers={'Content-Type': 'application/json', 'Authorization': 'Bearer owner'},
+        )
+        urllib.request.urlopen(request).close()
+        batch.clear()
+
+    for doc_id, data in documents:
+        batch.append({
+            'update': {
+                'name': f'{base}/{name}/{doc_id}',
+                'fields': {k: to_firestore_value(v) for k, v in data.items()},
+            }
+        })
+        if len(batch) >= batch_size:
+            commit()
+    if batch:
+        commit()
+
+
+# -- CLI ----------------------------------------------------------------------
+
+def fake_performance(uid, rng, day):
+    # Même forme que buildPerformance() dans lib/performances.ts
+    splits = {str(i + 1): rng.randint(180, 600) for i in range(len(STATIONS))}
+    return {
+        'v': 2,
+        'userId': uid,
+        'date': epoch_day(day),
+        'totalTime': sum(splits.values()) + rng.randint(1800, 2400),
+        'splits': splits,
+        'createdAt': int(time.time() * 1000),
+    }
+
+
+def seed_store(store, users, docs, rng):
+    """Remplit `store` avec `users` profils et `docs` performances; renvoie les uids."""
+    uids = []
+    for i in range(users):
+        uid = new_id()
+        uids.append(uid)
+        store.set('users', uid, {
+            'name': f'Athlete {i}',
+            'email': f'athlete{i}@example.com',
+            'category': rng.choice(['Open', 'Doubles', 'Elite']),
+            'targetTime': rng.randint(55, 120),
+            'age': rng.randint(18, 65),
+            'gender': rng.choice(['male', 'female']),
+            'createdAt': datetime.now().isoformat(),
+        })
+    first_day = date.today() - timedelta(days=5 * 365)
+    # Distribution inégale: quelques athlètes ont des milliers de séances
+    weights = [rng.paretovariate(1.2) for _ in uids]
+    for uid in rng.choices(uids, weights, k=docs):
+        store.add('performances', fake_performance(uid, rng, first_day + timedelta(days=rng.randrange(5 * 365))))
+    return uids
+
+
+def seed(args):
+    rng = random.Random(args.seed)
+    start = time.perf_counter()
+    with LocalStore(args.path) as store:
+        seed_store(store, args.users, args.docs, rng)
+        if args.emulator:
+            for name in COLLECTIONS:
+                push_to_emulator(args.emulator, args.project, name, store.docs[name].items())
+
+    print(f'✅ {args.users} utilisateur(s), {args.docs} performance(s) en {time.perf_counter() - start:.1f} s')
+
+
+def bench(args):
+    store = LocalStore(args.path)
+    rng = random.Random(args.seed)
+    uids = list(store.docs['users'])
+    if not uids:
+        raise SystemExit(f'❌ aucun utilisateur dans {args.path}, lancez `seed` d\'abord')
+    sample = [rng.choice(uids) for _ in range(args.queries)]
+
+    def measure(query):
+        timings = []
+        for uid in sample:
+            start = time.perf_counter()
+            query(uid)
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        return {
+            'p50_ms': timings[len(timings) // 2] * 1000,
+            'p95_ms': timings[int(len(timings) * 0.95)] * 1000,
+            'total_ms': sum(timings) * 1000,
+        }
+
+    results = {
+        'documents': len(store.docs['performances']),
+        'users': len(uids),
+        'queries': args.queries,
+        'indexed': measure(store.user_performances),
+        'indexed_page': measure(lambda uid: store.user_performances(uid, limit=args.page_size)),
+        'scan': measure(store.scan_user_performances),
+    }
+    print(json.dumps(results, indent=2))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Stand-in Firestore local pour les tests de charge')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    seed_parser = commands.add_parser('seed', help='générer des utilisateurs et des performances')
+    seed_parser.add_argument('path')
+    seed_parser.add_argument('--users', type=int, default=1000)
+    seed_parser.add_argument('--docs', type=int, default=100000)
+    seed_parser.add_argument('--seed', type=int, default=0)
+    seed_parser.add_argument('--emulator', help="host:port de l'émulateur Firestore à remplir aussi")
+    seed_parser.add_argument('--project', default=os.environ.get('NEXT_PUBLIC_FIREBASE_PROJECT_ID', 'demo-hyrox'))
+    seed_parser.set_defaults(func=seed)
+
+    bench_parser = commands.add_parser('bench', help='requête par utilisateur: index vs parcours complet')
+    bench_parser.add_argument('path')
+    bench_parser.add_argument('--queries', type=int, default=100)
+    bench_parser.add_argument('--page-size', type=int, default=20)
+    bench_parser.add_argument('--seed', type=int, default=0)
+    bench_parser.set_defaults(func=bench)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
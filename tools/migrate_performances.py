@@ -0,0 +1,209 @@
+"""Réécrit les documents `performances` vers le schéma compact v2.
+
+Anciennes formes:
+- track.tsx:    {userId, date: 'YYYY-MM-DD', totalTime, stations: {skierg: ...}, createdAt}
+- tracking.tsx: {userId, station: '1️⃣ SkiErg', minutes, seconds, totalSeconds,
+                 notes, date: 'DD/MM/YYYY', timestamp}
+
+Schéma v2 (voir PerformanceDoc dans lib/performances.ts):
+    {v: 2, userId, date: epoch ms, totalTime: s, splits: {'1': s, ...}, notes?, createdAt: epoch ms}
+
+La migration avance par paquets ordonnés par id et enregistre le dernier id
+traité dans un fichier de reprise: relancer la commande reprend où elle s'était
+arrêtée.
+
+Une fois tous les documents en v2, `userStats/{uid}` est recalculé depuis
+l'historique complet de chaque athlète (les performances antérieures à
+l'agrégat n'y sont pas, sinon). `--no-stats` saute cette étape, `--stats-only`
+ne fait qu'elle.
+
+    python tools/migrate_performances.py --project my-project
+    python tools/migrate_performances.py --local data/ --chunk 1000
+"""
+import argparse
+import json
+import os
+import re
+import time
+from datetime import date, datetime, timezone
+
+from backends import FirestoreBackend, LocalBackend
+from localstore import STATIONS, date_key, epoch_day
+
+SCHEMA_VERSION = 2
+
+# Libellés de pages/tracking.tsx, dans l'ordre des stations
+TRACKING_LABELS = {
+    '1️⃣ SkiErg': 1,
+    '2️⃣ Sled Push': 2,
+    '3️⃣ Sled Pull': 3,
+    '4️⃣ Burpee Broad Jumps': 4,
+    '5️⃣ Rowing': 5,
+    '6️⃣ Farmers Carry': 6,
+    '7️⃣ Fentes marchées': 7,
+    '8️⃣ Wall Balls': 8,
+}
+
+
+def station_id_from_label(label):
+    if label in TRACKING_LABELS:
+        return TRACKING_LABELS[label]
+    # '3️⃣ ...' -> 3
+    if label and label[0].isdigit():
+        return int(label[0])
+    return None
+
+
+def to_epoch_ms(value):
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp() * 1000)
+    if isinstance(value, str):
+        try:
+            return epoch_day(date.fromisoformat(date_key(value)))
+        except ValueError:
+            return int(datetime.fromisoformat(value).timestamp() * 1000)
+    return None
+
+
+def to_canonical(data):
+    """Document existant -> document v2, ou None s'il est déjà à jour."""
+    if data.get('v') == SCHEMA_VERSION:
+        return None
+
+    splits = {}
+    for index, key in enumerate(STATIONS):
+        seconds = (data.get('stations') or {}).get(key)
+        if seconds:
+            splits[str(index + 1)] = int(seconds)
+
+    if data.get('station'):
+        station_id = station_id_from_label(data['station'])
+        seconds = data.get('totalSeconds')
+        if seconds is None:
+            seconds = data.get('time')
+        if seconds is None and data.get('minutes') is not None:
+            seconds = int(data['minutes']) * 60 + int(data.get('seconds') or 0)
+        if station_id and seconds:
+            splits[str(station_id)] = int(seconds)
+
+    created_at = to_epoch_ms(data.get('createdAt')) or to_epoch_ms(data.get('timestamp'))
+    day = to_epoch_ms(data.get('date'))
+    if day is None and created_at is not None:
+        day = epoch_day(datetime.fromtimestamp(created_at / 1000, tz=timezone.utc).date())
+
+    canonical = {
+        'v': SCHEMA_VERSION,
+        'userId': data.get('userId'),
+        'date': day,
+        'totalTime': int(data.get('totalTime') or 0),
+        'splits': splits,
+        'createdAt': created_at if created_at is not None else day,
+    }
+    if data.get('notes'):
+        canonical['notes'] = data['notes']
+    return canonical
+
+
+def target_of(args):
+    """Identifie la base migrée: 'local:<dossier absolu>' ou 'firestore:<projet>'."""
+    return f'local:{os.path.abspath(args.local)}' if args.local else f'firestore:{args.project}'
+
+
+def default_checkpoint(target):
+    # Un fichier de reprise par cible: migrer une autre base ne reprend pas le curseur de la première
+    slug = re.sub(r'[^A-Za-z0-9]+', '-', target).strip('-')
+    return f'.migrate-performances-{slug}.json'
+
+
+def load_checkpoint(path, target):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            checkpoint = json.load(f)
+    except FileNotFoundError:
+        return {'target': target, 'last_id': None, 'migrated': 0, 'skipped': 0}
+    if checkpoint.get('target') != target:
+        raise SystemExit(
+            f"❌ {path} est la reprise de {checkpoint.get('target') or 'une autre base'}, pas de {target}: "
+            'choisissez un autre --checkpoint'
+        )
+    return checkpoint
+
+
+def save_checkpoint(path, checkpoint):
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp, path)
+
+
+def migrate(backend, target, checkpoint_path, chunk_size, dry_run=False):
+    checkpoint = load_checkpoint(checkpoint_path, target)
+    if checkpoint['last_id']:
+        print(f"↩️ Reprise après {checkpoint['last_id']}")
+    start = time.perf_counter()
+
+    for chunk in backend.chunks(checkpoint['last_id'], chunk_size):
+        updates = []
+        for doc_id, data in chunk:
+            canonical = to_canonical(data)
+            if canonical is None:
+                checkpoint['skipped'] += 1
+            else:
+                updates.append((doc_id, canonical))
+        if updates and not dry_run:
+            backend.write(updates)
+        checkpoint['migrated'] += len(updates)
+        checkpoint['last_id'] = chunk[-1][0]
+        if not dry_run:
+            save_checkpoint(checkpoint_path, checkpoint)
+        print(f"   {checkpoint['migrated']} migré(s), {checkpoint['skipped']} déjà à jour")
+
+    print(f'✅ Terminé en {time.perf_counter() - start:.1f} s')
+    return checkpoint
+
+
+def rebuild_stats(backend, dry_run=False):
+    """Recalcule userStats/{uid} pour chaque athlète qui a au moins une performance."""
+    start = time.perf_counter()
+    user_ids = sorted(backend.user_ids())
+    if dry_run:
+        print(f'📊 {len(user_ids)} agrégat(s) userStats à recalculer')
+        return
+    for number, user_id in enumerate(user_ids, 1):
+        backend.rebuild_stats(user_id)
+        if number % 100 == 0:
+            print(f'   {number}/{len(user_ids)} agrégat(s) recalculé(s)')
+    print(f'📊 {len(user_ids)} agrégat(s) userStats recalculé(s) en {time.perf_counter() - start:.1f} s')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Migration des performances vers le schéma v2')
+    parser.add_argument('--project', default=os.environ.get('NEXT_PUBLIC_FIREBASE_PROJECT_ID'))
+    parser.add_argument('--local', help='migrer un dossier tools/localstore.py au lieu de Firestore')
+    parser.add_argument('--chunk', type=int, default=500, help='documents lus et écrits par paquet')
+    parser.add_argument('--checkpoint', help='fichier de reprise (par défaut un fichier par base visée)')
+    parser.add_argument('--dry-run', action='store_true', help="convertir sans rien écrire")
+    steps = parser.add_mutually_exclusive_group()
+    steps.add_argument('--no-stats', action='store_true', help='ne pas recalculer userStats après la migration')
+    steps.add_argument('--stats-only', action='store_true', help='recalculer userStats sans migrer')
+    args = parser.parse_args(argv)
+
+    target = target_of(args)
+    backend = LocalBackend(args.local) if args.local else FirestoreBackend(args.project)
+    try:
+        if not args.stats_only:
+            migrate(backend, target, args.checkpoint or default_checkpoint(target), args.chunk, args.dry_run)
+        if not args.no_stats:
+            rebuild_stats(backend, args.dry_run)
+    finally:
+        backend.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""Maintient les classements lus par lib/rankings.ts, avec des droits d'administration.
+
+Les clients ne les écrivent plus: le job les dérive de `userStats` et `users`.
+- `rankings/{scope}`: nombre d'athlètes par meilleur temps (à la seconde),
+  somme et effectif. La taille dépend de l'écart des temps, pas du nombre
+  d'athlètes; le rang est une somme sur l'histogramme.
+- `rankingEntries/{uid}`: meilleur temps, nom et scopes de l'athlète, pour la
+  requête du top N (index scopes + time).
+- `rankingState/cursor`: `updatedAt` du dernier userStats pris en compte.
+
+`update` (par défaut) traite les userStats modifiés depuis le curseur: chaque
+athlète est déplacé dans une transaction qui relit son entrée, donc un passage
+interrompu est simplement rejoué au suivant. `rebuild` recalcule tout depuis
+les profils actuels: c'est le backfill initial, et ce qui déplace les athlètes
+dont la catégorie ou le groupe d'âge a changé sans nouvelle performance.
+Une seule instance à la fois.
+
+    python tools/rankings.py rebuild --project my-project
+    python tools/rankings.py update --project my-project     # cron, toutes les 5 minutes
+    python tools/rankings.py update --local data/
+"""
+import argparse
+import os
+import time
+
+from backends import FirestoreBackend, LocalBackend, ranking_entry, ranking_histograms
+
+
+def rebuild(backend):
+    start = time.perf_counter()
+    sources = backend.ranking_sources()
+    entries = {}
+    for user_id, profile, best, _ in sources:
+        entry = ranking_entry(profile, best)
+        if entry:
+            entries[user_id] = entry
+    histograms = ranking_histograms(entries)
+    backend.replace_rankings(histograms, entries)
+    # Ce qui change après la lecture est repris par le prochain `update`
+    stamps = [updated_at for *_, updated_at in sources if updated_at is not None]
+    if stamps:
+        backend.save_ranking_cursor(max(stamps))
+    print(f'🏅 {len(entries)} athlète(s) classé(s) dans {len(histograms)} classement(s) en {time.perf_counter() - start:.1f} s')
+
+
+def update(backend):
+    start = time.perf_counter()
+    changed = backend.changed_stats(backend.ranking_cursor())
+    if not changed:
+        print('🏅 Rien à mettre à jour')
+        return
+    profiles = backend.profiles([user_id for user_id, _, _ in changed])
+    moved = 0
+    for user_id, best, _ in changed:
+        if backend.place_ranking(user_id, ranking_entry(profiles.get(user_id), best)):
+            moved += 1
+    # Curseur avancé seulement une fois tout traité: une erreur fait rejouer le lot entier
+    backend.save_ranking_cursor(changed[-1][2])
+    print(f'🏅 {len(changed)} agrégat(s) relu(s), {moved} athlète(s) déplacé(s) en {time.perf_counter() - start:.1f} s')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Classements précalculés, écrits côté serveur')
+    parser.add_argument('command', nargs='?', choices=('update', 'rebuild'), default='update')
+    parser.add_argument('--project', default=os.environ.get('NEXT_PUBLIC_FIREBASE_PROJECT_ID'))
+    parser.add_argument('--local', help='dossier tools/localstore.py au lieu de Firestore')
+    args = parser.parse_args(argv)
+
+    backend = LocalBackend(args.local) if args.local else FirestoreBackend(args.project)
+    try:
+        rebuild(backend) if args.command == 'rebuild' else update(backend)
+    finally:
+        backend.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""Agrégats reduceat de tools/analytics.py comparés à un repli Python document par document.
+
+    python -m pytest tools/test_analytics.py
+"""
+import json
+import math
+import random
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from analytics import DAY_MS, MIN_TREND_POINTS, load_columns, report  # noqa: E402
+from localstore import STATIONS  # noqa: E402
+
+
+def write_export(path, documents):
+    with open(path, 'w', encoding='utf-8') as f:
+        for number, document in enumerate(documents):
+            f.write(json.dumps({'id': f'perf{number}', 'data': document}) + '\n')
+
+
+def random_documents(rng, users=12, count=400):
+    documents = []
+    for _ in range(count):
+        splits = {str(i + 1): rng.randint(180, 600) for i in range(len(STATIONS)) if rng.random() < 0.7}
+        documents.append({
+            'v': 2,
+            'userId': f'user{rng.randrange(users)}',
+            'date': rng.randrange(2000) * DAY_MS,
+            'totalTime': rng.choice([0, rng.randint(3600, 7200)]),
+            'splits': splits,
+            'createdAt': 0,
+        })
+    return documents
+
+
+def python_fold(documents):
+    """Mêmes agrégats, une boucle Python par document."""
+    first_day = min(document['date'] for document in documents)
+    athletes = {}
+    for document in documents:
+        athlete = athletes.setdefault(document['userId'], {
+            'sessions': 0,
+            'bestTotalTime': None,
+            'times': {station: [] for station in STATIONS},
+        })
+        athlete['sessions'] += 1
+        if document['totalTime'] > 0:
+            best = athlete['bestTotalTime']
+            athlete['bestTotalTime'] = document['totalTime'] if best is None else min(best, document['totalTime'])
+        for i, station in enumerate(STATIONS):
+            time = document['splits'].get(str(i + 1))
+            if time:
+                athlete['times'][station].append(((document['date'] - first_day) / DAY_MS, time))
+    return athletes
+
+
+def slope_per_30_days(points):
+    n = len(points)
+    sx = sum(x for x, _ in points)
+    sy = sum(y for _, y in points)
+    sxy = sum(x * y for x, y in points)
+    sxx = sum(x * x for x, _ in points)
+    denominator = n * sxx - sx ** 2
+    if n < MIN_TREND_POINTS or denominator <= 0:
+        return None
+    return (n * sxy - sx * sy) / denominator * 30
+
+
+def test_empty_export(tmp_path):
+    path = tmp_path / 'performances.jsonl'
+    path.write_text('')
+    columns = load_columns(str(path))
+    assert len(columns) == 0
+    assert report(columns) == {'documents': 0, 'athletes': {}}
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_reduceat_matches_python_fold(tmp_path, seed):
+    documents = random_documents(random.Random(seed))
+    path = tmp_path / 'performances.jsonl'
+    write_export(str(path), documents)
+
+    result = report(load_columns(str(path)))
+    expected = python_fold(documents)
+
+    assert result['documents'] == len(documents)
+    assert set(result['athletes']) == set(expected)
+    for uid, athlete in expected.items():
+        got = result['athletes'][uid]
+        assert got['sessions'] == athlete['sessions']
+        assert got['bestTotalTime'] == athlete['bestTotalTime']
+        for station, points in athlete['times'].items():
+            times = [time for _, time in points]
+            stats = got['stations'][station]
+            assert stats['count'] == len(times)
+            assert stats['best'] == (min(times) if times else None)
+            assert stats['mean'] == (round(sum(times) / len(times), 1) if times else None)
+            slope = slope_per_30_days(points)
+            if slope is None:
+                assert stats['trendPer30Days'] is None
+            else:
+                assert math.isclose(stats['trendPer30Days'], round(slope, 1), abs_tol=0.11)
+
+
+def test_athlete_with_one_session(tmp_path):
+    documents = [{'v': 2, 'userId': 'solo', 'date': 0, 'totalTime': 4000, 'splits': {'1': 240}, 'createdAt': 0}]
+    path = tmp_path / 'performances.jsonl'
+    write_export(str(path), documents)
+
+    athlete = report(load_columns(str(path)))['athletes']['solo']
+    assert athlete['sessions'] == 1
+    assert athlete['stations']['skierg']['best'] == 240
+    assert athlete['stations']['skierg']['percentile'] == 0.0
+    assert athlete['stations']['skierg']['trendPer30Days'] is None
+    assert athlete['weakestFirst'] == ['skierg']
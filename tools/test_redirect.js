@@ -0,0 +1,53 @@
+// lib/redirect.ts: the round trip through /login that brings an athlete back to a coach's invite,
+// and the `next` values that must not leave the site.
+// Transpiled on require like tools/bench_render.js, so this needs `npm install`.
+//
+//   npm test
+
+const assert = require('assert');
+const fs = require('fs');
+const path = require('path');
+const test = require('node:test');
+
+const ts = require('typescript');
+
+const compilerOptions = { module: ts.ModuleKind.CommonJS, target: ts.ScriptTarget.ES2019 };
+
+require.extensions['.ts'] = (module, filename) => {
+  const source = fs.readFileSync(filename, 'utf8');
+  module._compile(ts.transpileModule(source, { compilerOptions, fileName: filename }).outputText, filename);
+};
+
+const { DEFAULT_AFTER_LOGIN, afterLogin, loginPath } = require(path.join(__dirname, '..', 'lib/redirect'));
+
+// What pages/login.tsx reads from router.query
+const nextOf = (loginUrl) => new URL(loginUrl, 'https://hyrox.example').searchParams.get('next');
+
+test('a signed-out athlete comes back to the invite after login or signup', () => {
+  const invite = '/invite?id=Xk29sQ0aLm7Zp4Rt1vNb';
+  const login = loginPath(invite);
+  assert.strictEqual(login, '/login?next=%2Finvite%3Fid%3DXk29sQ0aLm7Zp4Rt1vNb');
+  assert.strictEqual(afterLogin(nextOf(login)), invite);
+});
+
+test('paths keep their query and hash', () => {
+  assert.strictEqual(afterLogin('/dashboard?tab=history#pb'), '/dashboard?tab=history#pb');
+  assert.strictEqual(afterLogin(nextOf(loginPath('/race'))), '/race');
+});
+
+test('anything but a same-origin path goes to the dashboard', () => {
+  for (const next of [
+    undefined,
+    null,
+    ['/invite', '/race'],
+    '',
+    'invite',
+    'https://evil.example/invite',
+    'javascript:alert(1)',
+    '//evil.example/invite',
+    '/\\evil.example',
+    '/login?next=%2Finvite',
+  ]) {
+    assert.strictEqual(afterLogin(next), DEFAULT_AFTER_LOGIN, String(next));
+  }
+});
@@ -0,0 +1,92 @@
+// lib/telemetry.ts through the file sink of lib/telemetryFileSink.ts: what traced() and mark()
+// record is what ends up in the file, one JSON sample per line.
+// Transpiled on require like tools/bench_render.js, so this needs `npm install`.
+//
+//   npm test
+
+const assert = require('assert');
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+const test = require('node:test');
+
+const ts = require('typescript');
+
+const compilerOptions = { module: ts.ModuleKind.CommonJS, target: ts.ScriptTarget.ES2019, esModuleInterop: true };
+
+require.extensions['.ts'] = (module, filename) => {
+  const source = fs.readFileSync(filename, 'utf8');
+  module._compile(ts.transpileModule(source, { compilerOptions, fileName: filename }).outputText, filename);
+};
+
+const root = path.join(__dirname, '..');
+const telemetry = require(path.join(root, 'lib/telemetry'));
+const { fileSink } = require(path.join(root, 'lib/telemetryFileSink'));
+
+// The sink writes asynchronously after flushTelemetry() returns
+async function readSamples(file, expected) {
+  for (let attempt = 0; attempt < 100; attempt++) {
+    if (fs.existsSync(file)) {
+      const lines = fs.readFileSync(file, 'utf8').split('\n').filter(Boolean);
+      if (lines.length >= expected) return lines.map((line) => JSON.parse(line));
+    }
+    await new Promise((resolve) => setTimeout(resolve, 10));
+  }
+  throw new Error(`${file}: fewer than ${expected} samples`);
+}
+
+function withFileSink() {
+  const file = path.join(fs.mkdtempSync(path.join(os.tmpdir(), 'telemetry-')), 'nested', 'samples.jsonl');
+  telemetry.setSink(fileSink(file));
+  return file;
+}
+
+test.afterEach(() => telemetry.setSink(null));
+
+test('traced records a span per call, failed ones with ok = false', async () => {
+  const file = withFileSink();
+  assert.strictEqual(await telemetry.traced('test.read', async () => 42, { ids: 3 }), 42);
+  await assert.rejects(telemetry.traced('test.write', async () => Promise.reject(new Error('denied'))));
+  telemetry.flushTelemetry();
+
+  const [read, write] = await readSamples(file, 2);
+  assert.deepStrictEqual([read.kind, read.name, read.ok, read.attributes.ids], ['span', 'test.read', true, 3]);
+  assert.deepStrictEqual([write.kind, write.name, write.ok], ['span', 'test.write', false]);
+  assert.ok(read.value >= 0 && typeof read.at === 'number');
+});
+
+test('mark measures from the given start', async () => {
+  const file = withFileSink();
+  const start = telemetry.now();
+  await new Promise((resolve) => setTimeout(resolve, 20));
+  telemetry.mark('test.firstRender', { performances: 20 }, start);
+  telemetry.flushTelemetry();
+
+  const [sample] = await readSamples(file, 1);
+  assert.deepStrictEqual([sample.kind, sample.name, sample.attributes.performances], ['mark', 'test.firstRender', 20]);
+  assert.ok(sample.value >= 15 && sample.value <= telemetry.now() - start, `${sample.value} ms`);
+});
+
+test('batches are appended, not rewritten', async () => {
+  const file = withFileSink();
+  telemetry.mark('test.first');
+  telemetry.flushTelemetry();
+  await readSamples(file, 1);
+  telemetry.mark('test.second');
+  telemetry.flushTelemetry();
+
+  const samples = await readSamples(file, 2);
+  assert.deepStrictEqual(samples.map((sample) => sample.name), ['test.first', 'test.second']);
+});
+
+test('nothing is kept without a sink', async () => {
+  const file = withFileSink();
+  telemetry.setSink(null);
+  telemetry.mark('test.dropped');
+  telemetry.setSink(fileSink(file));
+  telemetry.mark('test.kept');
+  telemetry.flushTelemetry();
+
+  const samples = await readSamples(file, 1);
+  assert.deepStrictEqual(samples.map((sample) => sample.name), ['test.kept']);
+});